@@ -0,0 +1,35 @@
+"""
+Shared fixtures for the PANAMA benchmarks.
+
+Every benchmark is run with pytest-benchmark (see `make bench`).
+"Cold" benchmarks clear the loader cache before every round and
+"warm" benchmarks measure repeated calls that hit the cache.
+"""
+from typing import Any, Callable
+
+import pytest
+
+import panama.cache
+from panama.anita4 import ANITA4
+
+
+@pytest.fixture
+def anita() -> ANITA4:
+    """
+    A fresh reference to ANITA4.
+    """
+    return ANITA4()
+
+
+@pytest.fixture
+def cold(benchmark: Any) -> Callable[..., Any]:
+    """
+    Benchmark a function with an empty loader cache in every round.
+    """
+
+    def run(func: Callable[..., Any], *args: Any, rounds: int = 10) -> Any:
+        return benchmark.pedantic(
+            func, args=args, setup=panama.cache.clear, rounds=rounds, iterations=1
+        )
+
+    return run
@@ -0,0 +1,26 @@
+"""
+Benchmark the time to import PANAMA.
+"""
+import subprocess
+import sys
+from typing import Any
+
+
+def test_import_python(benchmark: Any) -> None:
+    """
+    The baseline time to start a fresh interpreter.
+    """
+    benchmark.pedantic(
+        subprocess.run, args=([sys.executable, "-c", "pass"],), rounds=10
+    )
+
+
+def test_import_anita4(benchmark: Any) -> None:
+    """
+    The time to start a fresh interpreter and import the ANITA-4 payload.
+    """
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", "import panama.anita4"],),
+        rounds=10,
+    )
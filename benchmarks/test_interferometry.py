@@ -0,0 +1,17 @@
+"""
+Benchmark the interferometric pointing reconstruction.
+"""
+from typing import Any
+
+import numpy as np
+
+from panama.anita4 import ANITA4
+from panama.interferometry import Interferometer
+
+
+def test_pointing_batch(benchmark: Any, anita: ANITA4) -> None:
+    """
+    Reconstruct a batch of noise-only events.
+    """
+    noise = np.random.default_rng(0).standard_normal((10, len(anita.channels), 256))
+    benchmark(Interferometer(anita, 2.6), noise)
@@ -0,0 +1,99 @@
+"""
+Benchmark the response and calibration loaders.
+"""
+from typing import Any, Callable
+
+import panama.antenna as antenna
+import panama.calibration.ampa as ampa
+import panama.calibration.antenna as calantenna
+import panama.calibration.tuff as tuffcalib
+import panama.responses as responses
+from panama.anita4 import ANITA4
+
+
+def test_get_response_cold(cold: Callable[..., Any]) -> None:
+    """
+    Load a single response with an empty cache.
+    """
+    cold(responses.get_response, "digitizer", "01TH", "260_375_0", 4)
+
+
+def test_get_response_warm(benchmark: Any) -> None:
+    """
+    Load a single (cached) response.
+    """
+    benchmark(responses.get_response, "digitizer", "01TH", "260_375_0", 4)
+
+
+def test_get_response_arrays_warm(benchmark: Any) -> None:
+    """
+    Load the raw arrays of a single (cached) response.
+    """
+    benchmark(responses.get_response_arrays, "digitizer", "01TH", "260_375_0", 4)
+
+
+def test_get_all_responses_cold(cold: Callable[..., Any], anita: ANITA4) -> None:
+    """
+    Load every ANITA-4 digitizer response with an empty cache.
+    """
+    cold(
+        responses.get_all_responses,
+        "digitizer",
+        anita.channels,
+        anita.configs,
+        4,
+        rounds=3,
+    )
+
+
+def test_get_all_responses_warm(benchmark: Any, anita: ANITA4) -> None:
+    """
+    Load every (cached) ANITA-4 digitizer response.
+    """
+    benchmark(
+        responses.get_all_responses, "digitizer", anita.channels, anita.configs, 4
+    )
+
+
+def test_payload_responses_cold(cold: Callable[..., Any]) -> None:
+    """
+    Assemble the digitizer response tensor of a new payload with an empty cache.
+    """
+    cold(lambda: ANITA4().digitizer_responses, rounds=3)
+
+
+def test_payload_responses_warm(benchmark: Any) -> None:
+    """
+    Assemble the digitizer response tensor of a new payload with a warm cache.
+    """
+    benchmark(lambda: ANITA4().digitizer_responses)
+
+
+def test_calibration_cold(cold: Callable[..., Any]) -> None:
+    """
+    Load every calibration curve with an empty cache.
+    """
+
+    def load() -> None:
+        ampa.get_average_response()
+        calantenna.get_response(4)
+        antenna.get_beamwidth(4)
+        for config in tuffcalib.configs:
+            tuffcalib.get_response(config)
+
+    cold(load)
+
+
+def test_calibration_warm(benchmark: Any) -> None:
+    """
+    Load every (cached) calibration curve.
+    """
+
+    def load() -> None:
+        ampa.get_average_response()
+        calantenna.get_response(4)
+        antenna.get_beamwidth(4)
+        for config in tuffcalib.configs:
+            tuffcalib.get_response(config)
+
+    benchmark(load)
@@ -0,0 +1,33 @@
+"""
+Benchmark the TUFF configuration lookups.
+"""
+from typing import Any
+
+import numpy as np
+import pytest
+
+from panama.anita4 import tuff
+
+
+@pytest.fixture
+def times() -> np.ndarray:
+    """
+    A large array of times during the ANITA-4 flight.
+    """
+    timeline = tuff.get_timeline()
+    start, end = int(timeline.start), int(timeline.end)
+    return np.random.default_rng(0).integers(start, end, 100_000)
+
+
+def test_config_scalar(benchmark: Any) -> None:
+    """
+    Look up the TUFF config of a single event.
+    """
+    benchmark(tuff.config, int(tuff.get_timeline().start) + 1000)
+
+
+def test_config_array(benchmark: Any, times: np.ndarray) -> None:
+    """
+    Look up the TUFF config of a large array of events.
+    """
+    benchmark(tuff.config_indices, times)
@@ -0,0 +1,19 @@
+"""
+Benchmark the vectorized phi-sector trigger.
+"""
+from typing import Any
+
+import numpy as np
+
+from panama.anita4 import ANITA4
+from panama.trigger import Trigger
+
+
+def test_trigger_batch(benchmark: Any, anita: ANITA4) -> None:
+    """
+    Trigger a batch of noise-only events.
+    """
+    noise = np.random.default_rng(0).standard_normal(
+        (100, len(anita.channels), 256), dtype=np.float32
+    )
+    benchmark(Trigger(anita, 2.6), noise)
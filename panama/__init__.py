@@ -1,8 +1,48 @@
 __version__ = "0.0.1"
 
 import enum
+import importlib
+from typing import Any, List
 
-from . import responses  # noqa: F401
+# the submodules that are imported on their first access (i.e. `panama.responses`)
+_submodules = [
+    "anita",
+    "anita4",
+    "antenna",
+    "beamforming",
+    "cache",
+    "calibration",
+    "chain",
+    "convolution",
+    "geometry",
+    "interferometry",
+    "noise",
+    "profiling",
+    "resample",
+    "responses",
+    "scheduler",
+    "shared",
+    "store",
+    "timeline",
+    "transfer",
+    "trigger",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Lazily import the panama submodules so `import panama` is fast.
+    """
+    if name in _submodules:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    """
+    Include the lazily imported submodules.
+    """
+    return sorted(list(globals()) + _submodules)
 
 
 @enum.unique
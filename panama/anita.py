@@ -1,9 +1,27 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
+
+import panama
 
-import xarray as xr
+# the heavy submodules are imported on their first access through
+# `panama` (see `panama.__getattr__`) so they are only imported here
+# for type-checking
+if TYPE_CHECKING:
+    import numpy as np
+    import xarray as xr
 
-import panama.responses
+    import panama.chain
+    import panama.responses
+    import panama.shared
+    import panama.timeline
+    import panama.transfer
+
+try:
+    from functools import cached_property
+except ImportError:  # Python < 3.8
+    from cached_property import cached_property  # type: ignore
 
 
 class ANITA(ABC):
@@ -17,6 +35,12 @@ class ANITA(ABC):
     # the flight number for this flight
     flight: int
 
+    # the names of the tensors that are cached on the payload
+    cached_tensors: Tuple[str, ...] = ("digitizer_responses", "trigger_responses")
+
+    # the responses whose transfer functions can be shared (see `share`)
+    shared_transfers: Tuple[str, ...] = ("digitizer", "trigger")
+
     @property
     @abstractmethod
     def channels(self) -> List[str]:
@@ -58,13 +82,15 @@ class ANITA(ABC):
         """
         return ["H", "V"]
 
-    @property
+    @cached_property
     def digitizer_responses(self) -> xr.DataArray:
         """
         Load the digitizer responses for this flight.
 
-        This is cached by panama.responses so shoud be loaded
-        relatively quickly.
+        This is assembled once and cached on the payload (see
+        `clear_cache`). The responses are read-only and, if a
+        packed store has been built, are a view into the shared
+        memory-mapped store.
 
         Parameters
         ----------
@@ -76,16 +102,18 @@ class ANITA(ABC):
             The full-set of digitizer responses.
         """
         return panama.responses.get_all_responses(
-            "digitizer", self.channels, self.configs, self.flight
+            "digitizer", self.channels, self.configs, self.flight, mmap=True
         )
 
-    @property
+    @cached_property
     def trigger_responses(self) -> xr.DataArray:
         """
         Load the trigger responses for this flight.
 
-        This is cached by panama.responses so shoud be loaded
-        relatively quickly.
+        This is assembled once and cached on the payload (see
+        `clear_cache`). The responses are read-only and, if a
+        packed store has been built, are a view into the shared
+        memory-mapped store.
 
         Parameters
         ----------
@@ -97,9 +125,236 @@ class ANITA(ABC):
             The full-set of digitizer responses.
         """
         return panama.responses.get_all_responses(
-            "trigger", self.channels, self.configs, self.flight
+            "trigger", self.channels, self.configs, self.flight, mmap=True
+        )
+
+    def resampled_responses(self, response: str, fs: float) -> xr.DataArray:
+        """
+        Get a full set of responses for this flight at a given sample rate.
+
+        These are resampled once per rate and cached by `panama.responses`.
+
+        Parameters
+        ----------
+        response: str
+            The type of response ("digitizer" or "trigger").
+        fs: float
+            The sample rate in GSa/s.
+
+        Returns
+        -------
+        responses:
+            The read-only (channels, configs, time) responses.
+        """
+        return panama.responses.get_all_responses(
+            response, self.channels, self.configs, self.flight, mmap=True, fs=fs
         )
 
+    def transfer_functions(
+        self,
+        response: str = "digitizer",
+        nfft: Optional[int] = None,
+        fs: Optional[float] = None,
+    ) -> xr.DataArray:
+        """
+        Get the complex transfer functions of a set of responses for this flight.
+
+        These are computed once per FFT length and sample rate
+        and cached by `panama.transfer`.
+
+        Parameters
+        ----------
+        response: str
+            The type of response ("digitizer" or "trigger").
+        nfft: Optional[int]
+            The length of the FFT (defaults to the length of the responses).
+        fs: Optional[float]
+            The sample rate in GSa/s (defaults to the stored rate).
+
+        Returns
+        -------
+        transfer:
+            The read-only (channels, configs, freqs) transfer functions.
+        """
+        return panama.transfer.get_transfer_functions(
+            response, self.channels, self.configs, self.flight, nfft, fs
+        )
+
+    def chain(self, source: str, fs: float, N: int) -> xr.DataArray:
+        """
+        Get the composed signal-chain transfer functions for this flight.
+
+        These are composed once per FFT grid and cached by `panama.chain`.
+
+        Parameters
+        ----------
+        source: str
+            "calibration", "receiver", "digitizer", or "trigger" (see `panama.chain`).
+        fs: float
+            The sample rate in GSa/s.
+        N: int
+            The number of samples in the FFT.
+
+        Returns
+        -------
+        chain:
+            The read-only complex (channels, configs, freqs) transfer functions
+            (see `panama.chain` for their units).
+        """
+        return panama.chain.get_chain(
+            source, self.channels, self.configs, self.flight, fs, N
+        )
+
+    def config_indices(self, configs: Union[int, str, Sequence]) -> np.ndarray:
+        """
+        Convert TUFF configurations into indices into `self.configs`.
+
+        Parameters
+        ----------
+        configs: Union[int, str, Sequence]
+            A config index or name or a sequence of indices or names.
+
+        Returns
+        -------
+        indices: np.ndarray
+            The config index of each entry of `configs`.
+
+        Raises
+        ------
+        ValueError:
+            If a config is not valid for this flight.
+        """
+        return panama.timeline.label_codes(configs, self.configs)
+
+    def clear_cache(self) -> None:
+        """
+        Clear the response tensors that are cached on this payload.
+
+        The tensors are reloaded on their next access.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        for name in self.cached_tensors:
+            self.__dict__.pop(name, None)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Get the size of the response tensors cached on this payload.
+
+        Tensors that are views into a memory-mapped store are
+        shared between processes so this is an upper-bound on
+        the memory used by this process.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        usage: Dict[str, int]
+            The size in bytes of each cached tensor.
+        """
+        return {
+            name: self.__dict__[name].nbytes
+            for name in self.cached_tensors
+            if name in self.__dict__
+        }
+
+    def share(
+        self, nfft: Optional[int] = None, fs: Optional[float] = None
+    ) -> Dict[str, str]:
+        """
+        Publish the response and transfer-function tensors into shared memory.
+
+        This should be called once by the parent of a worker pool and each
+        worker should then call `attach` (see `panama.shared`).
+
+        The transfer functions of each of `shared_transfers` are shared
+        (as "{response}_transfer") for a single FFT length and sample rate
+        and are used by workers for `transfer_functions(response, nfft, fs)`
+        with the same `nfft` and `fs`.
+
+        Parameters
+        ----------
+        nfft: Optional[int]
+            The length of the FFT of the shared transfer functions.
+        fs: Optional[float]
+            The sample rate of the shared transfer functions in GSa/s.
+
+        Returns
+        -------
+        names: Dict[str, str]
+            The shared memory name of each tensor.
+        """
+        # publish the response tensors
+        names = {
+            name: panama.shared.publish(getattr(self, name))
+            for name in self.cached_tensors
+        }
+
+        # and the transfer functions (labelled with how they were computed)
+        for response in self.shared_transfers:
+            transfer = self.transfer_functions(response, nfft, fs)
+            transfer.attrs.update(response=response, nfft=nfft, fs=fs)
+            names[f"{response}_transfer"] = panama.shared.publish(transfer)
+
+        # and we are done
+        return names
+
+    def attach(self, names: Dict[str, str]) -> None:
+        """
+        Use the shared response and transfer-function tensors published by `share`.
+
+        The tensors are then never loaded (or computed) by this process.
+        The shared transfer functions are installed into `panama.cache`
+        so they must be cleared from it before they can be released.
+
+        Parameters
+        ----------
+        names: Dict[str, str]
+            The shared memory name of each tensor.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError:
+            If a name is not one of the tensors published by `share`.
+        """
+        # the transfer-function tensors that we can attach to
+        transfers = {f"{response}_transfer" for response in self.shared_transfers}
+
+        # check that we only replace shared tensors
+        invalid = set(names) - set(self.cached_tensors) - transfers
+        if invalid:
+            raise ValueError(f"{invalid} are not shared tensors.")
+
+        # and use the shared tensors in place of our own
+        for tensor, name in names.items():
+            view = panama.shared.attach(name)
+
+            # the response tensors are cached on the payload
+            if tensor in self.cached_tensors:
+                self.__dict__[tensor] = view
+                continue
+
+            # and the transfer functions are cached by `panama.transfer`
+            panama.transfer.prime_transfer_functions(
+                view,
+                view.attrs["response"],
+                self.flight,
+                view.attrs["nfft"],
+                view.attrs["fs"],
+            )
+
     def digitizer_response(self, channel: str, config: str) -> xr.DataArray:
         """
         Load the digitizer response for a given
@@ -1,8 +1,18 @@
-from typing import List
+from __future__ import annotations
 
-from cached_property import cached_property
+from typing import TYPE_CHECKING, List, Tuple
 
-from panama.anita import ANITA
+import panama
+from panama.anita import ANITA, cached_property
+
+# the heavy submodules are imported on their first access through
+# `panama` (see `panama.__getattr__`) so they are only imported here
+# for type-checking
+if TYPE_CHECKING:
+    import numpy as np
+
+    import panama.antenna
+    import panama.geometry
 
 __all__ = ["ANITA4"]
 
@@ -64,3 +74,50 @@ class ANITA4(ANITA):
         The list of rings used in ANITA4.
         """
         return ["T", "M", "B"]
+
+    @cached_property
+    def boresights(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The nominal boresight (elevation, azimuth) of each channel in degrees.
+
+        Every antenna is canted down by 10 degrees and phi sector N
+        points at an azimuth of 22.5 * (N - 1) degrees.
+        """
+        return panama.geometry.boresights(self.channels, len(self.sectors), -10.0)
+
+    @cached_property
+    def beam_pattern(self) -> panama.antenna.BeamPattern:
+        """
+        The directional gain of every channel.
+
+        This is cached so that the gain table is only computed once.
+        """
+        elevation, azimuth = self.boresights
+        return panama.antenna.BeamPattern(
+            self.flight, elevation, azimuth, [channel[-1] for channel in self.channels]
+        )
+
+    @property
+    def geometry(self) -> panama.geometry.Geometry:
+        """
+        The nominal position and boresight of every channel.
+        """
+        return panama.geometry.get_geometry(self.flight)
+
+    def delays(self, elevation: np.ndarray, azimuth: np.ndarray) -> np.ndarray:
+        """
+        Get the arrival delay of plane waves at every channel.
+
+        Parameters
+        ----------
+        elevation: np.ndarray
+            The elevation of each source direction in degrees.
+        azimuth: np.ndarray
+            The azimuth of each source direction in degrees.
+
+        Returns
+        -------
+        delays: np.ndarray
+            The (..., channels) delay at each channel in ns.
+        """
+        return panama.geometry.get_delays(elevation, azimuth, self.flight)
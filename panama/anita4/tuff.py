@@ -1,19 +1,77 @@
+from __future__ import annotations
+
+from functools import lru_cache
 from os.path import dirname, join
+from typing import TYPE_CHECKING, Any, Tuple
+
+from panama.anita4.payload import ANITA4
+from panama.profiling import instrumented, record_read
+
+# the heavy modules are only imported when they are first used
+if TYPE_CHECKING:
+    import numpy as np
 
-import numpy as np
+    from panama.timeline import Timeline
 
-__all__ = ["config"]
+__all__ = ["config", "config_indices", "get_timeline"]
 
 # the directory where we store the responses
 RESPONSE_DIR = join(dirname(dirname(dirname(__file__))), *("data", "responses"))
 
-# load the TUFF config file
-config_by_time = np.loadtxt(
-    join(RESPONSE_DIR, *("anita4", "tuff_by_time.dat")),
-    dtype=[("config", object), ("time", int)],
-)
+
+@lru_cache(maxsize=None)
+def get_config_by_time() -> np.ndarray:
+    """
+    Load the TUFF config file.
+
+    The file is only loaded on the first call.
+
+    Returns
+    -------
+    config_by_time: np.ndarray
+        The 'config' that was enabled at each 'time'.
+    """
+    import numpy as np
+
+    # the file containing the TUFF configs
+    filename = join(RESPONSE_DIR, *("anita4", "tuff_by_time.dat"))
+    record_read(filename)
+
+    # and load it
+    return np.loadtxt(filename, dtype=[("config", object), ("time", int)])
+
+
+@lru_cache(maxsize=None)
+def get_timeline() -> Timeline:
+    """
+    Get the TUFF configs as a function of time.
+
+    Returns
+    -------
+    timeline: Timeline
+        The TUFF timeline - the codes index `ANITA4().configs`.
+    """
+    from panama.timeline import Timeline
+
+    # load the TUFF config file
+    config_by_time = get_config_by_time()
+
+    # and create the timeline
+    return Timeline(config_by_time["time"], config_by_time["config"], ANITA4().configs)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Load `config_by_time` and `timeline` on their first access.
+    """
+    if name == "config_by_time":
+        return get_config_by_time()
+    elif name == "timeline":
+        return get_timeline()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
+@instrumented
 def config(time: int) -> str:
     """
     Get the string representing the TUFF configuration
@@ -34,17 +92,41 @@ def config(time: int) -> str:
         The string identifying the TUFF config
     """
 
+    # load the TUFF timeline
+    timeline = get_timeline()
+
     # check that the time is valid for the A4 flight.
-    if time < config_by_time["time"][0]:
+    if time < timeline.start:
         raise ValueError(f"{time} is before the A4 flight.")
-    elif time > config_by_time["time"][-1]:
+    elif time > timeline.end:
         raise ValueError(f"{time} is after the A4 flight.")
 
-    # find the last config before the time as that is when it changed
-    index = np.where(config_by_time["time"] < time)[0][-1]
-
     # get the configuration
-    active_config: str = config_by_time["config"][index]
+    active_config: str = str(timeline.lookup(time)[1])
 
     # and return the appropriate config
     return active_config
+
+
+@instrumented
+def config_indices(times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the TUFF configurations active at an array of unix times.
+
+    Parameters
+    ----------
+    times: np.ndarray
+        The unix times of the events in question.
+
+    Returns
+    -------
+    indices, configs: Tuple[np.ndarray, np.ndarray]
+        The index into `ANITA4().configs` and the string
+        identifying the TUFF config of each event.
+
+    Raises
+    ------
+    ValueError:
+        If any time is before or after the A4 flight.
+    """
+    return get_timeline().lookup(times)
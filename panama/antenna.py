@@ -1,16 +1,45 @@
 from os.path import dirname, join
+from typing import NamedTuple, Optional, Sequence
 
 import numpy as np
 import xarray as xr
 
+import panama.calibration.antenna
+from panama.cache import cached
+from panama.profiling import instrumented, record_read
+
+__all__ = ["Beamwidth", "get_beamwidth", "get_beamwidth_arrays", "BeamPattern"]
+
 # the directory where we store impulse responses and antenna beamwidths
 RESPONSE_DIR = join(dirname(dirname(__file__)), *("data", "responses"))
 
 
+class Beamwidth(NamedTuple):
+    """
+    The raw arrays of the measured beam-width of an antenna.
+    """
+
+    freqs: np.ndarray  # the frequencies in MHz
+    H: np.ndarray  # the HWHM in the horizontal plane in degrees
+    V: np.ndarray  # the HWHM in the vertical plane in degrees
+
+
+@instrumented
 def get_beamwidth(flight: int) -> xr.Dataset:
     """
     Load the beam-width (HWHM) of the Seavey's for a given ANITA flight.
 
+    The columns of `seavey_beamwidth.dat` are the frequency, and the HWHM
+    in the horizontal ('H') and vertical ('V') planes of the quad-ridged
+    Seavey horn measured with its HPol feed, so 'H' is the E-plane and 'V'
+    is the H-plane HWHM (see Gorham et al., "The Antarctic Impulsive
+    Transient Antenna Ultra-high Energy Neutrino Detector Design,
+    Performance, and Sensitivity for 2006-2007 Balloon Flight",
+    Astropart. Phys. 32 (2009) 10-41). The file itself carries no header.
+
+    A new Dataset is returned on every call but it shares the cached,
+    read-only arrays so this does not copy or re-read the data.
+
     Parameters
     ----------
     flight: int
@@ -28,27 +57,16 @@ def get_beamwidth(flight: int) -> xr.Dataset:
 
     """
 
-    # check that we only load valid flights
-    if flight != 3 and flight != 4:
-        raise ValueError(
-            f"We currently only support loading the ANITA-{3,4} antenna gain."
-        )
-
-    # construct the filename given the current flight
-    filename: str = join(RESPONSE_DIR, *(f"anita{flight}", "seavey_beamwidth.dat"))
-
-    # load the data into a NumPy array
-    data: np.ndarray = np.loadtxt(
-        filename, dtype=[("freqs", float), ("H", float), ("V", float)],
-    )
+    # load the raw beamwidths
+    freqs, Hwidth, Vwidth = get_beamwidth_arrays(flight)
 
     # and create a dataset for the the horizontal plane
-    H = xr.DataArray(data["H"], coords={"freqs": data["freqs"]}, dims="freqs")
+    H = xr.DataArray(Hwidth, coords={"freqs": freqs}, dims="freqs")
     H.attrs["units"] = "deg"
     H.attrs["long_name"] = "Horizontal HWHM"
 
     # and create a dataset for the the vertical plane
-    V = xr.DataArray(data["V"], coords={"freqs": data["freqs"]}, dims="freqs")
+    V = xr.DataArray(Vwidth, coords={"freqs": freqs}, dims="freqs")
     V.attrs["units"] = "deg"
     V.attrs["long_name"] = "Vertical HWHM"
 
@@ -61,3 +79,208 @@ def get_beamwidth(flight: int) -> xr.Dataset:
 
     # and return the loaded beamwidths
     return beamwidths
+
+
+@cached
+def get_beamwidth_arrays(flight: int) -> Beamwidth:
+    """
+    Load the raw arrays of the beam-width (HWHM) of the Seavey's for a given flight.
+
+    This is the array equivalent of `get_beamwidth` (which wraps it)
+    and the returned arrays are read-only.
+
+    Parameters
+    ----------
+    flight: int
+        The ANITA flight to load.
+
+    Returns
+    -------
+    response: Beamwidth
+        The 'freqs' in MHz, and the 'H' and 'V' HWHM in degrees.
+
+    Raises
+    ------
+    ValueError:
+        If `flight` is not a valid ANITA flight.
+
+    """
+
+    # check that we only load valid flights
+    if flight != 3 and flight != 4:
+        raise ValueError(
+            f"We currently only support loading the ANITA-{3,4} antenna gain."
+        )
+
+    # construct the filename given the current flight
+    filename: str = join(RESPONSE_DIR, *(f"anita{flight}", "seavey_beamwidth.dat"))
+
+    # load the data into a NumPy array
+    record_read(filename)
+    data: np.ndarray = np.loadtxt(filename)
+
+    # split the columns into contiguous read-only arrays
+    freqs, H, V = np.ascontiguousarray(data[:, :3].T)
+    freqs.flags.writeable = False
+    H.flags.writeable = False
+    V.flags.writeable = False
+
+    # and we are done
+    return Beamwidth(freqs, H, V)
+
+
+def _interp(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """
+    Linearly interpolate a curve, ignoring any missing (NaN) samples.
+
+    Parameters
+    ----------
+    x: np.ndarray
+        The points to evaluate the curve at.
+    xp: np.ndarray
+        The points of the curve.
+    fp: np.ndarray
+        The values of the curve (which may contain NaN).
+
+    Returns
+    -------
+    values: np.ndarray
+        The interpolated values.
+    """
+    valid = ~np.isnan(fp)
+    return np.interp(x, xp[valid], fp[valid])
+
+
+class BeamPattern:
+    """
+    Evaluate the directional gain of every antenna on a payload.
+
+    The beam of each antenna is modelled as a separable Gaussian whose
+    half-width half-max in azimuth and elevation are the measured Seavey
+    beamwidths, and whose boresight gain is the measured Seavey gain for
+    the polarization of the channel.
+
+    The measured beamwidths are for an HPol feed, i.e. 'H' is the HWHM in
+    the horizontal (E-) plane and 'V' is the HWHM in the vertical (H-)
+    plane (this convention is defined, with its source, in `get_beamwidth`).
+    The E- and H-planes of a VPol feed are rotated by 90 degrees so its
+    azimuth and elevation beamwidths are swapped.
+
+    The beamwidths and gains are interpolated onto a common frequency
+    grid (ignoring any missing samples) once when the pattern is constructed.
+
+    Parameters
+    ----------
+    flight: int
+        The ANITA flight of the antennas.
+    elevation: np.ndarray
+        The boresight elevation (in degrees) of each channel.
+    azimuth: np.ndarray
+        The boresight azimuth (in degrees) of each channel.
+    pols: Sequence[str]
+        The polarization ("H" or "V") of each channel.
+    freqs: Optional[np.ndarray]
+        The frequencies (in MHz) of the gain table. Defaults
+        to the frequencies of the measured beamwidths.
+    """
+
+    def __init__(
+        self,
+        flight: int,
+        elevation: np.ndarray,
+        azimuth: np.ndarray,
+        pols: Sequence[str],
+        freqs: Optional[np.ndarray] = None,
+    ):
+        self.flight = flight
+        self.elevation = np.asarray(elevation, dtype=float)
+        self.azimuth = np.asarray(azimuth, dtype=float)
+
+        # load the measured beamwidths and gains
+        beamwidths = get_beamwidth_arrays(flight)
+        gains = panama.calibration.antenna.get_response_arrays(flight)
+
+        # the frequencies of our gain table
+        self.freqs = np.asarray(
+            freqs if freqs is not None else beamwidths.freqs, dtype=float
+        )
+
+        # the index of the polarization of each channel
+        self.pols = sorted(set(pols))
+        self.pol_index = np.asarray([self.pols.index(pol) for pol in pols])
+
+        # the beamwidths in the horizontal and vertical planes
+        horizontal = _interp(self.freqs, beamwidths.freqs, beamwidths.H)
+        vertical = _interp(self.freqs, beamwidths.freqs, beamwidths.V)
+
+        # and the (pols, freqs) beamwidths in azimuth and elevation
+        # - the planes of a VPol feed are swapped (see above)
+        self.hwhm_azimuth = np.stack(
+            [vertical if pol == "V" else horizontal for pol in self.pols]
+        )
+        self.hwhm_elevation = np.stack(
+            [horizontal if pol == "V" else vertical for pol in self.pols]
+        )
+
+        # and the boresight gain (in dBi) of each polarization
+        self.pol_gain = np.stack(
+            [_interp(self.freqs, gains.freqs, getattr(gains, pol)) for pol in self.pols]
+        )
+
+    @instrumented
+    def gain(
+        self,
+        elevation: np.ndarray,
+        azimuth: np.ndarray,
+        freqs: Optional[np.ndarray] = None,
+        linear: bool = False,
+    ) -> np.ndarray:
+        """
+        Evaluate the gain of every channel for a batch of signal directions.
+
+        Parameters
+        ----------
+        elevation: np.ndarray
+            The (ndirections,) elevation of each signal (in degrees).
+        azimuth: np.ndarray
+            The (ndirections,) azimuth of each signal (in degrees).
+        freqs: Optional[np.ndarray]
+            The (nfreqs,) frequencies (in MHz). Defaults to the table frequencies.
+        linear: bool
+            If True, return the linear power gain instead of dBi.
+
+        Returns
+        -------
+        gain: np.ndarray
+            The (ndirections, nchannels, nfreqs) gain in dBi (or linear).
+        """
+        # use the table directly if we weren't given frequencies
+        hwhm_az, hwhm_el = self.hwhm_azimuth, self.hwhm_elevation
+        pol_gain = self.pol_gain
+
+        # otherwise, interpolate the table onto the requested frequencies
+        if freqs is not None:
+            hwhm_az = np.stack([np.interp(freqs, self.freqs, w) for w in hwhm_az])
+            hwhm_el = np.stack([np.interp(freqs, self.freqs, w) for w in hwhm_el])
+            pol_gain = np.stack([np.interp(freqs, self.freqs, g) for g in pol_gain])
+
+        # the (nchannels, nfreqs) beamwidths of each channel
+        hwhm_az, hwhm_el = hwhm_az[self.pol_index], hwhm_el[self.pol_index]
+
+        # the (ndirections, nchannels) offsets from each boresight
+        del_el = np.atleast_1d(elevation)[:, None] - self.elevation[None, :]
+        del_az = np.atleast_1d(azimuth)[:, None] - self.azimuth[None, :]
+
+        # wrap the azimuth offsets into [-180, 180)
+        del_az = (del_az + 180.0) % 360.0 - 180.0
+
+        # the Gaussian beam falls off by 3 dB at the HWHM in each plane
+        falloff = (10.0 * np.log10(2.0)) * (
+            (del_az[..., None] / hwhm_az) ** 2 + (del_el[..., None] / hwhm_el) ** 2
+        )
+
+        # and the total gain in dBi
+        gain = pol_gain[self.pol_index][None, ...] - falloff
+
+        # and convert to linear if requested
+        return 10.0 ** (gain / 10.0) if linear else gain
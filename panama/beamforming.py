@@ -0,0 +1,330 @@
+"""
+Fractional-delay shifting and coherent summing (beamforming) of waveforms.
+
+Waveforms are shifted by arbitrary (fractional) delays by multiplying
+their zero-padded spectra by linear phase ramps, which is exact for
+band-limited waveforms (unlike rolling and interpolating the samples).
+
+A `Beamformer` aligns the (events, channels, samples) waveforms of a
+payload on the arrival delays of a plane wave (see `panama.geometry`)
+and coherently sums the channels within a set of phi-sectors. The
+phase ramps of each direction are cached so repeated directions only
+cost a single batched FFT, multiply, and inverse FFT.
+"""
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+import panama.geometry
+from panama.anita import ANITA
+from panama.cache import cached
+from panama.convolution import next_fast_len
+from panama.profiling import instrumented
+
+__all__ = ["Beamformer", "get_phase_ramps", "shift"]
+
+
+def _ramps(delays: np.ndarray, fs: float, nfft: int) -> np.ndarray:
+    """
+    Compute the phase ramps that delay waveforms.
+
+    Parameters
+    ----------
+    delays: np.ndarray
+        The delay of each waveform in ns.
+    fs: float
+        The sample rate in GSa/s.
+    nfft: int
+        The length of the FFT.
+
+    Returns
+    -------
+    ramps: np.ndarray
+        The (..., freqs) complex phase ramp of each delay.
+    """
+    # the frequency of each bin in GHz
+    freqs = np.fft.rfftfreq(nfft, d=1.0 / fs)
+
+    # and the phase ramp of each delay
+    return np.exp(-2j * np.pi * freqs * np.asarray(delays)[..., None])
+
+
+@instrumented
+def shift(waveforms: np.ndarray, delays: np.ndarray, fs: float) -> np.ndarray:
+    """
+    Delay waveforms by (fractional) delays.
+
+    The waveforms are zero-padded so that delays shorter
+    than the waveforms do not wrap around.
+
+    Parameters
+    ----------
+    waveforms: np.ndarray
+        The (..., samples) waveforms.
+    delays: np.ndarray
+        The delay of each waveform (broadcast against `waveforms[..., 0]`) in ns.
+    fs: float
+        The sample rate in GSa/s.
+
+    Returns
+    -------
+    shifted: np.ndarray
+        The (..., samples) delayed waveforms.
+    """
+    # the length of the zero-padded FFT
+    nsamples = waveforms.shape[-1]
+    nfft = next_fast_len(2 * nsamples)
+
+    # apply the phase ramps in the frequency domain
+    spectra = np.fft.rfft(waveforms, n=nfft, axis=-1) * _ramps(delays, fs, nfft)
+
+    # and return to the time-domain
+    return np.fft.irfft(spectra, n=nfft, axis=-1)[..., :nsamples]
+
+
+@cached
+def get_phase_ramps(
+    elevation: float, azimuth: float, fs: float, nsamples: int, flight: int = 4
+) -> np.ndarray:
+    """
+    Get the phase ramps that align every channel on a plane-wave direction.
+
+    This is computed once per direction and cached.
+
+    Parameters
+    ----------
+    elevation: float
+        The elevation of the source in degrees.
+    azimuth: float
+        The azimuth of the source in degrees.
+    fs: float
+        The sample rate in GSa/s.
+    nsamples: int
+        The number of samples in each waveform.
+    flight: int
+        The ANITA flight to compute the delays for.
+
+    Returns
+    -------
+    ramps: np.ndarray
+        The read-only (channels, freqs) phase ramps on a
+        `next_fast_len(2 * nsamples)` FFT.
+    """
+    # the arrival delay at each channel
+    delays = panama.geometry.get_delays(elevation, azimuth, flight)
+
+    # and the ramps that undo these delays
+    ramps = _ramps(-delays, fs, next_fast_len(2 * nsamples))
+    ramps.flags.writeable = False
+
+    # and we are done
+    return ramps
+
+
+class Beamformer:
+    """
+    Coherently sum batches of (events, channels, samples) waveforms.
+
+    Parameters
+    ----------
+    payload: ANITA
+        The payload (and flight) that recorded the waveforms.
+    fs: float
+        The sample rate of the waveforms in GSa/s.
+    nsamples: int
+        The number of samples in each waveform.
+    pol: str
+        The polarization ("H" or "V") to sum.
+
+    Raises
+    ------
+    ValueError:
+        If `pol` is not "H" or "V".
+    """
+
+    def __init__(self, payload: ANITA, fs: float, nsamples: int, pol: str = "H"):
+
+        # check that we have a valid polarization
+        if pol not in ("H", "V"):
+            raise ValueError(f"{pol} must be 'H' or 'V'.")
+
+        self.payload = payload
+        self.fs = fs
+        self.nsamples = nsamples
+        self.pol = pol
+        self.nfft = next_fast_len(2 * nsamples)
+
+        # the phi-sector of each channel and whether it has this polarization
+        self.sector = np.asarray([int(c[:2]) for c in payload.channels])
+        self.matched = np.asarray([c[-1] == pol for c in payload.channels])
+
+    def _check(
+        self,
+        waveforms: np.ndarray,
+        elevation: Union[float, np.ndarray],
+        azimuth: Union[float, np.ndarray],
+    ) -> None:
+        """
+        Check that waveforms have one trace per channel of the right length.
+
+        Parameters
+        ----------
+        waveforms: np.ndarray
+            The (events, channels, samples) waveforms.
+        elevation: Union[float, np.ndarray]
+            The elevation of the source (or of each event) in degrees.
+        azimuth: Union[float, np.ndarray]
+            The azimuth of the source (or of each event) in degrees.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError:
+            If the waveforms do not have one `nsamples` trace per channel
+            or there is not one direction (or one per event).
+        """
+        expected = (len(self.payload.channels), self.nsamples)
+        if waveforms.ndim != 3 or waveforms.shape[1:] != expected:
+            raise ValueError(
+                f"Expected (events, {expected[0]}, {expected[1]}) "
+                f"waveforms but got {waveforms.shape}."
+            )
+
+        # and check that we have a single direction or one per event
+        shape = np.broadcast(elevation, azimuth).shape
+        if shape not in ((), (waveforms.shape[0],)):
+            raise ValueError(
+                f"Expected a single direction or {waveforms.shape[0]} "
+                f"directions but got {shape}."
+            )
+
+    def ramps(
+        self, elevation: Union[float, np.ndarray], azimuth: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Get the phase ramps that align every channel on a direction.
+
+        Parameters
+        ----------
+        elevation: Union[float, np.ndarray]
+            The elevation of the source (or of each event) in degrees.
+        azimuth: Union[float, np.ndarray]
+            The azimuth of the source (or of each event) in degrees.
+
+        Returns
+        -------
+        ramps: np.ndarray
+            The ([events], channels, freqs) phase ramps.
+        """
+        # broadcast a single elevation or azimuth against the other
+        elevation, azimuth = np.broadcast_arrays(elevation, azimuth)
+
+        # a single direction is cached
+        if elevation.ndim == 0:
+            return get_phase_ramps(
+                float(elevation),
+                float(azimuth),
+                self.fs,
+                self.nsamples,
+                self.payload.flight,
+            )
+
+        # otherwise, compute the ramps of each event at once
+        delays = panama.geometry.get_delays(
+            elevation[:, None], azimuth[:, None], self.payload.flight
+        )[:, 0, :]
+        return _ramps(-delays, self.fs, self.nfft)
+
+    def align(
+        self,
+        waveforms: np.ndarray,
+        elevation: Union[float, np.ndarray],
+        azimuth: Union[float, np.ndarray],
+    ) -> np.ndarray:
+        """
+        Align every channel on the arrival time at the payload origin.
+
+        Parameters
+        ----------
+        waveforms: np.ndarray
+            The (events, channels, samples) waveforms.
+        elevation: Union[float, np.ndarray]
+            The elevation of the source (or of each event) in degrees.
+        azimuth: Union[float, np.ndarray]
+            The azimuth of the source (or of each event) in degrees.
+
+        Returns
+        -------
+        aligned: np.ndarray
+            The (events, channels, samples) aligned waveforms.
+
+        Raises
+        ------
+        ValueError:
+            If the waveforms do not have one `nsamples` trace per channel
+            or there is not one direction (or one per event).
+        """
+        self._check(waveforms, elevation, azimuth)
+        spectra = np.fft.rfft(waveforms, n=self.nfft, axis=-1)
+        spectra *= self.ramps(elevation, azimuth)
+        nsamples = self.nsamples
+        return np.fft.irfft(spectra, n=self.nfft, axis=-1)[..., :nsamples]
+
+    @instrumented
+    def __call__(
+        self,
+        waveforms: np.ndarray,
+        elevation: Union[float, np.ndarray],
+        azimuth: Union[float, np.ndarray],
+        sectors: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        """
+        Coherently sum the channels within a set of phi-sectors.
+
+        Parameters
+        ----------
+        waveforms: np.ndarray
+            The (events, channels, samples) waveforms.
+        elevation: Union[float, np.ndarray]
+            The elevation of the source (or of each event) in degrees.
+        azimuth: Union[float, np.ndarray]
+            The azimuth of the source (or of each event) in degrees.
+        sectors: Optional[Sequence[int]]
+            The phi-sectors to sum. Defaults to every phi-sector.
+
+        Returns
+        -------
+        summed: np.ndarray
+            The (events, samples) average of the aligned channels.
+
+        Raises
+        ------
+        ValueError:
+            If the waveforms do not have one `nsamples` trace per channel,
+            there is not one direction (or one per event), or there are no
+            channels of this polarization in `sectors`.
+        """
+        # check that we have the right waveforms and directions
+        self._check(waveforms, elevation, azimuth)
+
+        # the channels that we sum over
+        sectors = self.payload.sectors if sectors is None else sectors
+        channels = np.nonzero(self.matched & np.isin(self.sector, sectors))[0]
+
+        # and check that we have something to sum
+        if channels.size == 0:
+            raise ValueError(f"There are no {self.pol}-pol channels in {sectors}.")
+
+        # the ramps of the channels that we use
+        ramps = self.ramps(elevation, azimuth)[..., channels, :]
+
+        # sum the aligned spectra of the channels
+        spectra = np.fft.rfft(waveforms[:, channels, :], n=self.nfft, axis=-1)
+        spectrum = np.sum(spectra * ramps, axis=1) / len(channels)
+
+        # and return to the time-domain
+        nsamples = self.nsamples
+        return np.fft.irfft(spectrum, n=self.nfft, axis=-1)[..., :nsamples]
@@ -0,0 +1,364 @@
+"""
+A bounded, thread-safe cache for the PANAMA data loaders.
+
+Every loader decorated with `cached` shares a single LRU cache that
+is bounded by the total size (in bytes) of the cached values. When
+the cache is full, the least-recently used values are evicted.
+
+Concurrent calls with the same arguments are only loaded once - any
+other threads wait for the first load to finish and then share its
+result. Cached values are shared between callers and must therefore
+not be modified in-place. Values loaded elsewhere (i.e. shared by
+another process) can be installed for a loader call with `prime`.
+
+The size of the cache can be set with the `PANAMA_CACHE_SIZE`
+environment variable (in bytes) or by calling `configure`.
+"""
+import inspect
+import os
+import sys
+from functools import wraps
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Tuple, TypeVar
+
+import cachetools
+
+from panama.profiling import instrumented
+
+__all__ = ["cached", "configure", "clear", "prime", "stats", "CacheStats"]
+
+# the default maximum size of the cache in bytes
+DEFAULT_MAXSIZE: int = 1024 ** 3
+
+# the type of a cached function
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class CacheStats(NamedTuple):
+    """
+    A snapshot of the statistics of the loader cache.
+    """
+
+    hits: int  # the number of calls that were found in the cache
+    misses: int  # the number of calls that had to be loaded
+    evictions: int  # the number of values evicted from the cache
+    entries: int  # the number of values currently in the cache
+    currsize: int  # the current size of the cache in bytes
+    maxsize: int  # the maximum size of the cache in bytes
+    loaders: Dict[str, Tuple[int, int]]  # the (hits, misses) of each loader
+
+
+def _sizeof(value: Any) -> int:
+    """
+    Estimate the size of a cached value in bytes.
+
+    This uses `nbytes` for NumPy and xarray objects and
+    sums the size of the items of tuples.
+
+    Parameters
+    ----------
+    value: Any
+        The cached value.
+
+    Returns
+    -------
+    size: int
+        The size of `value` in bytes.
+    """
+    # tuples of arrays (i.e. the raw loaders) are the size of their contents
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(_sizeof(item) for item in value)
+
+    # NumPy arrays and xarray objects know their size
+    nbytes = getattr(value, "nbytes", None)
+
+    # and otherwise fall back to the Python object size
+    return int(nbytes) if nbytes is not None else sys.getsizeof(value)
+
+
+class _LRUCache(cachetools.LRUCache):
+    """
+    An LRU cache that counts the number of evictions.
+    """
+
+    evictions: int = 0
+
+    def popitem(self) -> Tuple[Hashable, Any]:
+        self.evictions += 1
+        return super().popitem()
+
+
+class LoaderCache:
+    """
+    A thread-safe, size-bounded LRU cache with single-flight loading.
+
+    Parameters
+    ----------
+    maxsize: int
+        The maximum size of the cache in bytes.
+    """
+
+    def __init__(self, maxsize: int):
+        self._cache = _LRUCache(maxsize, getsizeof=_sizeof)
+        self._lock = Lock()
+
+        # the keys that are currently being loaded
+        self._pending: Dict[Hashable, Event] = {}
+
+        # the (hits, misses) of each loader
+        self._loaders: Dict[str, Tuple[int, int]] = {}
+
+    def get(self, name: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Get a value from the cache, loading it if it is not cached.
+
+        Parameters
+        ----------
+        name: str
+            The name of the loader (used for statistics).
+        key: Hashable
+            The key of the value.
+        loader: Callable[[], Any]
+            A function that loads the value if it is not cached.
+
+        Returns
+        -------
+        value: Any
+            The cached or loaded value.
+        """
+        while True:
+            with self._lock:
+
+                # if we have the value, we are done
+                if key in self._cache:
+                    self._count(name, hit=True)
+                    return self._cache[key]
+
+                # check if someone else is already loading this value
+                pending = self._pending.get(key)
+
+                # if not, we are the ones that are going to load it
+                if pending is None:
+                    self._count(name, hit=False)
+                    self._pending[key] = Event()
+                    break
+
+            # otherwise, wait for the other thread and try again
+            pending.wait()
+
+        try:
+            # load the value without holding the lock
+            value = loader()
+
+            # and store it in the cache
+            with self._lock:
+                try:
+                    self._cache[key] = value
+                except ValueError:  # this value is larger than the cache
+                    pass
+
+        finally:
+            # and wake up any threads that were waiting on this value
+            with self._lock:
+                self._pending.pop(key).set()
+
+        # and return the value
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value in the cache (replacing any existing value).
+
+        Parameters
+        ----------
+        key: Hashable
+            The key of the value.
+        value: Any
+            The value to store.
+        """
+        with self._lock:
+            try:
+                self._cache[key] = value
+            except ValueError:  # this value is larger than the cache
+                pass
+
+    def _count(self, name: str, hit: bool) -> None:
+        """
+        Count a hit or miss for a loader. Must be called with the lock held.
+        """
+        hits, misses = self._loaders.get(name, (0, 0))
+        self._loaders[name] = (hits + hit, misses + (not hit))
+
+    def clear(self, *loaders: str) -> None:
+        """
+        Remove values from the cache.
+
+        Parameters
+        ----------
+        *loaders: str
+            If given, only remove the values of loaders whose
+            names start with one of these prefixes.
+        """
+        with self._lock:
+
+            # if we weren't given any loaders, remove everything
+            if not loaders:
+                self._cache.clear()
+                return
+
+            # otherwise, only remove the values of these loaders
+            for key in [key for key in self._cache if key[0].startswith(loaders)]:
+                del self._cache[key]
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Change the maximum size of the cache. This clears the cache.
+
+        Parameters
+        ----------
+        maxsize: int
+            The new maximum size of the cache in bytes.
+        """
+        with self._lock:
+            evictions = self._cache.evictions
+            self._cache = _LRUCache(maxsize, getsizeof=_sizeof)
+            self._cache.evictions = evictions
+
+    def stats(self) -> CacheStats:
+        """
+        Get a snapshot of the statistics of the cache.
+
+        Returns
+        -------
+        stats: CacheStats
+            The current statistics of the cache.
+        """
+        with self._lock:
+            return CacheStats(
+                hits=sum(hits for hits, _ in self._loaders.values()),
+                misses=sum(misses for _, misses in self._loaders.values()),
+                evictions=self._cache.evictions,
+                entries=len(self._cache),
+                currsize=int(self._cache.currsize),
+                maxsize=int(self._cache.maxsize),
+                loaders=dict(self._loaders),
+            )
+
+
+# the cache that is shared by every PANAMA loader
+_cache = LoaderCache(int(os.environ.get("PANAMA_CACHE_SIZE", DEFAULT_MAXSIZE)))
+
+
+def cached(func: F) -> F:
+    """
+    Cache the return value of a loader in the shared PANAMA cache.
+
+    Calls are keyed by the bound arguments of `func` (including any
+    default arguments) so positional and keyword calls share a value.
+    The arguments of `func` must be hashable.
+
+    Every cached loader is also instrumented (see `panama.profiling`).
+
+    Parameters
+    ----------
+    func: Callable
+        The loader to cache.
+
+    Returns
+    -------
+    wrapper: Callable
+        The cached loader.
+    """
+
+    # the signature used to normalize the arguments
+    signature = inspect.signature(func)
+
+    # the name of this loader
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    def key(*args: Any, **kwargs: Any) -> Hashable:
+
+        # bind the arguments so that every call has the same key
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        # and construct the key for this call
+        return (name, bound.args, tuple(sorted(bound.kwargs.items())))
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return _cache.get(name, key(*args, **kwargs), lambda: func(*args, **kwargs))
+
+    # keep the key of this loader so that values can be primed
+    wrapper.cache_key = key  # type: ignore
+
+    return instrumented(wrapper)  # type: ignore
+
+
+def configure(maxsize: int) -> None:
+    """
+    Set the maximum size of the shared PANAMA cache.
+
+    This clears the cache.
+
+    Parameters
+    ----------
+    maxsize: int
+        The maximum size of the cache in bytes.
+    """
+    _cache.resize(maxsize)
+
+
+def clear(*loaders: str) -> None:
+    """
+    Remove values from the shared PANAMA cache.
+
+    Parameters
+    ----------
+    *loaders: str
+        If given, only remove the values of loaders whose names
+        (i.e. "panama.responses.get_response") start with one of these.
+    """
+    _cache.clear(*loaders)
+
+
+def prime(loader: Callable[..., Any], value: Any, *args: Any, **kwargs: Any) -> None:
+    """
+    Store a value in the shared PANAMA cache as the result of a loader call.
+
+    This installs values that were loaded elsewhere (i.e. shared by
+    another process) so that `loader(*args, **kwargs)` never loads them.
+
+    Parameters
+    ----------
+    loader: Callable
+        A loader decorated with `cached`.
+    value: Any
+        The value that `loader(*args, **kwargs)` should return.
+    *args, **kwargs: Any
+        The arguments of the loader call.
+
+    Raises
+    ------
+    ValueError:
+        If `loader` is not cached.
+    """
+    # get the key of this loader call
+    key = getattr(loader, "cache_key", None)
+    if key is None:
+        raise ValueError(f"{loader} is not a cached loader.")
+
+    # and store the value under this key
+    _cache.put(key(*args, **kwargs), value)
+
+
+def stats() -> CacheStats:
+    """
+    Get the statistics of the shared PANAMA cache.
+
+    Returns
+    -------
+    stats: CacheStats
+        The current statistics of the cache.
+    """
+    return _cache.stats()
@@ -2,11 +2,30 @@
 Load gain and NF measurement of the ANITA-4 AMPA's.
 """
 import os.path as op
+from typing import NamedTuple
 
 import numpy as np
 import xarray as xr
 
-__all__ = ["get_response", "get_average_response"]
+from panama.cache import cached
+from panama.profiling import instrumented, record_read
+
+__all__ = [
+    "AMPAResponse",
+    "get_response",
+    "get_average_response",
+    "get_average_response_arrays",
+]
+
+
+class AMPAResponse(NamedTuple):
+    """
+    The raw arrays of a measured AMPA response.
+    """
+
+    freqs: np.ndarray  # the frequencies in MHz
+    S21: np.ndarray  # the gain in dB
+    NF: np.ndarray  # the noise temperature in K
 
 
 def get_response(channel: str = "average") -> xr.Dataset:
@@ -44,12 +63,18 @@ def get_response(channel: str = "average") -> xr.Dataset:
         )
 
 
+@instrumented
 def get_average_response() -> xr.Dataset:
     """
     Load the average measured S21 and NF of the ANITA4 AMPA's.
 
+    A new Dataset is returned on every call but it shares the cached,
+    read-only arrays so this does not copy or re-read the data.
+
     This was measured in ANITA e-Log 681.
 
+    This wraps `get_average_response_arrays` in a Dataset.
+
     Parameters
     ----------
 
@@ -60,25 +85,16 @@ def get_average_response() -> xr.Dataset:
 
     """
 
-    # if we are here we have a valid TUFF configuration
-
-    # get the directory where we store the TUFF files
-    data_directory = op.abspath(
-        op.join(
-            __file__, op.pardir, op.pardir, op.pardir, "data", "calibration", "anita4"
-        )
-    )
-
-    # load the file
-    data = np.loadtxt(op.join(data_directory, "average_ampa.dat"))
+    # load the raw response
+    freqs, gain, noise = get_average_response_arrays()
 
     # create the S21 array with some units
-    S21 = xr.DataArray(data[:, 1], coords={"freqs": data[:, 0]}, dims="freqs")
+    S21 = xr.DataArray(gain, coords={"freqs": freqs}, dims="freqs")
     S21.attrs["units"] = "dB"
     S21.attrs["long_name"] = "S21"
 
     # and the noise figure array
-    NF = xr.DataArray(data[:, 2], coords={"freqs": data[:, 0]}, dims="freqs")
+    NF = xr.DataArray(noise, coords={"freqs": freqs}, dims="freqs")
     NF.attrs["units"] = "K"
     NF.attrs["long_name"] = "NF"
 
@@ -91,3 +107,43 @@ def get_average_response() -> xr.Dataset:
 
     # and we are done
     return response
+
+
+@cached
+def get_average_response_arrays() -> AMPAResponse:
+    """
+    Load the raw arrays of the average measured S21 and NF of the ANITA4 AMPA's.
+
+    This is the array equivalent of `get_average_response` (which wraps it)
+    and the returned arrays are read-only.
+
+    Parameters
+    ----------
+
+    Returns
+    -------
+    response: AMPAResponse
+        The 'freqs' in MHz, 'S21' in dB, and 'NF' in K.
+
+    """
+
+    # get the directory where we store the TUFF files
+    data_directory = op.abspath(
+        op.join(
+            __file__, op.pardir, op.pardir, op.pardir, "data", "calibration", "anita4"
+        )
+    )
+
+    # load the file
+    filename = op.join(data_directory, "average_ampa.dat")
+    record_read(filename)
+    data = np.loadtxt(filename)
+
+    # split the columns into contiguous read-only arrays
+    freqs, S21, NF = np.ascontiguousarray(data[:, :3].T)
+    freqs.flags.writeable = False
+    S21.flags.writeable = False
+    NF.flags.writeable = False
+
+    # and we are done
+    return AMPAResponse(freqs, S21, NF)
@@ -2,18 +2,39 @@
 Load the gains of various ANITA horn antennas.
 """
 import os.path as op
+from typing import NamedTuple, Optional
 
 import numpy as np
 import xarray as xr
 
+from panama.cache import cached
+from panama.profiling import instrumented, record_read
+
 __all__ = [
+    "AntennaGain",
     "get_response",
+    "get_response_arrays",
     "get_anita1_response",
+    "get_anita1_response_arrays",
     "get_anita3_response",
+    "get_anita3_response_arrays",
     "get_anita3_datasheet_response",
+    "get_anita3_datasheet_response_arrays",
 ]
 
 
+class AntennaGain(NamedTuple):
+    """
+    The raw arrays of a measured antenna gain.
+    """
+
+    freqs: np.ndarray  # the frequencies in MHz
+    H: np.ndarray  # the HPol -> HPol gain in dBi
+    V: np.ndarray  # the VPol -> VPol gain in dBi
+    HV: Optional[np.ndarray] = None  # the HPol -> VPol gain in dBi (if measured)
+    VH: Optional[np.ndarray] = None  # the VPol -> HPol gain in dBi (if measured)
+
+
 def get_response(flight: int) -> xr.Dataset:
     """
     Load the measured gain of an ANITA horn antenna for a given flight.
@@ -46,10 +67,56 @@ def get_response(flight: int) -> xr.Dataset:
         )
 
 
+def get_response_arrays(flight: int) -> AntennaGain:
+    """
+    Load the raw arrays of the measured gain of an ANITA horn for a given flight.
+
+    This is the array equivalent of `get_response`.
+
+    Parameters
+    ----------
+    flight: int
+        The ANITA flight to load.
+
+    Returns
+    -------
+    response: AntennaGain
+        The 'freqs' in MHz, and the 'H' and 'V' gains in dBi.
+
+    Raises
+    ------
+    ValueError:
+        If `flight` is not a valid ANITA flight.
+
+    """
+
+    # if we want the average response
+    if flight == 1 or flight == 2:
+        return get_anita1_response_arrays()
+    elif flight == 3 or flight == 4:
+        return get_anita3_response_arrays()
+    else:
+        raise ValueError(
+            f"We currently only support loading the ANITA-{1,2,3,4} antenna gain."
+        )
+
+
+def _read_only(*arrays: np.ndarray) -> None:
+    """
+    Make the (cached) raw arrays read-only.
+    """
+    for array in arrays:
+        array.flags.writeable = False
+
+
+@instrumented
 def get_anita1_response() -> xr.Dataset:
     """
     Load the measured antenna gain for an ANITA-1 horn.
 
+    A new Dataset is returned on every call but it shares the cached,
+    read-only arrays so this does not copy or re-read the data.
+
     This was measured by Ped in ANITA E-Log 71:
     https://elog.phys.hawaii.edu/elog/anita_notes/71
 
@@ -63,40 +130,31 @@ def get_anita1_response() -> xr.Dataset:
 
     """
 
-    # if we are here we have a valid TUFF configuration
-
-    # get the directory where we store the TUFF files
-    data_directory = op.abspath(
-        op.join(
-            __file__, op.pardir, op.pardir, op.pardir, "data", "calibration", "anita1"
-        )
-    )
-
-    # load the file
-    gains = np.loadtxt(op.join(data_directory, "seavey_gain.dat"))
+    # load the raw gains
+    freqs, H, V, HV, VH = get_anita1_response_arrays()
 
     # HPol -> HPol
-    HH = xr.DataArray(gains[:, 1], coords={"freqs": gains[:, 0]}, dims="freqs")
+    HH = xr.DataArray(H, coords={"freqs": freqs}, dims="freqs")
     HH.attrs["units"] = "dBi"
     HH.attrs["long_name"] = r"HPol $\rightarrow$ HPol"
 
     # HPol -> VPol
-    HV = xr.DataArray(gains[:, 2], coords={"freqs": gains[:, 0]}, dims="freqs")
-    HV.attrs["units"] = "dBi"
-    HV.attrs["long_name"] = r"HPol $\rightarrow$ VPol"
+    HVx = xr.DataArray(HV, coords={"freqs": freqs}, dims="freqs")
+    HVx.attrs["units"] = "dBi"
+    HVx.attrs["long_name"] = r"HPol $\rightarrow$ VPol"
 
     # VPol -> VPol
-    VV = xr.DataArray(gains[:, 3], coords={"freqs": gains[:, 0]}, dims="freqs")
+    VV = xr.DataArray(V, coords={"freqs": freqs}, dims="freqs")
     VV.attrs["units"] = "dBi"
     VV.attrs["long_name"] = r"VPol $\rightarrow$ VPol"
 
     # VPol -> HPol
-    VH = xr.DataArray(gains[:, 4], coords={"freqs": gains[:, 0]}, dims="freqs")
-    VH.attrs["units"] = "dBi"
-    VH.attrs["long_name"] = r"VPol $\rightarrow$ HPol"
+    VHx = xr.DataArray(VH, coords={"freqs": freqs}, dims="freqs")
+    VHx.attrs["units"] = "dBi"
+    VHx.attrs["long_name"] = r"VPol $\rightarrow$ HPol"
 
     # and create the dataset
-    response = xr.Dataset({"H": HH, "HV": HV, "V": VV, "VH": VH})
+    response = xr.Dataset({"H": HH, "HV": HVx, "V": VV, "VH": VHx})
 
     # label the independent variables
     response.freqs.attrs["units"] = "MHz"
@@ -106,10 +164,52 @@ def get_anita1_response() -> xr.Dataset:
     return response
 
 
+@cached
+def get_anita1_response_arrays() -> AntennaGain:
+    """
+    Load the raw arrays of the measured antenna gain for an ANITA-1 horn.
+
+    This is the array equivalent of `get_anita1_response` (which wraps it)
+    and the returned arrays are read-only.
+
+    Parameters
+    ----------
+
+    Returns
+    -------
+    response: AntennaGain
+        The 'freqs' in MHz and the 'H', 'V', 'HV', and 'VH' gains in dBi.
+
+    """
+
+    # get the directory where we store the gain files
+    data_directory = op.abspath(
+        op.join(
+            __file__, op.pardir, op.pardir, op.pardir, "data", "calibration", "anita1"
+        )
+    )
+
+    # load the file
+    filename = op.join(data_directory, "seavey_gain.dat")
+    record_read(filename)
+    gains = np.loadtxt(filename)
+
+    # split the columns into contiguous arrays
+    freqs, H, HV, V, VH = np.ascontiguousarray(gains[:, :5].T)
+    _read_only(freqs, H, HV, V, VH)
+
+    # and we are done
+    return AntennaGain(freqs, H, V, HV, VH)
+
+
+@instrumented
 def get_anita3_response() -> xr.Dataset:
     """
     Load the measured antenna gain for an ANITA-3 horn.
 
+    A new Dataset is returned on every call but it shares the cached,
+    read-only arrays so this does not copy or re-read the data.
+
     *WARNING*: Use these with care. These measurements disagree by
     nearly a factor of 2 with the Seavey datasheet.
 
@@ -127,26 +227,16 @@ def get_anita3_response() -> xr.Dataset:
 
     """
 
-    # if we are here we have a valid TUFF configuration
-
-    # get the directory where we store the TUFF files
-    data_directory = op.abspath(
-        op.join(
-            __file__, op.pardir, op.pardir, op.pardir, "data", "calibration", "anita3"
-        )
-    )
-
-    # load the file
-    Hgain = np.loadtxt(op.join(data_directory, "hpol_seavey_gain.dat"))
-    Vgain = np.loadtxt(op.join(data_directory, "vpol_seavey_gain.dat"))
+    # load the raw gains
+    freqs, H, V, _, _ = get_anita3_response_arrays()
 
     # HPol -> HPol
-    HH = xr.DataArray(Hgain[:, 1], coords={"freqs": Hgain[:, 0]}, dims="freqs")
+    HH = xr.DataArray(H, coords={"freqs": freqs}, dims="freqs")
     HH.attrs["units"] = "dBi"
     HH.attrs["long_name"] = r"HPol $\rightarrow$ HPol"
 
     # VPol -> VPol
-    VV = xr.DataArray(Vgain[:, 1], coords={"freqs": Vgain[:, 0]}, dims="freqs")
+    VV = xr.DataArray(V, coords={"freqs": freqs}, dims="freqs")
     VV.attrs["units"] = "dBi"
     VV.attrs["long_name"] = r"VPol $\rightarrow$ VPol"
 
@@ -161,23 +251,27 @@ def get_anita3_response() -> xr.Dataset:
     return response
 
 
-def get_anita3_datasheet_response() -> xr.Dataset:
+@cached
+def get_anita3_response_arrays() -> AntennaGain:
     """
-    Load the Seavey datasheet antenna gain for an ANITA-3/4 horn
+    Load the raw arrays of the measured antenna gain for an ANITA-3 horn.
+
+    This is the array equivalent of `get_anita3_response` (which wraps it)
+    and the returned arrays are read-only. If the HPol and VPol gains
+    were measured at different frequencies, they are placed on the union
+    of the frequencies with NaN where a gain was not measured.
 
     Parameters
     ----------
 
     Returns
     -------
-    response: xr.Dataset
-        A Dataset containing 'freqs' in MHz, 'H' in dBi, and 'V' in dBi.
+    response: AntennaGain
+        The 'freqs' in MHz and the 'H' and 'V' gains in dBi.
 
     """
 
-    # if we are here we have a valid TUFF configuration
-
-    # get the directory where we store the TUFF files
+    # get the directory where we store the gain files
     data_directory = op.abspath(
         op.join(
             __file__, op.pardir, op.pardir, op.pardir, "data", "calibration", "anita3"
@@ -185,16 +279,56 @@ def get_anita3_datasheet_response() -> xr.Dataset:
     )
 
     # load the file
-    gain = np.loadtxt(op.join(data_directory, "seavey_datasheet_gain.dat"))
+    Hfile = op.join(data_directory, "hpol_seavey_gain.dat")
+    record_read(Hfile)
+    Hgain = np.loadtxt(Hfile)
+    Vfile = op.join(data_directory, "vpol_seavey_gain.dat")
+    record_read(Vfile)
+    Vgain = np.loadtxt(Vfile)
+
+    # the frequencies that either polarization was measured at
+    freqs = np.union1d(Hgain[:, 0], Vgain[:, 0])
+
+    # and place each polarization onto the common frequencies
+    H = np.full(freqs.size, np.nan)
+    H[np.searchsorted(freqs, Hgain[:, 0])] = Hgain[:, 1]
+    V = np.full(freqs.size, np.nan)
+    V[np.searchsorted(freqs, Vgain[:, 0])] = Vgain[:, 1]
+    _read_only(freqs, H, V)
+
+    # and we are done
+    return AntennaGain(freqs, H, V)
+
+
+@instrumented
+def get_anita3_datasheet_response() -> xr.Dataset:
+    """
+    Load the Seavey datasheet antenna gain for an ANITA-3/4 horn
+
+    A new Dataset is returned on every call but it shares the cached,
+    read-only arrays so this does not copy or re-read the data.
+
+    Parameters
+    ----------
+
+    Returns
+    -------
+    response: xr.Dataset
+        A Dataset containing 'freqs' in MHz, 'H' in dBi, and 'V' in dBi.
+
+    """
+
+    # load the raw gains
+    freqs, H, V, _, _ = get_anita3_datasheet_response_arrays()
 
     # HPol -> HPol
-    HH = xr.DataArray(gain[:, 1], coords={"freqs": gain[:, 0]}, dims="freqs")
+    HH = xr.DataArray(H, coords={"freqs": freqs}, dims="freqs")
     HH.attrs["units"] = "dBi"
     HH.attrs["name"] = r"H"
     HH.attrs["long_name"] = r"HPol $\rightarrow$ HPol"
 
     # VPol -> VPol
-    VV = xr.DataArray(gain[:, 2], coords={"freqs": gain[:, 0]}, dims="freqs")
+    VV = xr.DataArray(V, coords={"freqs": freqs}, dims="freqs")
     VV.attrs["units"] = "dBi"
     HH.attrs["name"] = r"V"
     VV.attrs["long_name"] = r"VPol $\rightarrow$ VPol"
@@ -208,3 +342,41 @@ def get_anita3_datasheet_response() -> xr.Dataset:
 
     # and we are done
     return response
+
+
+@cached
+def get_anita3_datasheet_response_arrays() -> AntennaGain:
+    """
+    Load the raw arrays of the Seavey datasheet antenna gain for an ANITA-3/4 horn.
+
+    This is the array equivalent of `get_anita3_datasheet_response` (which
+    wraps it) and the returned arrays are read-only.
+
+    Parameters
+    ----------
+
+    Returns
+    -------
+    response: AntennaGain
+        The 'freqs' in MHz and the 'H' and 'V' gains in dBi.
+
+    """
+
+    # get the directory where we store the gain files
+    data_directory = op.abspath(
+        op.join(
+            __file__, op.pardir, op.pardir, op.pardir, "data", "calibration", "anita3"
+        )
+    )
+
+    # load the file
+    filename = op.join(data_directory, "seavey_datasheet_gain.dat")
+    record_read(filename)
+    gain = np.loadtxt(filename)
+
+    # split the columns into contiguous arrays
+    freqs, H, V = np.ascontiguousarray(gain[:, :3].T)
+    _read_only(freqs, H, V)
+
+    # and we are done
+    return AntennaGain(freqs, H, V)
@@ -0,0 +1,204 @@
+"""
+Resample the calibration curves onto simulation frequency grids.
+
+The calibration products are measured on their own (different)
+frequency grids. This projects them onto the frequencies of a real
+FFT of `N` samples taken at `fs` GSa/s, and caches the result per grid
+so repeated calls with the same grid are free.
+
+Missing (NaN) samples are dropped before interpolating. Values outside
+of the measured band of each curve are set to an explicit `fill` value -
+the gains (in dB) are filled with -inf (i.e. zero linear gain) and the
+AMPA noise temperature with 0 K so that no signal or noise is invented
+outside of the band. The returned arrays are read-only.
+"""
+from typing import Hashable, Mapping, Optional, TypeVar, Union
+
+import numpy as np
+import xarray as xr
+
+import panama.calibration.ampa as ampa
+import panama.calibration.antenna as antenna
+import panama.calibration.tuff as tuff
+from panama.cache import cached
+
+# a calibration curve is either a DataArray or a Dataset
+Curve = TypeVar("Curve", xr.DataArray, xr.Dataset)
+
+__all__ = [
+    "rfft_freqs",
+    "resample",
+    "get_ampa_response",
+    "get_tuff_response",
+    "get_antenna_response",
+]
+
+
+def rfft_freqs(fs: float, N: int) -> np.ndarray:
+    """
+    Get the frequencies of a real FFT.
+
+    Parameters
+    ----------
+    fs: float
+        The sample rate in GSa/s.
+    N: int
+        The number of samples in the FFT.
+
+    Returns
+    -------
+    freqs: np.ndarray
+        The frequency of each bin in MHz.
+    """
+    return 1e3 * np.fft.rfftfreq(N, d=1.0 / fs)
+
+
+def resample(
+    curve: Curve,
+    fs: float,
+    N: int,
+    fill: Optional[Union[float, Mapping[str, float]]] = None,
+) -> Curve:
+    """
+    Resample a calibration curve onto the frequencies of a real FFT.
+
+    Missing (NaN) samples are ignored. This is not cached -
+    see the `get_*_response` functions.
+
+    Parameters
+    ----------
+    curve: Union[xr.DataArray, xr.Dataset]
+        A calibration curve indexed by 'freqs' in MHz.
+    fs: float
+        The sample rate in GSa/s.
+    N: int
+        The number of samples in the FFT.
+    fill: Optional[Union[float, Mapping[str, float]]]
+        The value outside of the measured band (or the value for each
+        variable of a Dataset). If None, hold the value at the band edges.
+
+    Returns
+    -------
+    resampled: Union[xr.DataArray, xr.Dataset]
+        The read-only curve on the FFT frequencies.
+    """
+
+    # the frequencies that we resample onto
+    freqs = rfft_freqs(fs, N)
+
+    def interp(array: xr.DataArray, value: Optional[float]) -> xr.DataArray:
+        """
+        Resample a single DataArray.
+        """
+        # ignore any missing samples
+        valid = ~np.isnan(array.values)
+
+        # interpolate the values onto the new grid
+        values = np.interp(
+            freqs, array.freqs.values[valid], array.values[valid], value, value
+        )
+        values.flags.writeable = False
+
+        # create the resampled array with the same attributes
+        resampled = xr.DataArray(
+            values, coords={"freqs": freqs}, dims="freqs", attrs=array.attrs
+        )
+
+        # label the independent variables
+        resampled.freqs.attrs["units"] = "MHz"
+        resampled.freqs.attrs["long_name"] = "Frequency"
+
+        # and we are done
+        return resampled
+
+    def value(name: Hashable) -> Optional[float]:
+        """
+        Get the fill value of a single variable.
+        """
+        return fill.get(str(name)) if isinstance(fill, Mapping) else fill
+
+    # resample every variable of a Dataset
+    if isinstance(curve, xr.Dataset):
+        return xr.Dataset(
+            {name: interp(curve[name], value(name)) for name in curve.data_vars},
+            attrs=curve.attrs,
+        )
+
+    # otherwise, we just have a single array
+    return interp(curve, value(curve.name))
+
+
+@cached
+def get_ampa_response(fs: float, N: int) -> xr.Dataset:
+    """
+    Get the average ANITA-4 AMPA S21 (in dB) and NF (in K) on an FFT grid.
+
+    Parameters
+    ----------
+    fs: float
+        The sample rate in GSa/s.
+    N: int
+        The number of samples in the FFT.
+
+    Returns
+    -------
+    response: xr.Dataset
+        The read-only 'S21' (-inf outside of the band) and 'NF'
+        (0 K outside of the band) indexed by 'freqs' in MHz.
+    """
+    return resample(ampa.get_average_response(), fs, N, {"S21": -np.inf, "NF": 0.0})
+
+
+@cached
+def get_tuff_response(config: str, fs: float, N: int) -> xr.DataArray:
+    """
+    Get the simulated ANITA-4 TUFF S21 (in dB) on an FFT grid.
+
+    Parameters
+    ----------
+    config: str
+        A valid TUFF configuration string.
+    fs: float
+        The sample rate in GSa/s.
+    N: int
+        The number of samples in the FFT.
+
+    Returns
+    -------
+    response: xr.DataArray
+        The read-only S21 (-inf outside of the band) indexed by 'freqs' in MHz.
+
+    Raises
+    ------
+    ValueError
+        If `config` is an invalid TUFF configuration.
+    """
+    return resample(tuff.get_response(config), fs, N, -np.inf)
+
+
+@cached
+def get_antenna_response(flight: int, fs: float, N: int) -> xr.Dataset:
+    """
+    Get the measured antenna gain (in dBi) for a given flight on an FFT grid.
+
+    Parameters
+    ----------
+    flight: int
+        The ANITA flight to load.
+    fs: float
+        The sample rate in GSa/s.
+    N: int
+        The number of samples in the FFT.
+
+    Returns
+    -------
+    response: xr.Dataset
+        The read-only 'H' and 'V' gains (-inf outside of the band)
+        indexed by 'freqs' in MHz.
+
+    Raises
+    ------
+    ValueError:
+        If `flight` is not a valid ANITA flight.
+    """
+    return resample(antenna.get_response(flight), fs, N, -np.inf)
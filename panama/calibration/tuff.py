@@ -2,11 +2,15 @@
 Load the S21 simulation of the ANITA-4 TUFFs.
 """
 import os.path as op
+from typing import NamedTuple
 
 import numpy as np
 import xarray as xr
 
-__all__ = ["get_response"]
+from panama.cache import cached
+from panama.profiling import instrumented, record_read
+
+__all__ = ["TUFFResponse", "get_response", "get_response_arrays"]
 
 # the list of simulated TUFF configs
 configs = [
@@ -19,6 +23,15 @@ configs = [
 ]
 
 
+class TUFFResponse(NamedTuple):
+    """
+    The raw arrays of a simulated TUFF response.
+    """
+
+    freqs: np.ndarray  # the frequencies in MHz
+    S21: np.ndarray  # the S21 magnitude in dB
+
+
 def is_config(config: str) -> bool:
     """
     Check that `config` is a valid ANITA4 TUFF config.
@@ -37,13 +50,19 @@ def is_config(config: str) -> bool:
     return config in configs
 
 
+@instrumented
 def get_response(config: str) -> xr.DataArray:
     """
     Return the simulated S21 magnitude response of an ANITA4 TUFF.
 
+    A new DataArray is returned on every call but it shares the cached,
+    read-only arrays so this does not copy or re-read the data.
+
     This uses the averaged simulated TUFF response produced by
     O. Banerjee in ANITA E-Log 711.
 
+    This wraps `get_response_arrays` in a DataArray.
+
     Parameters
     ----------
     config: str
@@ -60,6 +79,51 @@ def get_response(config: str) -> xr.DataArray:
         If `config` is an invalid TUFF configuration.
     """
 
+    # load the raw response
+    freqs, S21 = get_response_arrays(config)
+
+    # create the data array
+    response = xr.DataArray(S21, coords={"freqs": freqs}, dims="freqs")
+
+    # label the independent variables
+    response.freqs.attrs["units"] = "MHz"
+    response.freqs.attrs["long_name"] = "Frequency"
+
+    # and the dependent variable
+    response.attrs["units"] = "dB"
+    response.attrs["long_name"] = "S21"
+
+    # and a description for this config
+    response.attrs["config"] = config
+
+    # and we are done
+    return response
+
+
+@cached
+def get_response_arrays(config: str) -> TUFFResponse:
+    """
+    Return the raw arrays of the simulated S21 magnitude of an ANITA4 TUFF.
+
+    This is the array equivalent of `get_response` (which wraps it) and
+    the returned arrays are read-only.
+
+    Parameters
+    ----------
+    config: str
+        A valid TUFF configuration string.
+
+    Returns
+    -------
+    response: TUFFResponse
+        The 'freqs' in MHz and the 'S21' in dB.
+
+    Raises
+    ------
+    ValueError
+        If `config` is an invalid TUFF configuration.
+    """
+
     # check if this is not a valid configuration
     if not is_config(config):
         raise ValueError(f"{config} is not a valid TUFF configuration.")
@@ -81,21 +145,14 @@ def get_response(config: str) -> xr.DataArray:
     )
 
     # load the file
-    data = np.loadtxt(op.join(data_directory, config + ".dat"))
-
-    # create the data array
-    response = xr.DataArray(data[:, 1], coords={"freqs": data[:, 0]}, dims="freqs")
-
-    # label the independent variables
-    response.freqs.attrs["units"] = "MHz"
-    response.freqs.attrs["long_name"] = "Frequency"
+    filename = op.join(data_directory, config + ".dat")
+    record_read(filename)
+    data = np.loadtxt(filename)
 
-    # and the dependent variable
-    response.attrs["units"] = "dB"
-    response.attrs["long_name"] = "S21"
-
-    # and a description for this config
-    response.attrs["config"] = config
+    # split the columns into contiguous read-only arrays
+    freqs, S21 = np.ascontiguousarray(data[:, :2].T)
+    freqs.flags.writeable = False
+    S21.flags.writeable = False
 
     # and we are done
-    return response
+    return TUFFResponse(freqs, S21)
@@ -0,0 +1,237 @@
+"""
+Precomposed end-to-end signal-chain transfer functions.
+
+The signal chain of each channel and TUFF configuration is composed
+once onto the real FFT grid of `N` samples at `fs` GSa/s so that the
+full chain is applied with a single complex multiply per channel.
+
+The chain can be composed from the following sources:
+
+- "calibration": the antenna gain (`calibration.antenna`), the AMPA S21
+  (`calibration.ampa`), and the TUFF S21 (`calibration.tuff`). These are
+  magnitude-only measurements so the composed chain has zero phase.
+  The antenna gain is converted into the effective height of a matched
+  antenna driving a 50 Ohm load so the chain is the voltage at the
+  digitizer per incident electric field (V per V/m, i.e. in m).
+  This is currently only available for ANITA-4.
+- "receiver": the "calibration" chain without the antenna (i.e. the
+  dimensionless voltage gain seen by noise generated at the input of
+  the AMPA).
+- "digitizer"/"trigger": the measured impulse responses of each channel
+  (see `panama.transfer`) resampled to `fs` (see `panama.resample`).
+
+The composed calibration chains are cached in `panama.cache` (the
+measured chains are the cached transfer functions) and every call
+returns a new read-only DataArray around the cached arrays.
+"""
+from typing import List, Tuple
+
+import numpy as np
+import xarray as xr
+
+import panama.calibration.grid as grid
+import panama.transfer
+from panama.cache import cached
+from panama.profiling import instrumented
+
+__all__ = ["get_chain", "effective_height"]
+
+# the speed of light in m/us (so that c / f[MHz] is in m)
+SPEED_OF_LIGHT: float = 299.792458
+
+# the impedance of free space in Ohms
+FREE_SPACE_IMPEDANCE: float = 376.730313668
+
+# the impedance of the receiver (the AMPA input) in Ohms
+IMPEDANCE: float = 50.0
+
+
+def effective_height(gain: np.ndarray, freqs: np.ndarray) -> np.ndarray:
+    """
+    Convert the gain of an antenna into its effective height.
+
+    This assumes a matched antenna driving an `IMPEDANCE` load so that
+    h = (c / f) * sqrt(G * Z_L / (pi * Z_0)) where G is the linear gain.
+
+    Parameters
+    ----------
+    gain: np.ndarray
+        The (..., freqs) antenna gain in dBi.
+    freqs: np.ndarray
+        The frequency of each gain in MHz.
+
+    Returns
+    -------
+    height: np.ndarray
+        The (..., freqs) effective height in m (zero at DC).
+    """
+    # the wavelength at each frequency in m (and zero at DC)
+    wavelength = np.divide(
+        SPEED_OF_LIGHT, freqs, out=np.zeros_like(freqs, dtype=float), where=freqs > 0
+    )
+
+    # and the effective height of the (linear) gain
+    return wavelength * np.sqrt(
+        10.0 ** (gain / 10.0) * IMPEDANCE / (np.pi * FREE_SPACE_IMPEDANCE)
+    )
+
+
+@instrumented
+def get_chain(
+    source: str,
+    channels: List[str],
+    configs: List[str],
+    flight: int,
+    fs: float,
+    N: int,
+) -> xr.DataArray:
+    """
+    Get the composed signal-chain transfer function of every channel and config.
+
+    Parameters
+    ----------
+    source: str
+        "calibration", "receiver", "digitizer", or "trigger" (see the module docs).
+    channels: List[str]
+        The channel identifiers - the last character is the polarization.
+    configs: List[str]
+        The TUFF configurations.
+    flight: int
+        The ANITA flight.
+    fs: float
+        The sample rate in GSa/s.
+    N: int
+        The number of samples in the FFT.
+
+    Returns
+    -------
+    chain: xr.DataArray
+        The read-only complex (channels, configs, freqs) transfer functions.
+        The "calibration" chain is in m (V per V/m) and the "receiver"
+        chain is a dimensionless voltage gain.
+
+    Raises
+    ------
+    ValueError:
+        If `source` is not available for this flight or `N` is shorter
+        than the measured responses.
+    """
+    # compose the chain from the calibration measurements
+    if source in ("calibration", "receiver"):
+        chain = _get_calibration_chain(
+            tuple(channels), tuple(configs), flight, fs, N, source == "calibration"
+        )
+
+    # or use the (cached) measured impulse responses at this sample rate
+    elif source in ("digitizer", "trigger"):
+        chain = panama.transfer.get_transfer_functions(
+            source, list(channels), list(configs), flight, N, fs
+        ).values
+
+    else:
+        raise ValueError(f"{source} is not a valid signal-chain source.")
+
+    # create the data array
+    xray = xr.DataArray(
+        chain,
+        dims=["channels", "configs", "freqs"],
+        coords={
+            "channels": list(channels),
+            "configs": list(configs),
+            "freqs": grid.rfft_freqs(fs, N),
+        },
+    )
+
+    # label the units of the calibration chains
+    if source == "calibration":
+        xray.attrs["units"] = "m"
+    elif source == "receiver":
+        xray.attrs["units"] = "V/V"
+
+    # label the independent variables
+    xray.freqs.attrs["units"] = "MHz"
+    xray.freqs.attrs["long_name"] = "Frequency"
+
+    # and we are done
+    return xray
+
+
+@cached
+def _get_calibration_chain(
+    channels: Tuple[str, ...],
+    configs: Tuple[str, ...],
+    flight: int,
+    fs: float,
+    N: int,
+    antenna: bool = True,
+) -> np.ndarray:
+    """
+    The cached (and read-only) `_calibration_chain`.
+    """
+    chain = _calibration_chain(channels, configs, flight, fs, N, antenna)
+    chain.flags.writeable = False
+    return chain
+
+
+def _calibration_chain(
+    channels: Tuple[str, ...],
+    configs: Tuple[str, ...],
+    flight: int,
+    fs: float,
+    N: int,
+    antenna: bool = True,
+) -> np.ndarray:
+    """
+    Compose the antenna, AMPA, and TUFF calibrations into a transfer function.
+
+    Parameters
+    ----------
+    channels: Tuple[str, ...]
+        The channel identifiers - the last character is the polarization.
+    configs: Tuple[str, ...]
+        The TUFF configurations.
+    flight: int
+        The ANITA flight.
+    fs: float
+        The sample rate in GSa/s.
+    N: int
+        The number of samples in the FFT.
+    antenna: bool
+        If False, don't include the antenna gain.
+
+    Returns
+    -------
+    chain: np.ndarray
+        The complex (channels, configs, freqs) transfer functions in
+        m (V per V/m) with the antenna or V/V without it.
+
+    Raises
+    ------
+    ValueError:
+        If the calibrations are not available for this flight.
+    """
+    # we only have AMPA and TUFF measurements for ANITA-4
+    if flight != 4:
+        raise ValueError("The calibration chain is only available for ANITA-4.")
+
+    # the AMPA S21 in dB
+    ampa = grid.get_ampa_response(fs, N).S21.values
+
+    # the TUFF S21 of each config in dB
+    tuff = np.stack(
+        [grid.get_tuff_response(config, fs, N).values for config in configs]
+    )
+
+    # the (zero-phase) voltage gain of the receiver of every config
+    receiver = 10.0 ** ((ampa[None, :] + tuff) / 20.0)
+
+    # the effective height of each channel in m (or unity for the receiver)
+    if antenna:
+        gains = grid.get_antenna_response(flight, fs, N)
+        gain = np.stack([gains[channel[-1]].values for channel in channels])
+        height = effective_height(gain, grid.rfft_freqs(fs, N))
+    else:
+        height = np.ones((len(channels), receiver.shape[-1]))
+
+    # and compose them into the transfer function of every channel and config
+    return (height[:, None, :] * receiver[None, :, :]).astype(complex)
@@ -0,0 +1,339 @@
+"""
+Apply the payload impulse responses to batches of waveforms.
+"""
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import scipy.fft
+
+import panama.responses
+from panama.anita import ANITA
+from panama.profiling import instrumented
+
+__all__ = ["ResponseConvolver", "StreamingFilter", "next_fast_len"]
+
+
+def next_fast_len(n: int) -> int:
+    """
+    Find the smallest 5-smooth number (2^a 3^b 5^c) that is >= n.
+
+    FFTs of these lengths are significantly faster than other lengths.
+
+    Parameters
+    ----------
+    n: int
+        The minimum length.
+
+    Returns
+    -------
+    length: int
+        The fast length of a real FFT.
+    """
+    return scipy.fft.next_fast_len(n, real=True)
+
+
+class ResponseConvolver:
+    """
+    Convolve batches of waveforms with the impulse responses of a payload.
+
+    Every channel of every event is convolved with the response of
+    that channel in the TUFF configuration of that event using a single
+    batched FFT. The output is equivalent to `np.convolve(x, h)[:nsamples]`
+    for every waveform `x` and its response `h`.
+
+    Events are transformed `chunk` at a time so the (complex) spectra
+    and zero-padded inverse transforms only ever hold a bounded number of
+    events, independent of the size of the batch; with `out`, the only
+    full-batch array is the output itself.
+
+    The waveforms must be sampled at the same rate as the responses.
+
+    Parameters
+    ----------
+    payload: ANITA
+        The payload whose responses we apply.
+    nsamples: int
+        The number of samples in each waveform.
+    response: str
+        The type of response to apply ("digitizer" or "trigger").
+    channels: Optional[List[str]]
+        The channels (in order) of the waveforms. Defaults to every channel.
+    dtype: np.dtype
+        The floating point type of the calculation (float32 or float64).
+    chunk: int
+        The number of events to transform at once.
+    workers: Optional[int]
+        The number of threads used by each FFT (see `scipy.fft`).
+    """
+
+    def __init__(
+        self,
+        payload: ANITA,
+        nsamples: int,
+        response: str = "digitizer",
+        channels: Optional[List[str]] = None,
+        dtype: Union[type, np.dtype] = np.float64,
+        chunk: int = 64,
+        workers: Optional[int] = None,
+    ):
+        self.payload = payload
+        self.nsamples = nsamples
+        self.response = response
+        self.channels = list(channels) if channels else list(payload.channels)
+        self.dtype = np.dtype(dtype)
+        self.chunk = max(chunk, 1)
+        self.workers = workers
+
+        # check that we were asked for a floating point type
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError(f"{self.dtype} must be float32 or float64.")
+
+        # the length of the responses that we are applying
+        nresponse = getattr(payload, f"{response}_responses").sizes["time"]
+
+        # the FFT length needed for a linear convolution
+        self.nfft = next_fast_len(nsamples + nresponse - 1)
+
+        # get the transfer functions for this FFT length
+        transfer = payload.transfer_functions(response, self.nfft)
+
+        # and select our channels in the precision that we want
+        complex_type = np.result_type(self.dtype, np.complex64)
+        self.transfer = np.ascontiguousarray(
+            transfer.sel(channels=self.channels).values, dtype=complex_type
+        )
+        self.transfer.flags.writeable = False
+
+    @instrumented
+    def __call__(
+        self,
+        waveforms: np.ndarray,
+        configs: Union[int, str, Sequence],
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Convolve a batch of waveforms with the payload responses.
+
+        Parameters
+        ----------
+        waveforms: np.ndarray
+            The (events, channels, nsamples) waveforms.
+        configs: Union[int, str, Sequence]
+            The TUFF config (index or name) of every event or a
+            single config to use for every event.
+        out: Optional[np.ndarray]
+            An (events, channels, nsamples) array to store the output in.
+
+        Returns
+        -------
+        convolved: np.ndarray
+            The (events, channels, nsamples) convolved waveforms.
+
+        Raises
+        ------
+        ValueError:
+            If `waveforms`, `configs` or `out` have the wrong shape.
+        """
+        # the shape that we expect for each event
+        expected = (len(self.channels), self.nsamples)
+
+        # check the shape of the waveforms
+        if waveforms.ndim != 3 or waveforms.shape[1:] != expected:
+            raise ValueError(
+                f"Expected (events, *{expected}) waveforms but got {waveforms.shape}."
+            )
+
+        # get the config index of each event
+        indices = self.payload.config_indices(configs)
+        if indices.size == 1:
+            indices = np.repeat(indices, waveforms.shape[0])
+        elif indices.size != waveforms.shape[0]:
+            raise ValueError(f"Expected {waveforms.shape[0]} configs.")
+
+        # allocate the output if we need to
+        if out is None:
+            out = np.empty(waveforms.shape, dtype=self.dtype)
+        elif out.shape != waveforms.shape:
+            raise ValueError(f"`out` must have shape {waveforms.shape}.")
+
+        # the lengths of the transforms
+        nfft, nsamples = self.nfft, self.nsamples
+
+        # convolve a chunk of events at a time to bound the memory usage
+        for start in range(0, waveforms.shape[0], self.chunk):
+            stop = start + self.chunk
+
+            # compute the spectrum of every waveform in this chunk
+            spectrum = scipy.fft.rfft(
+                waveforms[start:stop].astype(self.dtype, copy=False),
+                n=nfft,
+                axis=-1,
+                workers=self.workers,
+            )
+
+            # apply the transfer functions for each config in this chunk
+            chunk = indices[start:stop]
+            unique = np.unique(chunk)
+            if unique.size == 1:
+                spectrum *= self.transfer[:, unique[0], :]
+            else:
+                for config in unique:
+                    events = np.flatnonzero(chunk == config)
+                    spectrum[events] *= self.transfer[:, config, :]
+
+            # and transform back to the time domain (reusing the spectrum)
+            out[start:stop] = scipy.fft.irfft(
+                spectrum, n=nfft, axis=-1, overwrite_x=True, workers=self.workers
+            )[..., :nsamples]
+
+        # and we are done
+        return out
+
+
+class StreamingFilter:
+    """
+    Filter a continuous stream of waveform chunks with an impulse response.
+
+    This uses overlap-save so that arbitrarily long records can be
+    filtered one fixed-size chunk at a time while only keeping the last
+    (nresponse - 1) samples of the stream in memory. Concatenating the
+    filtered chunks is equivalent to `np.convolve(x, h)[:len(x)]` of
+    the concatenated record `x`.
+
+    The kernel can be a single response or a (..., nresponse) array of
+    responses (i.e. one per channel) that is broadcast against the chunks.
+
+    Parameters
+    ----------
+    kernel: np.ndarray
+        The (..., nresponse) impulse response(s) to filter with.
+    blocksize: int
+        The maximum number of samples in each chunk.
+    dtype: np.dtype
+        The floating point type of the calculation (float32 or float64).
+    """
+
+    def __init__(
+        self,
+        kernel: np.ndarray,
+        blocksize: int,
+        dtype: Union[type, np.dtype] = np.float64,
+    ):
+        self.blocksize = blocksize
+        self.dtype = np.dtype(dtype)
+
+        # the length of the kernel
+        self.nkernel = kernel.shape[-1]
+
+        # the FFT length needed for each chunk
+        self.nfft = next_fast_len(blocksize + self.nkernel - 1)
+
+        # the transfer function of the kernel
+        self.transfer = scipy.fft.rfft(
+            np.asarray(kernel, dtype=self.dtype), n=self.nfft, axis=-1
+        )
+
+        # the last (nkernel - 1) samples of the stream
+        self._history: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_response(
+        cls,
+        response: str,
+        channel: str,
+        config: str,
+        flight: int,
+        blocksize: int,
+        dtype: Union[type, np.dtype] = np.float64,
+    ) -> "StreamingFilter":
+        """
+        Create a streaming filter from a PANAMA impulse response.
+
+        Parameters
+        ----------
+        response: str
+           The directory name of the type of response to load.
+        channel: str
+           The channel identifier for the channel to load.
+        config: str
+           The TUFF configuration to load the response for.
+        flight: int
+           The ANITA flight to load the responses for.
+        blocksize: int
+            The maximum number of samples in each chunk.
+        dtype: np.dtype
+            The floating point type of the calculation (float32 or float64).
+
+        Returns
+        -------
+        filter: StreamingFilter
+            The streaming filter for this response.
+        """
+        kernel = panama.responses.get_response_arrays(response, channel, config, flight)
+        return cls(kernel.values, blocksize, dtype)
+
+    def reset(self) -> None:
+        """
+        Reset the state of the filter to the start of a new stream.
+        """
+        self._history = None
+
+    @instrumented
+    def __call__(
+        self, chunk: np.ndarray, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Filter the next chunk of the stream.
+
+        Parameters
+        ----------
+        chunk: np.ndarray
+            The next (..., nsamples) samples of the stream (nsamples <= blocksize).
+        out: Optional[np.ndarray]
+            An array, with the same shape as `chunk`, to store the output in.
+
+        Returns
+        -------
+        filtered: np.ndarray
+            The (..., nsamples) filtered samples.
+
+        Raises
+        ------
+        ValueError:
+            If `chunk` is larger than the block size of the filter.
+        """
+        # the number of samples in this chunk
+        nsamples = chunk.shape[-1]
+
+        # check that the chunk fits in our FFT
+        if nsamples > self.blocksize:
+            raise ValueError(f"Chunks must have at most {self.blocksize} samples.")
+
+        # at the start of a stream, the history is all zeros
+        if self._history is None:
+            shape = np.broadcast_shapes(chunk.shape[:-1], self.transfer.shape[:-1])
+            self._history = np.zeros((*shape, self.nkernel - 1), dtype=self.dtype)
+
+        # make sure that every stream in the chunk has a kernel
+        chunk = np.broadcast_to(chunk, self._history.shape[:-1] + (nsamples,))
+
+        # and prepend the history to the chunk
+        buffer = np.concatenate((self._history, chunk), axis=-1)
+
+        # the circular convolution is valid after the first (nkernel - 1) samples
+        start, stop = self.nkernel - 1, buffer.shape[-1]
+        spectrum = scipy.fft.rfft(buffer, n=self.nfft, axis=-1)
+        spectrum *= self.transfer
+        valid = scipy.fft.irfft(spectrum, n=self.nfft, axis=-1, overwrite_x=True)[
+            ..., start:stop
+        ]
+
+        # and keep the end of the buffer for the next chunk
+        self._history = buffer[..., nsamples:].copy()
+
+        # and copy the output if we were asked to
+        if out is not None:
+            out[...] = valid
+            return out
+
+        return valid
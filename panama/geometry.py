@@ -0,0 +1,299 @@
+"""
+The geometry of the payload antennas and plane-wave arrival delays.
+
+The geometry of a flight is stored as a structure of arrays: the
+position and boresight of every channel are stored in contiguous
+arrays indexed in the same order as `ANITA.channels` (the H and V
+channels of an antenna share a position and boresight).
+
+Positions are in meters in the payload frame (z up, azimuth measured
+counter-clockwise from the x-axis) with the origin at the bottom ring
+on the payload axis. Directions are (elevation, azimuth) in degrees
+towards the source.
+
+The arrival delay of a plane wave at each antenna is relative to the
+arrival at the origin in ns, i.e. antennas closer to the source see the
+wave first (with a negative delay). Delays are computed for arrays of
+directions in a single call with `get_delays`, or looked up from a
+cached table on an (elevation, azimuth) grid with `get_delay_table`
+(or its raw arrays with `get_delay_table_arrays`).
+"""
+from typing import NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+import xarray as xr
+
+from panama.cache import cached
+from panama.profiling import instrumented
+
+__all__ = [
+    "Geometry",
+    "boresights",
+    "get_geometry",
+    "directions",
+    "get_delays",
+    "get_delay_table",
+    "get_delay_table_arrays",
+    "DelayTable",
+]
+
+# the speed of light in m/ns
+SPEED_OF_LIGHT: float = 0.299792458
+
+# the nominal (radius, height) of each ring of each flight in m
+RINGS = {4: {"T": (1.0, 4.6), "M": (2.6, 1.4), "B": (2.6, 0.0)}}
+
+
+class Geometry(NamedTuple):
+    """
+    The position and boresight of every channel on a payload.
+    """
+
+    channels: Tuple[str, ...]  # the channel identifiers
+    positions: np.ndarray  # the (channels, 3) position of each antenna in m
+    elevation: np.ndarray  # the boresight elevation of each channel in degrees
+    azimuth: np.ndarray  # the boresight azimuth of each channel in degrees
+
+
+def boresights(
+    channels: Sequence[str], nsectors: int = 16, cant: float = -10.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the nominal boresight of each channel.
+
+    Every antenna is canted down by `cant` degrees and phi sector N
+    points at an azimuth of (360 / nsectors) * (N - 1) degrees.
+
+    Parameters
+    ----------
+    channels: Sequence[str]
+        The channel identifiers - the first two characters are the phi sector.
+    nsectors: int
+        The number of phi sectors around the payload.
+    cant: float
+        The elevation of every boresight in degrees.
+
+    Returns
+    -------
+    elevation, azimuth: Tuple[np.ndarray, np.ndarray]
+        The boresight elevation and azimuth of each channel in degrees.
+    """
+    # the phi sector of each channel
+    phi = np.asarray([int(channel[:2]) for channel in channels])
+
+    # and the elevation and azimuth of each channel
+    return np.full(phi.size, cant), (360.0 / nsectors) * (phi - 1)
+
+
+@cached
+def get_geometry(flight: int = 4) -> Geometry:
+    """
+    Get the nominal geometry of every channel on a given flight.
+
+    Parameters
+    ----------
+    flight: int
+        The ANITA flight to get the geometry of.
+
+    Returns
+    -------
+    geometry: Geometry
+        The read-only position and boresight of every channel.
+
+    Raises
+    ------
+    ValueError:
+        If the geometry is not available for this flight.
+    """
+    from panama.anita4 import ANITA4
+
+    # we only have the geometry of ANITA-4
+    if flight not in RINGS:
+        raise ValueError("The payload geometry is only available for ANITA-4.")
+
+    # get the channels and boresights of the payload
+    anita = ANITA4()
+    elevation, azimuth = anita.boresights
+
+    # the radius and height of the ring of each channel
+    radius, height = np.asarray(
+        [RINGS[flight][channel[2]] for channel in anita.channels]
+    ).T
+
+    # each antenna sits on its ring along its boresight azimuth
+    phi = np.radians(azimuth)
+    positions = np.stack([radius * np.cos(phi), radius * np.sin(phi), height], axis=-1)
+
+    # make sure that nobody modifies the cached arrays
+    elevation = np.array(elevation, dtype=float)
+    azimuth = np.array(azimuth, dtype=float)
+    for array in (positions, elevation, azimuth):
+        array.flags.writeable = False
+
+    # and we are done
+    return Geometry(tuple(anita.channels), positions, elevation, azimuth)
+
+
+def directions(
+    elevation: Union[float, np.ndarray], azimuth: Union[float, np.ndarray]
+) -> np.ndarray:
+    """
+    Get the unit vectors pointing in a set of directions.
+
+    Parameters
+    ----------
+    elevation: Union[float, np.ndarray]
+        The elevation of each direction in degrees.
+    azimuth: Union[float, np.ndarray]
+        The azimuth of each direction in degrees.
+
+    Returns
+    -------
+    directions: np.ndarray
+        The (..., 3) unit vector of each direction.
+    """
+    # convert to radians
+    theta, phi = np.radians(elevation), np.radians(azimuth)
+
+    # and compute the unit vectors
+    return np.stack(
+        np.broadcast_arrays(
+            np.cos(theta) * np.cos(phi), np.cos(theta) * np.sin(phi), np.sin(theta)
+        ),
+        axis=-1,
+    )
+
+
+@instrumented
+def get_delays(
+    elevation: Union[float, np.ndarray],
+    azimuth: Union[float, np.ndarray],
+    flight: int = 4,
+) -> np.ndarray:
+    """
+    Get the arrival delay of plane waves at every channel.
+
+    Parameters
+    ----------
+    elevation: Union[float, np.ndarray]
+        The elevation of each source direction in degrees.
+    azimuth: Union[float, np.ndarray]
+        The azimuth of each source direction in degrees.
+    flight: int
+        The ANITA flight to compute the delays for.
+
+    Returns
+    -------
+    delays: np.ndarray
+        The (..., channels) delay at each channel relative to the origin in ns.
+    """
+    # the position of each antenna
+    positions = get_geometry(flight).positions
+
+    # the projection of each antenna along each direction
+    projection = directions(elevation, azimuth) @ positions.T
+
+    # and antennas further towards the source see the wave first
+    return -projection / SPEED_OF_LIGHT
+
+
+class DelayTable(NamedTuple):
+    """
+    The raw (read-only) arrays of a table of delays.
+    """
+
+    elevation: np.ndarray  # the elevation of each row in degrees
+    azimuth: np.ndarray  # the azimuth of each column in degrees
+    delays: np.ndarray  # the (elevation, azimuth, ...) delays in ns
+
+
+@instrumented
+def get_delay_table(
+    flight: int = 4,
+    elevations: Tuple[float, float, int] = (-60.0, 60.0, 121),
+    nazimuth: int = 360,
+) -> xr.DataArray:
+    """
+    Get a table of plane-wave arrival delays on an (elevation, azimuth) grid.
+
+    This is computed once per grid and cached (see `get_delay_table_arrays`).
+    A new DataArray is returned on every call but it shares the cached,
+    read-only arrays.
+
+    Parameters
+    ----------
+    flight: int
+        The ANITA flight to compute the delays for.
+    elevations: Tuple[float, float, int]
+        The (start, stop, number) of elevations in degrees (inclusive).
+    nazimuth: int
+        The number of azimuths evenly spaced in [0, 360) degrees.
+
+    Returns
+    -------
+    table: xr.DataArray
+        The read-only (elevation, azimuth, channels) delays in ns.
+    """
+    # the cached table
+    table = get_delay_table_arrays(flight, elevations, nazimuth)
+
+    # wrap it into a DataArray
+    xray = xr.DataArray(
+        table.delays,
+        dims=["elevation", "azimuth", "channels"],
+        coords={
+            "elevation": table.elevation,
+            "azimuth": table.azimuth,
+            "channels": list(get_geometry(flight).channels),
+        },
+        name="delays",
+    )
+
+    # add units to the coordinates
+    xray.attrs["units"] = "ns"
+    xray.elevation.attrs["units"] = "degrees"
+    xray.azimuth.attrs["units"] = "degrees"
+
+    # and we are done
+    return xray
+
+
+@cached
+def get_delay_table_arrays(
+    flight: int = 4,
+    elevations: Tuple[float, float, int] = (-60.0, 60.0, 121),
+    nazimuth: int = 360,
+) -> DelayTable:
+    """
+    Get the raw arrays of a table of plane-wave arrival delays.
+
+    This is the array equivalent of `get_delay_table` (which wraps it)
+    and is computed once per grid and cached.
+
+    Parameters
+    ----------
+    flight: int
+        The ANITA flight to compute the delays for.
+    elevations: Tuple[float, float, int]
+        The (start, stop, number) of elevations in degrees (inclusive).
+    nazimuth: int
+        The number of azimuths evenly spaced in [0, 360) degrees.
+
+    Returns
+    -------
+    table: DelayTable
+        The read-only grid and (elevation, azimuth, channels) delays in ns.
+    """
+    # the grid of directions
+    elevation = np.linspace(*elevations)
+    azimuth = np.arange(nazimuth) * (360.0 / nazimuth)
+
+    # compute every delay at once
+    delays = get_delays(elevation[:, None], azimuth[None, :], flight)
+
+    # make sure that nobody modifies the cached arrays
+    for array in (elevation, azimuth, delays):
+        array.flags.writeable = False
+
+    # and we are done
+    return DelayTable(elevation, azimuth, delays)
@@ -0,0 +1,411 @@
+"""
+Interferometric pointing reconstruction of batches of events.
+
+The waveforms of every pair of (same polarization) antennas within a
+few phi-sectors of each other are cross-correlated with a single batched
+FFT. The correlation of each pair at the arrival delay of a plane wave
+from each direction is then averaged over every pair to form an
+(elevation, azimuth) map of each event (see `panama.geometry`).
+
+The peak of each map is found on a coarse grid, whose pair delays are
+precomputed and cached (see `get_pair_delay_table`), and then refined
+with a zoomed second pass around the coarse peak of each event.
+"""
+from typing import NamedTuple, Tuple
+
+import numpy as np
+import xarray as xr
+
+import panama.geometry
+from panama.anita import ANITA
+from panama.cache import cached
+from panama.convolution import next_fast_len
+from panama.geometry import DelayTable
+from panama.profiling import instrumented
+
+__all__ = [
+    "Interferometer",
+    "Pointing",
+    "get_pairs",
+    "get_pair_delay_table",
+    "get_pair_delay_table_arrays",
+]
+
+
+class Pointing(NamedTuple):
+    """
+    The reconstructed direction of a batch of events.
+    """
+
+    elevation: np.ndarray  # the (events,) elevation of the peak in degrees
+    azimuth: np.ndarray  # the (events,) azimuth of the peak in degrees
+    peak: np.ndarray  # the (events,) mean correlation at the peak
+    coarse: np.ndarray  # the (events, elevation, azimuth) coarse map
+
+
+@cached
+def get_pairs(flight: int = 4, pol: str = "H", sectors: int = 2) -> np.ndarray:
+    """
+    Get the antenna pairs used for interferometry.
+
+    Parameters
+    ----------
+    flight: int
+        The ANITA flight to get the pairs for.
+    pol: str
+        The polarization ("H" or "V") of the pairs.
+    sectors: int
+        The largest phi-sector separation of the antennas in a pair.
+
+    Returns
+    -------
+    pairs: np.ndarray
+        The read-only (pairs, 2) channel indices of each pair.
+
+    Raises
+    ------
+    ValueError:
+        If `pol` is not "H" or "V".
+    """
+    # check that we have a valid polarization
+    if pol not in ("H", "V"):
+        raise ValueError(f"{pol} must be 'H' or 'V'.")
+
+    # the channels of this flight
+    channels = panama.geometry.get_geometry(flight).channels
+
+    # the channels with this polarization and their phi-sector
+    indices = np.asarray([i for i, c in enumerate(channels) if c[-1] == pol])
+    phi = np.asarray([int(channels[i][:2]) for i in indices])
+
+    # the phi-sector separation of every pair (including the wraparound)
+    separation = np.abs(phi[:, None] - phi[None, :])
+    separation = np.minimum(separation, phi.max() - separation)
+
+    # and keep every unique pair that is close enough
+    first, second = np.nonzero(np.triu(separation <= sectors, k=1))
+    pairs = np.stack([indices[first], indices[second]], axis=-1)
+    pairs.flags.writeable = False
+
+    # and we are done
+    return pairs
+
+
+@instrumented
+def get_pair_delay_table(
+    flight: int = 4,
+    pol: str = "H",
+    sectors: int = 2,
+    elevations: Tuple[float, float, int] = (-60.0, 60.0, 61),
+    nazimuth: int = 180,
+) -> xr.DataArray:
+    """
+    Get the difference in arrival delay of every pair on an (elevation, azimuth) grid.
+
+    This is computed once per grid and cached (see `get_pair_delay_table_arrays`).
+    A new DataArray is returned on every call but it shares the cached,
+    read-only arrays.
+
+    Parameters
+    ----------
+    flight: int
+        The ANITA flight to compute the delays for.
+    pol: str
+        The polarization ("H" or "V") of the pairs.
+    sectors: int
+        The largest phi-sector separation of the antennas in a pair.
+    elevations: Tuple[float, float, int]
+        The (start, stop, number) of elevations in degrees (inclusive).
+    nazimuth: int
+        The number of azimuths evenly spaced in [0, 360) degrees.
+
+    Returns
+    -------
+    table: xr.DataArray
+        The read-only (elevation, azimuth, pairs) delay of the first
+        antenna of each pair relative to the second in ns.
+
+    Raises
+    ------
+    ValueError:
+        If `pol` is not "H" or "V".
+    """
+    # the cached table
+    table = get_pair_delay_table_arrays(flight, pol, sectors, elevations, nazimuth)
+
+    # wrap it into a DataArray
+    xray = xr.DataArray(
+        table.delays,
+        dims=["elevation", "azimuth", "pairs"],
+        coords={"elevation": table.elevation, "azimuth": table.azimuth},
+        name="delays",
+    )
+
+    # add units to the table
+    xray.attrs["units"] = "ns"
+
+    # and we are done
+    return xray
+
+
+@cached
+def get_pair_delay_table_arrays(
+    flight: int = 4,
+    pol: str = "H",
+    sectors: int = 2,
+    elevations: Tuple[float, float, int] = (-60.0, 60.0, 61),
+    nazimuth: int = 180,
+) -> DelayTable:
+    """
+    Get the raw arrays of a table of the pair delays.
+
+    This is the array equivalent of `get_pair_delay_table` (which wraps it)
+    and is computed once per grid and cached.
+
+    Parameters
+    ----------
+    flight: int
+        The ANITA flight to compute the delays for.
+    pol: str
+        The polarization ("H" or "V") of the pairs.
+    sectors: int
+        The largest phi-sector separation of the antennas in a pair.
+    elevations: Tuple[float, float, int]
+        The (start, stop, number) of elevations in degrees (inclusive).
+    nazimuth: int
+        The number of azimuths evenly spaced in [0, 360) degrees.
+
+    Returns
+    -------
+    table: DelayTable
+        The read-only grid and (elevation, azimuth, pairs) delays in ns.
+
+    Raises
+    ------
+    ValueError:
+        If `pol` is not "H" or "V".
+    """
+    # the delays at every channel on this grid
+    delays = panama.geometry.get_delay_table_arrays(flight, elevations, nazimuth)
+
+    # and the difference across each pair
+    pairs = get_pairs(flight, pol, sectors)
+    difference = delays.delays[..., pairs[:, 0]] - delays.delays[..., pairs[:, 1]]
+    difference.flags.writeable = False
+
+    # and we are done
+    return DelayTable(delays.elevation, delays.azimuth, difference)
+
+
+class Interferometer:
+    """
+    Reconstruct the direction of batches of (events, channels, samples) waveforms.
+
+    Parameters
+    ----------
+    payload: ANITA
+        The payload (and flight) that recorded the waveforms.
+    fs: float
+        The sample rate of the waveforms in GSa/s.
+    pol: str
+        The polarization ("H" or "V") to reconstruct.
+    sectors: int
+        The largest phi-sector separation of the antennas in a pair.
+    upsample: int
+        The factor to upsample the cross-correlations by.
+    elevations: Tuple[float, float, int]
+        The (start, stop, number) of coarse elevations in degrees (inclusive).
+    nazimuth: int
+        The number of coarse azimuths evenly spaced in [0, 360) degrees.
+    nzoom: int
+        The number of elevations and azimuths in the zoomed map.
+    chunk: int
+        The number of pairs to accumulate into each map at once.
+
+    Raises
+    ------
+    ValueError:
+        If `pol` is not "H" or "V".
+    """
+
+    def __init__(
+        self,
+        payload: ANITA,
+        fs: float,
+        pol: str = "H",
+        sectors: int = 2,
+        upsample: int = 4,
+        elevations: Tuple[float, float, int] = (-60.0, 60.0, 61),
+        nazimuth: int = 180,
+        nzoom: int = 21,
+        chunk: int = 32,
+    ):
+        self.payload = payload
+        self.fs = fs
+        self.upsample = upsample
+        self.nzoom = nzoom
+        self.chunk = chunk
+        self.pol = pol
+
+        # the pairs that we correlate (this checks the polarization)
+        self.pairs = get_pairs(payload.flight, pol, sectors)
+
+        # the coarse (elevation, azimuth, pairs) delay table
+        self.table = get_pair_delay_table_arrays(
+            payload.flight, pol, sectors, elevations, nazimuth
+        )
+
+        # the spacing of the coarse grid in degrees
+        self.step = (
+            (elevations[1] - elevations[0]) / max(elevations[2] - 1, 1),
+            360.0 / nazimuth,
+        )
+
+    def correlate(self, waveforms: np.ndarray) -> np.ndarray:
+        """
+        Cross-correlate every pair of antennas.
+
+        Parameters
+        ----------
+        waveforms: np.ndarray
+            The (events, channels, samples) waveforms.
+
+        Returns
+        -------
+        correlations: np.ndarray
+            The (events, pairs, lags) normalized cross-correlations
+            where lag k is k / (fs * upsample) ns (wrapping around).
+        """
+        # normalize every waveform to zero mean and unit energy
+        centered = waveforms - waveforms.mean(axis=-1, keepdims=True)
+        norm = np.sqrt(np.sum(np.square(centered), axis=-1, keepdims=True))
+        centered = centered / np.where(norm > 0, norm, 1.0)
+
+        # the zero-padded FFT of every channel
+        nfft = next_fast_len(2 * waveforms.shape[-1])
+        spectra = np.fft.rfft(centered, n=nfft, axis=-1)
+
+        # the cross-spectrum of every pair
+        cross = spectra[:, self.pairs[:, 0], :] * np.conj(
+            spectra[:, self.pairs[:, 1], :]
+        )
+
+        # and the upsampled cross-correlations
+        return self.upsample * np.fft.irfft(cross, n=self.upsample * nfft, axis=-1)
+
+    def _fill(self, correlations: np.ndarray, delays: np.ndarray) -> np.ndarray:
+        """
+        Average the correlation of every pair at a set of delays.
+
+        Parameters
+        ----------
+        correlations: np.ndarray
+            The (events, pairs, lags) cross-correlations.
+        delays: np.ndarray
+            The (events or 1, directions, pairs) pair delays in ns.
+
+        Returns
+        -------
+        map: np.ndarray
+            The (events, directions) mean correlation.
+        """
+        # the fractional lag of each delay
+        lags = delays.transpose(0, 2, 1) * (self.fs * self.upsample)
+        below = np.floor(lags)
+        weight = lags - below
+
+        # the index of the lags on either side (wrapping negative lags)
+        nlags = correlations.shape[-1]
+        below = below.astype(np.intp) % nlags
+        above = (below + 1) % nlags
+
+        # the shape of the gathered correlations
+        nevents, npairs = correlations.shape[:2]
+        total = np.zeros((nevents, delays.shape[1]))
+
+        # accumulate a chunk of pairs at a time to bound the memory usage
+        for start in range(0, npairs, self.chunk):
+            stop = start + self.chunk
+            shape = (nevents, min(stop, npairs) - start, delays.shape[1])
+            corr = correlations[:, start:stop, :]
+            lower = np.take_along_axis(
+                corr, np.broadcast_to(below[:, start:stop], shape), axis=-1
+            )
+            upper = np.take_along_axis(
+                corr, np.broadcast_to(above[:, start:stop], shape), axis=-1
+            )
+            frac = weight[:, start:stop]
+            total += np.sum(lower + frac * (upper - lower), axis=1)
+
+        # and we are done
+        return total / npairs
+
+    @instrumented
+    def __call__(self, waveforms: np.ndarray) -> Pointing:
+        """
+        Reconstruct the direction of a batch of events.
+
+        Parameters
+        ----------
+        waveforms: np.ndarray
+            The (events, channels, samples) waveforms.
+
+        Returns
+        -------
+        pointing: Pointing
+            The direction, peak correlation, and coarse map of every event.
+
+        Raises
+        ------
+        ValueError:
+            If the waveforms do not have one trace per channel.
+        """
+        # check that we have the right number of channels
+        if waveforms.ndim != 3 or waveforms.shape[1] != len(self.payload.channels):
+            raise ValueError(
+                f"Expected (events, {len(self.payload.channels)}, samples) "
+                f"waveforms but got {waveforms.shape}."
+            )
+
+        # correlate every pair of every event at once
+        correlations = self.correlate(waveforms)
+
+        # the coarse map of every event
+        nelevation, nazimuth, npairs = self.table.delays.shape
+        coarse = self._fill(
+            correlations, self.table.delays.reshape(1, -1, npairs)
+        ).reshape(-1, nelevation, nazimuth)
+
+        # the coarse peak of each event
+        ipeak, jpeak = np.unravel_index(
+            coarse.reshape(len(coarse), -1).argmax(axis=-1), (nelevation, nazimuth)
+        )
+
+        # a zoomed grid around the coarse peak of each event
+        offsets = np.linspace(-1.0, 1.0, self.nzoom)
+        elevation = self.table.elevation[ipeak][:, None] + offsets * self.step[0]
+        azimuth = self.table.azimuth[jpeak][:, None] + offsets * self.step[1]
+
+        # the (events, elevation, azimuth, channels) delays on each zoomed grid
+        delays = panama.geometry.get_delays(
+            elevation[:, :, None], azimuth[:, None, :], self.payload.flight
+        )
+
+        # the pair delays on each zoomed grid
+        pairs = delays[..., self.pairs[:, 0]] - delays[..., self.pairs[:, 1]]
+
+        # and the zoomed map of every event
+        fine = self._fill(correlations, pairs.reshape(len(pairs), -1, npairs))
+
+        # and find the peak of each zoomed map
+        best = fine.argmax(axis=-1)
+        ibest, jbest = np.unravel_index(best, (self.nzoom, self.nzoom))
+        events = np.arange(len(fine))
+
+        # and we are done
+        return Pointing(
+            elevation[events, ibest],
+            azimuth[events, jbest] % 360.0,
+            fine[events, best],
+            coarse,
+        )
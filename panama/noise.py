@@ -0,0 +1,384 @@
+"""
+Thermal noise of the payload signal chain.
+
+The system temperature of each TUFF configuration is computed from the
+Friis cascade of the antenna, the AMPA, and the (passive) TUFF, all
+referred to the input of the AMPA (see `get_system_temperature`).
+
+Gaussian thermal noise with a one-sided power spectral density of
+k T(f) R (where T is the system temperature and R is the impedance)
+is then shaped by the "receiver" chain of each channel and TUFF
+configuration (see `panama.chain`) and returned in volts.
+
+Noise is generated directly in the frequency domain: an independent
+complex Gaussian spectrum is drawn for every (event, channel) with the
+appropriate variance in each bin and then transformed into the time
+domain with a single batched inverse real FFT.
+
+Every call takes an explicit `np.random.Generator` so that workers can
+generate independent streams - see `spawn_generators`.
+"""
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import xarray as xr
+
+import panama.calibration.grid as grid
+from panama.anita import ANITA
+from panama.cache import cached
+from panama.profiling import instrumented
+
+__all__ = ["get_system_temperature", "NoiseGenerator", "spawn_generators"]
+
+# Boltzmann's constant in J/K
+BOLTZMANN: float = 1.380649e-23
+
+# the default impedance of the signal chain in Ohms
+IMPEDANCE: float = 50.0
+
+# the default antenna (sky + ice) noise temperature in K
+ANTENNA_TEMPERATURE: float = 290.0
+
+# the physical temperature of passive components in K
+REFERENCE_TEMPERATURE: float = 290.0
+
+
+@instrumented
+def get_system_temperature(
+    configs: List[str],
+    flight: int,
+    fs: float,
+    N: int,
+    temperature: float = ANTENNA_TEMPERATURE,
+    impedance: float = IMPEDANCE,
+) -> xr.Dataset:
+    """
+    Get the system noise temperature and RMS voltage of every TUFF config.
+
+    The system temperature is referred to the input of the AMPA
+    using the Friis formula for the cascade of the AMPA and the TUFF
+
+        T_sys = T_ant + T_ampa + T_tuff / G_ampa
+
+    where the TUFF is passive so T_tuff = (1 / G_tuff - 1) * 290 K.
+    Outside of the measured band the gains are zero (see
+    `calibration.grid`) and the TUFF term is dropped.
+
+    The RMS voltage is the total noise power at the output of the TUFF
+    over every bin of the FFT grid (excluding DC).
+
+    Parameters
+    ----------
+    configs: List[str]
+        The TUFF configurations.
+    flight: int
+        The ANITA flight.
+    fs: float
+        The sample rate in GSa/s.
+    N: int
+        The number of samples in the FFT.
+    temperature: float
+        The antenna noise temperature in K.
+    impedance: float
+        The impedance of the signal chain in Ohms.
+
+    Returns
+    -------
+    system: xr.Dataset
+        The read-only (configs, freqs) 'temperature' in K and (configs,) 'vrms' in V.
+
+    Raises
+    ------
+    ValueError:
+        If the calibrations are not available for this flight.
+    """
+    return _get_system_temperature(
+        tuple(configs), flight, fs, N, temperature, impedance
+    )
+
+
+@cached
+def _get_system_temperature(
+    configs: Tuple[str, ...],
+    flight: int,
+    fs: float,
+    N: int,
+    temperature: float,
+    impedance: float,
+) -> xr.Dataset:
+    """
+    The cached implementation of `get_system_temperature`.
+    """
+
+    # we only have AMPA and TUFF measurements for ANITA-4
+    if flight != 4:
+        raise ValueError("The system temperature is only available for ANITA-4.")
+
+    # the linear power gain and noise temperature of the AMPA
+    ampa = grid.get_ampa_response(fs, N)
+    ampa_gain = 10.0 ** (ampa.S21.values / 10.0)
+
+    # the (configs, freqs) linear power gain of the TUFF
+    tuff_gain = 10.0 ** (
+        np.stack([grid.get_tuff_response(config, fs, N).values for config in configs])
+        / 10.0
+    )
+
+    # the noise temperature of the (passive) TUFF - which adds no noise
+    # outside of its band (where the resampled gain is zero)
+    loss = np.divide(1.0, tuff_gain, out=np.ones_like(tuff_gain), where=tuff_gain > 0)
+    tuff_temperature = REFERENCE_TEMPERATURE * np.maximum(loss - 1.0, 0.0)
+
+    # the TUFF temperature referred to the input of the AMPA
+    referred = np.divide(
+        tuff_temperature,
+        ampa_gain,
+        out=np.zeros_like(tuff_temperature),
+        where=ampa_gain > 0,
+    )
+
+    # and the system temperature at the input of the AMPA
+    system = temperature + ampa.NF.values + referred
+
+    # the width of each frequency bin in Hz
+    df = 1e9 * fs / N
+
+    # the noise power in each bin at the output of the TUFF
+    power = BOLTZMANN * system * impedance * df * ampa_gain * tuff_gain
+
+    # the chain is AC-coupled and the Nyquist bin is only half a bin wide
+    power[:, 0] = 0.0
+    if N % 2 == 0:
+        power[:, -1] /= 2.0
+
+    # and the RMS voltage of each config
+    vrms = np.sqrt(np.sum(power, axis=-1))
+
+    # make sure that nobody can modify the results
+    system.flags.writeable = False
+    vrms.flags.writeable = False
+
+    # create the system temperature
+    T = xr.DataArray(
+        system,
+        dims=["configs", "freqs"],
+        coords={"configs": list(configs), "freqs": grid.rfft_freqs(fs, N)},
+    )
+    T.attrs["units"] = "K"
+    T.attrs["long_name"] = "System Temperature"
+
+    # and the RMS voltage
+    V = xr.DataArray(vrms, dims="configs", coords={"configs": list(configs)})
+    V.attrs["units"] = "V"
+    V.attrs["long_name"] = "RMS Voltage"
+
+    # and create the dataset
+    response = xr.Dataset({"temperature": T, "vrms": V})
+
+    # label the independent variables
+    response.freqs.attrs["units"] = "MHz"
+    response.freqs.attrs["long_name"] = "Frequency"
+
+    # and we are done
+    return response
+
+
+def spawn_generators(
+    seed: Optional[Union[int, np.random.SeedSequence]], n: int
+) -> List[np.random.Generator]:
+    """
+    Create `n` statistically independent random number generators.
+
+    Each worker should use its own generator so that the noise
+    generated by different workers is independent and reproducible.
+
+    Parameters
+    ----------
+    seed: Optional[Union[int, np.random.SeedSequence]]
+        The root seed. If None, fresh entropy is used.
+    n: int
+        The number of generators to create.
+
+    Returns
+    -------
+    generators: List[np.random.Generator]
+        The independent generators.
+    """
+    # create the root of the seed tree
+    if isinstance(seed, np.random.SeedSequence):
+        root = seed
+    else:
+        root = np.random.SeedSequence(seed)
+
+    # and create an independent child stream for each worker
+    return [np.random.default_rng(child) for child in root.spawn(n)]
+
+
+class NoiseGenerator:
+    """
+    Generate (events, channels, samples) thermal noise waveforms.
+
+    The amplitude spectrum of every channel and TUFF configuration is
+    computed once at construction so each call only draws the random
+    spectra, scales them, and performs an inverse FFT.
+
+    Parameters
+    ----------
+    payload: ANITA
+        The payload (and flight) to generate noise for.
+    fs: float
+        The sample rate in GSa/s.
+    nsamples: int
+        The number of samples in each waveform.
+    temperature: float
+        The antenna noise temperature in K.
+    impedance: float
+        The impedance of the signal chain in Ohms.
+    channels: Optional[Sequence[str]]
+        The channels to generate. Defaults to all channels on the payload.
+    dtype: np.dtype
+        The floating point type of the generated waveforms.
+    """
+
+    def __init__(
+        self,
+        payload: ANITA,
+        fs: float,
+        nsamples: int,
+        temperature: float = ANTENNA_TEMPERATURE,
+        impedance: float = IMPEDANCE,
+        channels: Optional[Sequence[str]] = None,
+        dtype: Union[type, np.dtype] = np.float64,
+    ):
+        self.payload = payload
+        self.fs = fs
+        self.nsamples = nsamples
+        self.temperature = temperature
+        self.impedance = impedance
+        self.dtype = np.dtype(dtype)
+        self.channels = list(channels) if channels is not None else payload.channels
+
+        # check that we were asked for a floating point type
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError(f"{self.dtype} must be float32 or float64.")
+
+        # the (channels, configs, freqs) receiver chain on our FFT grid
+        chain = payload.chain("receiver", fs, nsamples).sel(channels=self.channels)
+
+        # the (configs, freqs) system temperature in K
+        system = get_system_temperature(
+            payload.configs, payload.flight, fs, nsamples, temperature, impedance
+        ).temperature.values
+
+        # the width of each frequency bin in Hz
+        df = 1e9 * fs / nsamples
+
+        # the one-sided noise power (in V^2) in each bin at the output of the chain
+        power = (
+            BOLTZMANN * system[None, ...] * impedance * df * np.abs(chain.values) ** 2
+        )
+
+        # the per-quadrature standard deviation of each (unnormalized) FFT bin
+        # i.e. sum(|X_k|^2)/N^2 over the full FFT is the variance of the noise
+        scale = nsamples * np.sqrt(power / 4.0)
+
+        # the chain is AC-coupled so there is no DC noise
+        # and the Nyquist bin is purely real with twice the variance
+        scale[..., 0] = 0.0
+        if nsamples % 2 == 0:
+            scale[..., -1] *= np.sqrt(2.0)
+
+        # store the scale in the precision that we generate in
+        self.scale = scale.astype(self.dtype)
+        self.scale.flags.writeable = False
+
+        # whether the last bin is the (real) Nyquist bin
+        self._nyquist = nsamples % 2 == 0
+
+    @property
+    def vrms(self) -> np.ndarray:
+        """
+        The expected (channels, configs) RMS voltage of the noise.
+        """
+        # undo the FFT normalization of `scale` - see `__init__`
+        power = 4.0 * (self.scale.astype(float) / self.nsamples) ** 2
+
+        # the Nyquist bin only appears once in the full FFT
+        if self._nyquist:
+            power[..., -1] /= 4.0
+
+        # and sum the power over every bin
+        return np.sqrt(np.sum(power, axis=-1))
+
+    @instrumented
+    def __call__(
+        self,
+        nevents: int,
+        configs: Union[int, str, Sequence],
+        rng: Optional[np.random.Generator] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Generate a batch of noise waveforms.
+
+        Parameters
+        ----------
+        nevents: int
+            The number of events to generate.
+        configs: Union[int, str, Sequence]
+            The TUFF config (name or index) of every event or a single
+            config for every event.
+        rng: Optional[np.random.Generator]
+            The random number generator to use. Defaults to a fresh generator.
+        out: Optional[np.ndarray]
+            If provided, the (events, channels, samples) array to store the noise.
+
+        Returns
+        -------
+        noise: np.ndarray
+            The (events, channels, samples) noise waveforms in V.
+
+        Raises
+        ------
+        ValueError:
+            If the number of configs does not match the number of events.
+        """
+        # use a fresh generator if we weren't given one
+        if rng is None:
+            rng = np.random.default_rng()
+
+        # get the config index of each event
+        indices = self.payload.config_indices(configs)
+        if indices.size == 1:
+            indices = np.repeat(indices, nevents)
+        elif indices.size != nevents:
+            raise ValueError(f"Expected {nevents} configs but got {indices.size}.")
+
+        # draw the real and imaginary parts of every bin
+        shape = (nevents, len(self.channels), self.scale.shape[-1])
+        spectra = rng.standard_normal((2,) + shape, dtype=self.dtype)
+
+        # the (events, channels, freqs) chain scale for the config of each event
+        scale = self.scale[:, indices, :].transpose(1, 0, 2)
+
+        # and combine them into complex spectra
+        spectrum = np.empty(shape, dtype=np.result_type(self.dtype, np.complex64))
+        spectrum.real = spectra[0] * scale
+        spectrum.imag = spectra[1] * scale
+
+        # the Nyquist bin must be real
+        if self._nyquist:
+            spectrum.imag[..., -1] = 0.0
+
+        # and transform into the time-domain
+        noise = np.fft.irfft(spectrum, n=self.nsamples, axis=-1).astype(
+            self.dtype, copy=False
+        )
+
+        # copy into the output array if we were given one
+        if out is not None:
+            out[...] = noise
+            return out
+
+        # and we are done
+        return noise
@@ -0,0 +1,266 @@
+"""
+Opt-in instrumentation of the PANAMA loaders and compute entry points.
+
+When profiling is enabled, PANAMA records:
+
+- the number of calls and cumulative wall time of every instrumented
+  function (nested calls are included in the time of their callers),
+- the number and total size of the data files that are read, and
+- the hits and misses of the loader cache (see `panama.cache`).
+
+```
+from panama import profiling
+
+with profiling.profile("profile.json"):
+    run_simulation()
+
+print(profiling.report()["calls"])
+```
+
+Profiling can also be enabled for a whole job by setting the
+`PANAMA_PROFILE` environment variable to the path of the JSON report
+that is written when the interpreter exits.
+
+When profiling is disabled, the overhead of an instrumented call
+is a single flag check.
+"""
+import atexit
+import json
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+__all__ = [
+    "instrumented",
+    "record_read",
+    "enable",
+    "disable",
+    "reset",
+    "report",
+    "dump",
+    "profile",
+]
+
+# the type of an instrumented function
+F = TypeVar("F", bound=Callable[..., Any])
+
+# whether we are currently recording
+_enabled: bool = False
+
+# the (count, cumulative time) of each instrumented function
+_calls: Dict[str, Tuple[int, float]] = {}
+
+# the number of files and the total number of bytes read
+_reads: Dict[str, int] = {"files": 0, "bytes": 0}
+
+# the loader cache statistics when we were last reset
+_baseline: Dict[str, Tuple[int, int]] = {}
+
+# protect the registry against concurrent updates
+_lock = Lock()
+
+
+def instrumented(func: F) -> F:
+    """
+    Record the number of calls and wall time of a function.
+
+    Parameters
+    ----------
+    func: Callable
+        The function to instrument.
+
+    Returns
+    -------
+    wrapper: Callable
+        The instrumented function.
+    """
+
+    # the name that we record this function under
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+
+        # if we aren't profiling, just call the function
+        if not _enabled:
+            return func(*args, **kwargs)
+
+        # otherwise, time the call
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with _lock:
+                count, total = _calls.get(name, (0, 0.0))
+                _calls[name] = (count + 1, total + elapsed)
+
+    return wrapper  # type: ignore
+
+
+def record_read(filename: str) -> None:
+    """
+    Record that a data file has been read.
+
+    Parameters
+    ----------
+    filename: str
+        The path of the file.
+
+    Returns
+    -------
+    None
+    """
+    if _enabled:
+        size = os.path.getsize(filename)
+        with _lock:
+            _reads["files"] += 1
+            _reads["bytes"] += size
+
+
+def _cache_loaders() -> Dict[str, Tuple[int, int]]:
+    """
+    Get the current (hits, misses) of every cached loader.
+    """
+    import panama.cache
+
+    return panama.cache.stats().loaders
+
+
+def reset() -> None:
+    """
+    Clear every recorded statistic.
+
+    Returns
+    -------
+    None
+    """
+    global _baseline
+
+    with _lock:
+        _calls.clear()
+        _reads.update(files=0, bytes=0)
+        _baseline = _cache_loaders()
+
+
+def enable(clear: bool = True) -> None:
+    """
+    Start recording statistics.
+
+    Parameters
+    ----------
+    clear: bool
+        If True, clear any previously recorded statistics.
+
+    Returns
+    -------
+    None
+    """
+    global _enabled
+
+    if clear:
+        reset()
+    _enabled = True
+
+
+def disable() -> None:
+    """
+    Stop recording statistics. The recorded statistics are kept.
+
+    Returns
+    -------
+    None
+    """
+    global _enabled
+
+    _enabled = False
+
+
+def report() -> Dict[str, Any]:
+    """
+    Get the statistics recorded since the last reset.
+
+    Returns
+    -------
+    report: Dict[str, Any]
+        The 'calls' ('count' and 'time' in seconds) of each function,
+        the number of 'files' and 'bytes' that were read, and the
+        'hits', 'misses', and 'hit_rate' of the loader cache (in total
+        and for each loader).
+    """
+    # the cache statistics since the last reset
+    loaders = {}
+    for name, (hits, misses) in _cache_loaders().items():
+        base_hits, base_misses = _baseline.get(name, (0, 0))
+        if (hits - base_hits) or (misses - base_misses):
+            loaders[name] = {"hits": hits - base_hits, "misses": misses - base_misses}
+
+    # the total hits and misses
+    hits = sum(loader["hits"] for loader in loaders.values())
+    misses = sum(loader["misses"] for loader in loaders.values())
+
+    with _lock:
+        return {
+            "calls": {
+                name: {"count": count, "time": total}
+                for name, (count, total) in sorted(_calls.items())
+            },
+            "reads": dict(_reads),
+            "cache": {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "loaders": loaders,
+            },
+        }
+
+
+def dump(filename: str) -> None:
+    """
+    Write the recorded statistics to a JSON file.
+
+    Parameters
+    ----------
+    filename: str
+        The path of the JSON file.
+
+    Returns
+    -------
+    None
+    """
+    with open(filename, "w") as f:
+        json.dump(report(), f, indent=2)
+
+
+@contextmanager
+def profile(filename: Optional[str] = None) -> Iterator[None]:
+    """
+    Record statistics for the duration of a block.
+
+    The statistics are available from `report` after the block.
+
+    Parameters
+    ----------
+    filename: Optional[str]
+        If provided, write the statistics to this JSON file at the end.
+
+    Returns
+    -------
+    None
+    """
+    enable()
+    try:
+        yield
+    finally:
+        disable()
+        if filename:
+            dump(filename)
+
+
+# profile the whole job if we were asked to
+if os.environ.get("PANAMA_PROFILE"):
+    enable()
+    atexit.register(dump, os.environ["PANAMA_PROFILE"])
@@ -0,0 +1,108 @@
+"""
+Rational (polyphase) resampling of impulse responses.
+
+The PANAMA impulse responses are stored at 10 GSa/s. These are
+resampled to any other rate by approximating the ratio of the two
+rates by a fraction `up / down` and applying a polyphase FIR filter
+with `scipy.signal.resample_poly`. This is much faster than FFT-based
+resampling for short responses and is vectorized over every response
+in a set.
+
+Each sample of an impulse response is a per-sample weight of the
+discrete convolution, so the resampled responses are scaled by the
+ratio of the two rates (`fs_in / fs_out`). This keeps the gain of the
+discrete transfer function (i.e. `np.fft.rfft(values)`) independent
+of the sample rate.
+
+Most users should request resampled responses through the loaders
+(i.e. `panama.responses.get_all_responses(..., fs=3.0)`) which cache
+the result per rate and response set.
+"""
+from fractions import Fraction
+from typing import Tuple
+
+import numpy as np
+
+__all__ = ["resample_ratio", "resample"]
+
+# the largest denominator used to approximate the ratio of two rates
+MAX_DENOMINATOR: int = 1000
+
+
+def resample_ratio(
+    fs_in: float, fs_out: float, max_denominator: int = MAX_DENOMINATOR
+) -> Fraction:
+    """
+    Approximate the ratio of two sample rates by a fraction.
+
+    Parameters
+    ----------
+    fs_in: float
+        The current sample rate in GSa/s.
+    fs_out: float
+        The requested sample rate in GSa/s.
+    max_denominator: int
+        The largest denominator of the fraction.
+
+    Returns
+    -------
+    ratio: Fraction
+        The ratio `up / down` of the two rates.
+
+    Raises
+    ------
+    ValueError:
+        If either rate is not positive.
+    """
+    # check that we have valid rates
+    if fs_in <= 0 or fs_out <= 0:
+        raise ValueError(f"Sample rates must be positive (got {fs_in}, {fs_out}).")
+
+    # and find the closest fraction
+    return Fraction(fs_out / fs_in).limit_denominator(max_denominator)
+
+
+def resample(
+    values: np.ndarray,
+    time: np.ndarray,
+    fs: float,
+    max_denominator: int = MAX_DENOMINATOR,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resample a set of responses along their last axis.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        The (..., time) responses.
+    time: np.ndarray
+        The time of each sample in ns (uniformly sampled).
+    fs: float
+        The requested sample rate in GSa/s.
+    max_denominator: int
+        The largest denominator used to approximate the ratio of the rates.
+
+    Returns
+    -------
+    values, time: Tuple[np.ndarray, np.ndarray]
+        The resampled (and rescaled) responses and the time of each sample in ns.
+    """
+    from scipy.signal import resample_poly
+
+    # the current sample rate in GSa/s
+    fs_in = 1.0 / (time[1] - time[0])
+
+    # the ratio that we resample by
+    ratio = resample_ratio(fs_in, fs, max_denominator)
+
+    # resample every response at once
+    resampled = resample_poly(values, ratio.numerator, ratio.denominator, axis=-1)
+
+    # keep the gain of the discrete convolution independent of the rate
+    resampled /= float(ratio)
+
+    # and the time of each new sample
+    times = time[0] + np.arange(resampled.shape[-1]) / (fs_in * float(ratio))
+
+    # and we are done
+    return np.ascontiguousarray(resampled), times
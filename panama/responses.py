@@ -1,21 +1,250 @@
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from os.path import dirname, join
-from typing import Any, List, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 import xarray as xr
-from cachetools import cached
 
-__all__ = ["get_response", "get_trigger_response", "get_digitizer_response"]
+import panama.resample
+import panama.store
+from panama.cache import cached
+from panama.profiling import instrumented, record_read
+
+__all__ = [
+    "Response",
+    "Responses",
+    "get_response",
+    "get_response_arrays",
+    "get_all_responses",
+    "get_all_response_arrays",
+    "get_trigger_response",
+    "get_digitizer_response",
+    "read_response",
+    "load_responses",
+]
 
 
 # the directory where we store impulse responses
 RESPONSE_DIR = join(dirname(dirname(__file__)), *("data", "responses"))
 
+# the sample rate that all panama responses are currently stored at in GSa/s
+RESPONSE_FS: float = 10.0
 
+
+class Response(NamedTuple):
+    """
+    The raw arrays of a single impulse response.
+    """
+
+    time: np.ndarray  # the time of each sample in ns
+    values: np.ndarray  # the impulse response/effective height in m/s
+
+
+class Responses(NamedTuple):
+    """
+    The raw arrays of a (channels, configs, time) set of impulse responses.
+    """
+
+    values: np.ndarray  # the (channels, configs, time) responses in m/s
+    time: np.ndarray  # the time of each sample in ns
+    channels: Tuple[str, ...]  # the channel of each row
+    configs: Tuple[str, ...]  # the TUFF config of each column
+
+
+@instrumented
 def get_all_responses(
-    response: str, channels: List[str], configs: List[str], flight: int, **kwargs: Any
+    response: str,
+    channels: List[str],
+    configs: List[str],
+    flight: int,
+    mmap: bool = False,
+    fs: Optional[float] = None,
+    **kwargs: Any,
 ) -> xr.DataArray:
     """
+    Load the impulse responses for a set of channels and configs.
+
+    This wraps `get_all_response_arrays` in a DataArray.
+
+    Parameters
+    ----------
+    response: str
+       The directory name of the type of response to load.
+    channels: List[str]
+       The channel identifiers to load.
+    configs: List[str]
+       The TUFF configurations to load.
+    flight: int
+       The ANITA flight to load the responses for.
+    mmap: bool
+       If True, return read-only responses that are, if possible,
+       a view into the memory-mapped store.
+    fs: Optional[float]
+       The sample rate in GSa/s. Defaults to the stored rate (10 GSa/s).
+    **kwargs: Any
+       Any additional arguments to `get_response`.
+
+    Returns
+    -------
+    responses: xr.DataArray
+        The responses indexed by 'channels', 'configs', and 'time'.
+    """
+    # load the raw responses
+    responses = get_all_response_arrays(
+        response, channels, configs, flight, mmap, fs, **kwargs
+    )
+
+    # and create the data array
+    return xr.DataArray(
+        responses.values,
+        dims=["channels", "configs", "time"],
+        coords={"channels": channels, "configs": configs, "time": responses.time},
+    )
+
+
+@instrumented
+def get_all_response_arrays(
+    response: str,
+    channels: List[str],
+    configs: List[str],
+    flight: int,
+    mmap: bool = False,
+    fs: Optional[float] = None,
+    **kwargs: Any,
+) -> Responses:
+    """
+    Load the raw impulse responses for a set of channels and configs.
+
+    If a packed store has been built for this response type and flight
+    (see `panama.store`), the responses are read from the store.
+
+    If `mmap` is True, the returned responses are read-only. If they are
+    read from a packed store in the order that they are stored, the
+    returned array is a view into the memory-mapped store. This allows
+    every process on a node to share the same physical memory and
+    repeated calls do not copy the responses.
+
+    If `fs` is not the stored rate, the full set of responses is
+    resampled at once (see `panama.resample`). The resampled set is
+    cached per rate and is always read-only.
+
+    Parameters
+    ----------
+    response: str
+       The directory name of the type of response to load.
+    channels: List[str]
+       The channel identifiers to load.
+    configs: List[str]
+       The TUFF configurations to load.
+    flight: int
+       The ANITA flight to load the responses for.
+    mmap: bool
+       If True, return read-only responses that are, if possible,
+       a view into the memory-mapped store.
+    fs: Optional[float]
+       The sample rate in GSa/s. Defaults to the stored rate (10 GSa/s).
+    **kwargs: Any
+       Any additional arguments to `get_response`.
+
+    Returns
+    -------
+    responses: Responses
+        The (channels, configs, time) responses and the time of each sample.
+    """
+
+    # use the cached resampled responses if we want a different rate
+    if fs is not None and not np.isclose(fs, RESPONSE_FS):
+        return _resample_all_responses(
+            response, tuple(channels), tuple(configs), flight, fs, **kwargs
+        )
+
+    # check if we have a packed store containing every response
+    store = panama.store.load_store(response, flight)
+    indices = store.indices(channels, configs) if store is not None else None
+
+    # if we want a view, check if we can get one from the store
+    view = store.view(channels, configs) if mmap and store is not None else None
+
+    # if so, we use the view directly
+    if store is not None and view is not None:
+        responses = view
+        time = store.time
+
+    # otherwise, copy the responses out of the store
+    elif store is not None and indices is not None:
+        responses = store.data[np.ix_(*indices)]
+        time = store.time
+
+    else:
+        # otherwise, we load the responses one at a time
+        responses, time = _load_all_responses(
+            response, channels, configs, flight, **kwargs
+        )
+
+    # if we want read-only responses, make sure they are not writeable
+    if mmap:
+        responses.flags.writeable = False
+
+    # and return the responses
+    return Responses(responses, time, tuple(channels), tuple(configs))
+
+
+@cached
+def _resample_all_responses(
+    response: str,
+    channels: Tuple[str, ...],
+    configs: Tuple[str, ...],
+    flight: int,
+    fs: float,
+    **kwargs: Any,
+) -> Responses:
+    """
+    The cached resampling of a full set of responses to `fs` GSa/s.
+    """
+    # load the responses at the stored rate
+    native = get_all_response_arrays(
+        response, list(channels), list(configs), flight, mmap=True, **kwargs
+    )
+
+    # resample every response at once
+    values, time = panama.resample.resample(native.values, native.time, fs)
+
+    # make sure that nobody modifies the cached arrays
+    values.flags.writeable = False
+    time.flags.writeable = False
+
+    # and we are done
+    return Responses(values, time, channels, configs)
+
+
+def _load_all_responses(
+    response: str, channels: List[str], configs: List[str], flight: int, **kwargs: Any
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load a (channels, configs, time) response tensor one response at a time.
+
+    Parameters
+    ----------
+    response: str
+       The directory name of the type of response to load.
+    channels: List[str]
+       The channel identifiers to load.
+    configs: List[str]
+       The TUFF configurations to load.
+    flight: int
+       The ANITA flight to load the responses for.
+    **kwargs: Any
+       Any additional arguments to `get_response`.
+
+    Returns
+    -------
+    responses, time: Tuple[np.ndarray, np.ndarray]
+        The response tensor and the time of each sample.
     """
 
     # the number of channels that we load
@@ -25,7 +254,9 @@ def get_all_responses(
     nconfigs: int = len(configs)
 
     # get an reference response to get the length
-    N: int = get_response(response, channels[0], configs[0], flight, **kwargs).size
+    N: int = get_response_arrays(
+        response, channels[0], configs[0], flight, **kwargs
+    ).values.size
 
     # allocate the memory for the response waveforms
     responses: np.ndarray = np.zeros((nchannels, nconfigs, N))
@@ -37,26 +268,154 @@ def get_all_responses(
         for iconfig, config in enumerate(configs):
 
             # get the current response
-            waveform = get_response(response, ch, config, flight)
+            time, waveform = get_response_arrays(response, ch, config, flight, **kwargs)
 
             # store the response in the array
-            time = waveform.time  # type: ignore
-            responses[ich, iconfig, :] = waveform  # type: ignore
-
-    # and create the data array
-    xray = xr.DataArray(
-        responses,
-        dims=["channels", "configs", "time"],
-        coords={"channels": channels, "configs": configs, "time": time,},
-    )
+            responses[ich, iconfig, :] = waveform
 
     # and return the responses
-    return xray
+    return responses, time
+
+
+@instrumented
+def load_responses(
+    responses: List[str],
+    channels: List[str],
+    configs: List[str],
+    flight: int,
+    workers: Optional[int] = None,
+    processes: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, xr.DataArray]:
+    """
+    Load several full sets of impulse responses in parallel.
 
+    Response sets that are available in a packed store are read
+    directly from the store. Otherwise, the individual responses
+    are loaded in parallel using a thread pool (which also fills the
+    `get_response` cache) or, if `processes` is True, by parsing the
+    text files in a process pool.
 
-@cached(cache={})
+    Parameters
+    ----------
+    responses: List[str]
+       The directory names of the types of response to load.
+    channels: List[str]
+       The channel identifiers to load.
+    configs: List[str]
+       The TUFF configurations to load.
+    flight: int
+       The ANITA flight to load the responses for.
+    workers: Optional[int]
+       The number of workers to use (defaults to the executor default).
+    processes: bool
+       If True, parse the text responses in a process pool.
+    progress: Optional[Callable[[int, int], None]]
+       If given, this is called as `progress(done, total)` after each
+       response (or packed response set) is loaded.
+
+    Returns
+    -------
+    responses: Dict[str, xr.DataArray]
+        The responses of each type indexed by 'channels', 'configs', and 'time'.
+    """
+
+    # the total number of responses that we load
+    total: int = len(responses) * len(channels) * len(configs)
+
+    # the number of responses that we have loaded so far
+    done: int = 0
+
+    # the loaded tensors and their time samples
+    tensors: Dict[str, np.ndarray] = {}
+    times: Dict[str, np.ndarray] = {}
+
+    # the response sets that are not available in a packed store
+    missing: List[str] = []
+
+    # first load any response sets that are packed
+    for response in responses:
+
+        # check if we have a packed store containing every response
+        store = panama.store.load_store(response, flight)
+        indices = store.indices(channels, configs) if store is not None else None
+
+        # if not, we have to load these individually
+        if store is None or indices is None:
+            missing.append(response)
+            continue
+
+        # otherwise, copy the responses out of the store
+        tensors[response] = store.data[np.ix_(*indices)]
+        times[response] = store.time
+
+        # and update the progress
+        done += len(channels) * len(configs)
+        if progress:
+            progress(done, total)
+
+    # if everything was packed, we don't need any workers
+    if missing:
+
+        # create the pool of workers
+        pool: Executor = (
+            ProcessPoolExecutor(workers) if processes else ThreadPoolExecutor(workers)
+        )
+
+        # processes parse the text directly and threads use the cache
+        loader = read_response if processes else get_response_arrays
+
+        with pool:
+
+            # submit every response that we need to load
+            futures = {
+                pool.submit(loader, response, ch, config, flight): (response, ich, ic)
+                for response in missing
+                for ich, ch in enumerate(channels)
+                for ic, config in enumerate(configs)
+            }
+
+            # and store each response as it finishes
+            for future in as_completed(futures):
+
+                # get the loaded response
+                response, ich, iconfig = futures[future]
+                time, waveform = future.result()
+
+                # allocate the tensor if this is the first response
+                if response not in tensors:
+                    tensors[response] = np.zeros(
+                        (len(channels), len(configs), waveform.size)
+                    )
+                    times[response] = time
+
+                # store the response in the tensor
+                tensors[response][ich, iconfig, :] = waveform
+
+                # and update the progress
+                done += 1
+                if progress:
+                    progress(done, total)
+
+    # and create the data arrays
+    return {
+        response: xr.DataArray(
+            tensors[response],
+            dims=["channels", "configs", "time"],
+            coords={"channels": channels, "configs": configs, "time": times[response]},
+        )
+        for response in responses
+    }
+
+
+@instrumented
 def get_response(
-    response: str, channel: str, config: str, flight: int, pol: Optional[str] = None
+    response: str,
+    channel: str,
+    config: str,
+    flight: int,
+    pol: Optional[str] = None,
+    fs: Optional[float] = None,
 ) -> xr.DataArray:
     """
     Load arbitrary impulse response from a directory organized according to the
@@ -67,7 +426,13 @@ def get_response(
     code base expects that impulse responses be sampled at 10 GSa/s (currently)
     with effective heights stored in m/s.
 
-    This function loads directories of the form:
+    A new DataArray is returned on every call but it shares the cached,
+    read-only arrays of `get_response_arrays` so this does not copy or
+    re-read the data.
+
+    If a packed store has been built for this response type and flight
+    (see `panama.store`), the response is read from the store. Otherwise,
+    the response is loaded from directories of the form:
 
     ```
     data/{response}/anita{flight}/{response}/averages/{config}.imp
@@ -90,11 +455,112 @@ def get_response(
        The ANITA flight to load the responses for.
     pol: Optional[str]
        If channel="average", the polarization to load or None.
+    fs: Optional[float]
+       The sample rate in GSa/s. Defaults to the stored rate (10 GSa/s).
 
     Returns
     -------
     impulse: xr.DataArray
-        The impulse response/effective height in m/s sampled at 10 GSa/s.
+        The impulse response/effective height in m/s sampled at `fs` GSa/s.
+    """
+    # load the raw response
+    time, values = get_response_arrays(response, channel, config, flight, pol, fs)
+
+    # and convert it into an XArray DataArray
+    return xr.DataArray(values, dims=["time"], coords={"time": time})
+
+
+@cached
+def get_response_arrays(
+    response: str,
+    channel: str,
+    config: str,
+    flight: int,
+    pol: Optional[str] = None,
+    fs: Optional[float] = None,
+) -> Response:
+    """
+    Load the raw arrays of an impulse response.
+
+    This is the array equivalent of `get_response` (which wraps it) and
+    the returned arrays are read-only. If `fs` is not the stored rate,
+    the response is resampled (see `panama.resample`).
+
+    Parameters
+    ----------
+    response: str
+       The directory name of the type of response to load.
+    channel: str
+       The channel identifier for the channel to load or 'average'.
+    config: str
+       The TUFF configuration to load the response for.
+    flight: int
+       The ANITA flight to load the responses for.
+    pol: Optional[str]
+       If channel="average", the polarization to load or None.
+    fs: Optional[float]
+       The sample rate in GSa/s. Defaults to the stored rate (10 GSa/s).
+
+    Returns
+    -------
+    impulse: Response
+        The time in ns and the impulse response in m/s sampled at `fs` GSa/s.
+    """
+    # check if we have a packed store containing this response
+    store = panama.store.load_store(response, flight)
+    index = store.index(channel, config) if store is not None else None
+
+    # resample the (cached) stored response if we want a different rate
+    if fs is not None and not np.isclose(fs, RESPONSE_FS):
+        native = get_response_arrays(response, channel, config, flight, pol)
+        values, time = panama.resample.resample(native.values, native.time, fs)
+
+    # otherwise, use the packed tensor if we have one
+    elif store is not None and index is not None:
+        time, values = store.time, store.data[index]
+
+    # otherwise, we load the text response into contiguous arrays
+    else:
+        time, values = map(
+            np.ascontiguousarray, read_response(response, channel, config, flight, pol)
+        )
+
+    # make sure that nobody modifies the cached arrays
+    time.flags.writeable = False
+    values.flags.writeable = False
+
+    # and we are done
+    return Response(time, values)
+
+
+@instrumented
+def read_response(
+    response: str, channel: str, config: str, flight: int, pol: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read an impulse response from the text files in the standard
+    PANAMA response directories.
+
+    This always parses the text file and is not cached. Most users
+    should use `get_response` instead.
+
+    Parameters
+    ----------
+    response: str
+       The directory name of the type of response to load.
+    channel: str
+       The channel identifier for the channel to load or 'average'.
+    config: str
+       The TUFF configuration to load the response for.
+    flight: int
+       The ANITA flight to load the responses for.
+    pol: Optional[str]
+       If channel="average", the polarization to load or None.
+
+    Returns
+    -------
+    time, impulse: Tuple[np.ndarray, np.ndarray]
+        The time in ns and the impulse response sampled at 10 GSa/s.
     """
     # get the directory for this flight
     load_dir = join(RESPONSE_DIR, *(f"anita{flight}", response))
@@ -109,20 +575,17 @@ def get_response(
         filename = join(load_dir, *(f"notches_{config}", f"{channel}.imp"))
 
     # load the impulse response - these are stored calibrated and ready to use
-    # we load these into a NumPy Structured array
+    record_read(filename)
     raw: np.ndarray = np.loadtxt(filename, delimiter=" ")
 
-    # the sample rate that all panama responses are currently stored at in GSa/s
-    fs = 10.0
-
     # we want the first 100 ns of each response
     duration = 100
 
     # get the number of samples
-    N = int(round(duration * fs))
+    N = int(round(duration * RESPONSE_FS))
 
-    # and convert it into an XArray DataArray
-    return xr.DataArray(raw[0:N, 1], dims=["time"], coords={"time": raw[0:N, 0]},)
+    # and return the time and amplitude
+    return raw[0:N, 0], raw[0:N, 1]
 
 
 def get_trigger_response(
@@ -148,7 +611,7 @@ def get_trigger_response(
     """
 
     # get the responses - explicitly annotate the type.
-    responses: np.ndarray = get_response("digitizer", channel, config, flight)
+    responses: xr.DataArray = get_response("trigger", channel, config, flight)
 
     # and we are
     return responses
@@ -0,0 +1,198 @@
+"""
+Group streams of events into batches that share the same payload state.
+
+This is most commonly used with `panama.anita4.tuff.timeline` so that
+every event in a batch uses the same TUFF configuration (and therefore
+the same slice of the response tensors).
+
+```
+from panama.anita4 import tuff
+
+for batch in schedule(chunks_of_event_times, tuff.timeline, 4096):
+    convolver(waveforms[batch.events], batch.code)
+```
+"""
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+import numpy as np
+
+from panama.timeline import Timeline
+
+__all__ = ["Batch", "BatchScheduler", "schedule"]
+
+
+class Batch(NamedTuple):
+    """
+    A batch of events that share the same payload state.
+    """
+
+    code: int  # the index of the state into `Timeline.labels`
+    label: str  # the label of the state
+    events: np.ndarray  # the (global) indices of the events in the batch
+
+
+class BatchScheduler:
+    """
+    Group a stream of event times into state-homogeneous batches.
+
+    Event times are pushed in chunks and every event is numbered by
+    its position in the stream. Batches of exactly `batch_size` events
+    are emitted as soon as they are full and the remaining partial batches
+    are emitted by `flush`. At most (nstates * batch_size) event indices
+    are buffered at any time.
+
+    Parameters
+    ----------
+    timeline: Timeline
+        The timeline of the payload state.
+    batch_size: int
+        The number of events in each batch.
+
+    Raises
+    ------
+    ValueError:
+        If `batch_size` is not positive.
+    """
+
+    def __init__(self, timeline: Timeline, batch_size: int):
+        self.timeline = timeline
+        self.batch_size = batch_size
+
+        # check that we can fill a batch
+        if batch_size <= 0:
+            raise ValueError(f"batch_size ({batch_size}) must be positive.")
+
+        # the number of events that we have seen so far
+        self._offset = 0
+
+        # the event indices that are waiting for each state
+        self._pending: Dict[int, List[np.ndarray]] = {}
+
+    def push(self, times: np.ndarray) -> List[Batch]:
+        """
+        Add the next chunk of event times to the stream.
+
+        Parameters
+        ----------
+        times: np.ndarray
+            The times of the next events in the stream.
+
+        Returns
+        -------
+        batches: List[Batch]
+            Any batches that were filled by this chunk.
+        """
+        # get the state of every event
+        codes, _ = self.timeline.lookup(np.asarray(times))
+
+        # the global index of each event
+        events = np.arange(self._offset, self._offset + codes.size)
+        self._offset += codes.size
+
+        # sort the events by state - stable so events stay in order
+        order = np.argsort(codes, kind="stable")
+        codes, events = codes[order], events[order]
+
+        # find where each state starts and ends in the sorted events
+        unique, starts = np.unique(codes, return_index=True)
+        stops = np.append(starts[1:], codes.size)
+
+        # the batches that we fill
+        batches: List[Batch] = []
+
+        # add the events of each state to the buffer
+        for code, start, stop in zip(unique, starts, stops):
+            pending = self._pending.setdefault(int(code), [])
+            pending.append(events[start:stop])
+
+            # and emit any full batches
+            batches.extend(self._drain(int(code), full=True))
+
+        # and return the full batches
+        return batches
+
+    def flush(self) -> List[Batch]:
+        """
+        Emit every remaining (partial) batch.
+
+        Returns
+        -------
+        batches: List[Batch]
+            The remaining batches.
+        """
+        return [
+            batch
+            for code in sorted(self._pending)
+            for batch in self._drain(code, full=False)
+        ]
+
+    def _drain(self, code: int, full: bool) -> Iterator[Batch]:
+        """
+        Emit the buffered batches of a given state.
+
+        Parameters
+        ----------
+        code: int
+            The state to emit batches for.
+        full: bool
+            If True, only emit complete batches.
+
+        Returns
+        -------
+        batches: Iterator[Batch]
+            The batches for this state.
+        """
+        # combine the buffered events of this state
+        events = np.concatenate(self._pending.pop(code, [np.empty(0, dtype=int)]))
+
+        # the label of this state
+        label = str(self.timeline.labels[code])
+
+        # the number of events in complete batches
+        cut = self.batch_size * (events.size // self.batch_size)
+
+        # emit every complete batch
+        for batch in events[:cut].reshape(-1, self.batch_size):
+            yield Batch(code, label, batch)
+
+        # and the remainder is either kept or emitted
+        remainder = events[cut:]
+        if remainder.size and full:
+            self._pending[code] = [remainder]
+        elif remainder.size:
+            yield Batch(code, label, remainder)
+
+
+def schedule(
+    chunks: Iterable[np.ndarray], timeline: Timeline, batch_size: int
+) -> Iterator[Batch]:
+    """
+    Group a stream of event times into state-homogeneous batches.
+
+    Parameters
+    ----------
+    chunks: Iterable[np.ndarray]
+        The event times in chunks (or a single array of times).
+    timeline: Timeline
+        The timeline of the payload state.
+    batch_size: int
+        The maximum number of events in each batch.
+
+    Returns
+    -------
+    batches: Iterator[Batch]
+        The batches of events - see `BatchScheduler`.
+    """
+    # a single array of times is a single chunk
+    if isinstance(chunks, np.ndarray):
+        chunks = [chunks]
+
+    # create the scheduler
+    scheduler = BatchScheduler(timeline, batch_size)
+
+    # push every chunk through the scheduler
+    for times in chunks:
+        yield from scheduler.push(times)
+
+    # and emit the final partial batches
+    yield from scheduler.flush()
@@ -0,0 +1,211 @@
+"""
+Share read-only tensors between processes with shared memory.
+
+A tensor is published once (usually by the parent of a worker pool)
+into a named `multiprocessing.shared_memory` block and workers attach
+to it by name to get a read-only view without copying or reloading it.
+
+Each block starts with a small JSON header describing the dims, coords,
+and attributes of the tensor followed by the (aligned) raw data:
+
+```
+from panama import shared
+
+# in the parent
+name = shared.publish(anita.transfer_functions())
+
+# in each worker
+transfer = shared.attach(name)
+
+# and in the parent once every worker is done
+shared.release(name)
+```
+
+The publisher owns the block - it must stay alive while workers are
+attached and it is unlinked by `release`. Workers started by
+`multiprocessing` share the resource tracker of their parent so a
+block is never unlinked when a worker exits.
+"""
+import json
+import struct
+import sys
+import threading
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple, cast
+
+import numpy as np
+import xarray as xr
+
+from panama.profiling import instrumented
+
+__all__ = ["publish", "attach", "release"]
+
+# the byte alignment of the start of the data in each block
+ALIGNMENT: int = 64
+
+# the format of the header length at the start of each block
+_LENGTH = struct.Struct("<Q")
+
+# the blocks open in this process and whether we own them
+_blocks: Dict[str, Tuple[shared_memory.SharedMemory, bool]] = {}
+
+# protect the blocks against concurrent publish/attach/release
+_lock = threading.Lock()
+
+
+def _to_json(value: Any) -> Any:
+    """
+    Convert NumPy values in coordinates and attributes into JSON types.
+    """
+    return value.tolist() if isinstance(value, (np.ndarray, np.generic)) else value
+
+
+@instrumented
+def publish(array: xr.DataArray, name: Optional[str] = None) -> str:
+    """
+    Copy a tensor into a new shared memory block.
+
+    Parameters
+    ----------
+    array: xr.DataArray
+        The tensor to share.
+    name: Optional[str]
+        The name of the block. Defaults to a unique name.
+
+    Returns
+    -------
+    name: str
+        The name that workers should use to `attach` to the tensor.
+    """
+    # describe the tensor so that we can rebuild it
+    header = json.dumps(
+        {
+            "name": array.name,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "dims": list(array.dims),
+            "attrs": {k: _to_json(v) for k, v in array.attrs.items()},
+            "coords": {
+                k: {
+                    "dims": list(coord.dims),
+                    "values": coord.values.tolist(),
+                    "attrs": {a: _to_json(v) for a, v in coord.attrs.items()},
+                }
+                for k, coord in array.coords.items()
+            },
+        }
+    ).encode()
+
+    # the data starts at the first aligned byte after the header
+    offset = ALIGNMENT * -(-(_LENGTH.size + len(header)) // ALIGNMENT)
+
+    # create the block
+    block = shared_memory.SharedMemory(
+        name=name, create=True, size=max(offset + array.nbytes, 1)
+    )
+
+    # the contents of the block
+    buffer = cast(memoryview, block.buf)
+
+    # write the header
+    start, stop = _LENGTH.size, _LENGTH.size + len(header)
+    _LENGTH.pack_into(buffer, 0, len(header))
+    buffer[start:stop] = header
+
+    # and copy the data into the block
+    np.ndarray(array.shape, array.dtype, buffer, offset)[...] = array.values
+
+    # and keep the block alive until it is released
+    with _lock:
+        _blocks[block.name] = (block, True)
+
+    # and we are done
+    return block.name
+
+
+@instrumented
+def attach(name: str) -> xr.DataArray:
+    """
+    Get a read-only view of a published tensor.
+
+    The block stays open in this process until `release` is called.
+
+    Parameters
+    ----------
+    name: str
+        The name returned by `publish`.
+
+    Returns
+    -------
+    array: xr.DataArray
+        A read-only view of the shared tensor.
+
+    Raises
+    ------
+    FileNotFoundError:
+        If no tensor has been published with this name.
+    """
+    # open the block if it isn't already open in this process
+    with _lock:
+        if name not in _blocks:
+            # the publisher owns the block so we don't track it
+            kwargs = {"track": False} if sys.version_info >= (3, 13) else {}
+            _blocks[name] = (shared_memory.SharedMemory(name=name, **kwargs), False)
+        buffer = cast(memoryview, _blocks[name][0].buf)
+
+    # read the header
+    (length,) = _LENGTH.unpack_from(buffer, 0)
+    start, stop = _LENGTH.size, _LENGTH.size + length
+    header = json.loads(bytes(buffer[start:stop]))
+
+    # the data starts at the first aligned byte after the header
+    offset = ALIGNMENT * -(-stop // ALIGNMENT)
+
+    # create the view into the data
+    values: np.ndarray = np.ndarray(
+        header["shape"], np.dtype(header["dtype"]), buffer, offset
+    )
+    values.flags.writeable = False
+
+    # and rebuild the tensor around the view
+    return xr.DataArray(
+        values,
+        dims=header["dims"],
+        coords={
+            k: xr.Variable(coord["dims"], coord["values"], coord["attrs"])
+            for k, coord in header["coords"].items()
+        },
+        attrs=header["attrs"],
+        name=header["name"],
+    )
+
+
+def release(name: str) -> None:
+    """
+    Close a shared tensor in this process and unlink it if we published it.
+
+    Every view of the tensor in this process must be deleted first.
+
+    Parameters
+    ----------
+    name: str
+        The name of the tensor.
+
+    Returns
+    -------
+    None
+    """
+    # remove the block from our registry
+    with _lock:
+        block, owner = _blocks.pop(name, (None, False))
+
+    # if we never opened this block, there's nothing to do
+    if block is None:
+        return
+
+    # free the block if we own it - attached workers keep their mapping
+    if owner:
+        block.unlink()
+
+    # and close our handle
+    block.close()
@@ -0,0 +1,462 @@
+"""
+A packed binary store for PANAMA impulse responses.
+
+Parsing the text impulse responses with `np.loadtxt` dominates the
+cold-start time of PANAMA (there are more than 1,100 of them for ANITA-4).
+This module packs every response of a given flight and response type
+into a single binary tensor, stored next to the text responses as:
+
+```
+data/responses/anita{flight}/{response}.npy
+data/responses/anita{flight}/{response}.index.npz
+```
+
+The `.npy` file contains a C-contiguous float64 tensor of shape
+(channels, configs, time) and the `.index.npz` file contains the
+channel names, config names, and time samples of the tensor.
+
+The tensor is memory-mapped read-only when the store is loaded so that
+every process on a node shares the same physical pages of the responses.
+
+The store is built with `build_store` (or the `panama-store` script)
+and must be rebuilt if the text responses are modified.
+"""
+
+import argparse
+import os
+import tempfile
+from os.path import exists, isdir, join, splitext
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import panama.cache
+import panama.responses
+from panama.profiling import instrumented, record_read
+
+__all__ = ["ResponseStore", "build_store", "load_store", "store_filenames"]
+
+
+class ResponseStore:
+    """
+    A packed set of impulse responses for a given flight and response type.
+
+    Parameters
+    ----------
+    data: np.ndarray
+        The (channels, configs, time) response tensor.
+    time: np.ndarray
+        The time of each sample in ns.
+    channels: Sequence[str]
+        The channel identifiers along the first axis of `data`.
+    configs: Sequence[str]
+        The TUFF configurations along the second axis of `data`.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        time: np.ndarray,
+        channels: Sequence[str],
+        configs: Sequence[str],
+    ):
+        self.data = data
+        self.time = time
+        self.channels = list(channels)
+        self.configs = list(configs)
+
+        # build the reverse lookup tables for the channels and configs
+        self._channels = {ch: i for i, ch in enumerate(self.channels)}
+        self._configs = {config: i for i, config in enumerate(self.configs)}
+
+    def index(self, channel: str, config: str) -> Optional[Tuple[int, int]]:
+        """
+        Get the (channel, config) index of a response in the store.
+
+        Parameters
+        ----------
+        channel: str
+            The channel identifier.
+        config: str
+            The TUFF configuration.
+
+        Returns
+        -------
+        index: Optional[Tuple[int, int]]
+            The index into `data` or None if the response is not stored.
+        """
+        # check that we have both the channel and the config
+        if channel not in self._channels or config not in self._configs:
+            return None
+
+        # and return the index
+        return self._channels[channel], self._configs[config]
+
+    def indices(
+        self, channels: Sequence[str], configs: Sequence[str]
+    ) -> Optional[Tuple[List[int], List[int]]]:
+        """
+        Get the channel and config indices of a set of responses in the store.
+
+        Parameters
+        ----------
+        channels: Sequence[str]
+            The channel identifiers.
+        configs: Sequence[str]
+            The TUFF configurations.
+
+        Returns
+        -------
+        indices: Optional[Tuple[List[int], List[int]]]
+            The channel and config indices into `data` or None
+            if any of the responses are not stored.
+        """
+        # check that we have every channel and config
+        if not all(ch in self._channels for ch in channels) or not all(
+            config in self._configs for config in configs
+        ):
+            return None
+
+        # and return the indices
+        return (
+            [self._channels[ch] for ch in channels],
+            [self._configs[config] for config in configs],
+        )
+
+    def view(
+        self, channels: Sequence[str], configs: Sequence[str]
+    ) -> Optional[np.ndarray]:
+        """
+        Get a (channels, configs, time) read-only view of a set of responses.
+
+        A view can only be created if the requested channels and configs
+        are evenly spaced in the store (i.e. the payload order that is
+        used by the `panama-store` script).
+
+        Parameters
+        ----------
+        channels: Sequence[str]
+            The channel identifiers.
+        configs: Sequence[str]
+            The TUFF configurations.
+
+        Returns
+        -------
+        view: Optional[np.ndarray]
+            A view into `data` or None if the responses are not stored
+            or cannot be represented as a view.
+        """
+        # get the indices of the channels and configs
+        indices = self.indices(channels, configs)
+        if indices is None:
+            return None
+
+        # and try and convert them into slices
+        chslice, configslice = _as_slice(indices[0]), _as_slice(indices[1])
+        if chslice is None or configslice is None:
+            return None
+
+        # and return the view into the tensor
+        return self.data[chslice, configslice, :]
+
+
+def _as_slice(indices: List[int]) -> Optional[slice]:
+    """
+    Convert a list of evenly spaced indices into a slice.
+
+    Parameters
+    ----------
+    indices: List[int]
+        The indices to convert.
+
+    Returns
+    -------
+    slice: Optional[slice]
+        The equivalent slice or None if `indices` are not evenly spaced.
+    """
+    # a single index is always a slice
+    if len(indices) == 1:
+        return slice(indices[0], indices[0] + 1)
+
+    # get the spacing between the first two indices
+    step = indices[1] - indices[0]
+
+    # check that every index has the same spacing
+    if step == 0 or np.any(np.diff(indices) != step):
+        return None
+
+    # the end of the slice - this can't be -1 when we step backwards
+    stop = indices[-1] + step
+
+    # and create the slice
+    return slice(indices[0], stop if stop >= 0 else None, step)
+
+
+def store_filenames(response: str, flight: int) -> Tuple[str, str]:
+    """
+    Get the filenames of the packed tensor and index for a response set.
+
+    Parameters
+    ----------
+    response: str
+       The directory name of the type of response.
+    flight: int
+       The ANITA flight.
+
+    Returns
+    -------
+    data, index: Tuple[str, str]
+        The filenames of the `.npy` tensor and the `.npz` index.
+    """
+    # the directory for this flight
+    flight_dir = join(panama.responses.RESPONSE_DIR, f"anita{flight}")
+
+    # and construct the filenames
+    return (
+        join(flight_dir, f"{response}.npy"),
+        join(flight_dir, f"{response}.index.npz"),
+    )
+
+
+# the stores that we have already opened keyed by (response, flight)
+_stores: Dict[Tuple[str, int], Optional[ResponseStore]] = {}
+
+# a lock protecting access to `_stores`
+_stores_lock = Lock()
+
+
+@instrumented
+def load_store(response: str, flight: int) -> Optional[ResponseStore]:
+    """
+    Load the packed store for a given response type and flight.
+
+    The store is only opened once per process and the response
+    tensor is memory-mapped read-only so that its pages are
+    shared between every process that loads the same store.
+
+    Parameters
+    ----------
+    response: str
+       The directory name of the type of response to load.
+    flight: int
+       The ANITA flight to load the store for.
+
+    Returns
+    -------
+    store: Optional[ResponseStore]
+        The packed responses or None if no store has been built.
+    """
+    # the key for this store
+    key = (response, flight)
+
+    with _stores_lock:
+
+        # if we have already tried to load this store
+        if key in _stores:
+            return _stores[key]
+
+        # get the filenames for this store
+        data_file, index_file = store_filenames(response, flight)
+
+        # if we don't have a store, we remember that too
+        if not (exists(data_file) and exists(index_file)):
+            _stores[key] = None
+            return None
+
+        # load the index
+        record_read(index_file)
+        with np.load(index_file) as index:
+            time = index["time"]
+            channels = index["channels"].tolist()
+            configs = index["configs"].tolist()
+
+        # and create the store - the tensor is memory-mapped so
+        # this records the size of the tensor that can be read
+        record_read(data_file)
+        store = ResponseStore(
+            np.load(data_file, mmap_mode="r"), time, channels, configs
+        )
+
+        # save it for next time
+        _stores[key] = store
+
+    # and return the store
+    return store
+
+
+def _replace(filename: str, save: Callable[[Any], None]) -> None:
+    """
+    Atomically write a file by saving into a temporary file and renaming it.
+
+    This never modifies a file that may be memory-mapped by another
+    process - the old file is unlinked and its mappings remain valid.
+
+    Parameters
+    ----------
+    filename: str
+        The path of the file to write.
+    save: Callable[[Any], None]
+        A function that writes the contents into an open binary file.
+
+    Returns
+    -------
+    None
+    """
+    # write into a temporary file in the same directory (and filesystem)
+    fd, tmpname = tempfile.mkstemp(dir=os.path.dirname(filename), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            save(f)
+
+        # and atomically move it into place
+        os.replace(tmpname, filename)
+    except BaseException:
+        os.unlink(tmpname)
+        raise
+
+
+@instrumented
+def build_store(
+    response: str,
+    flight: int,
+    channels: Optional[List[str]] = None,
+    configs: Optional[List[str]] = None,
+) -> str:
+    """
+    Build the packed store for a given response type and flight
+    from the text responses in `data/responses/anita{flight}/{response}`.
+
+    If `channels` or `configs` are not given, every channel
+    and config found in the response directory is packed.
+
+    Parameters
+    ----------
+    response: str
+       The directory name of the type of response to pack.
+    flight: int
+       The ANITA flight to pack the responses for.
+    channels: Optional[List[str]]
+       The channels to pack (in order).
+    configs: Optional[List[str]]
+       The TUFF configurations to pack (in order).
+
+    Returns
+    -------
+    filename: str
+        The filename of the packed tensor.
+
+    Raises
+    ------
+    ValueError:
+        If no responses were found for this `response` and `flight`.
+    """
+    # the directory containing the text responses
+    load_dir = join(panama.responses.RESPONSE_DIR, *(f"anita{flight}", response))
+
+    # check that we have responses for this flight
+    if not isdir(load_dir):
+        raise ValueError(f"Unable to find any {response} responses for ANITA-{flight}.")
+
+    # if we were not given configs, find them from the directory names
+    if configs is None:
+        configs = sorted(
+            d.split("notches_", 1)[1]
+            for d in os.listdir(load_dir)
+            if d.startswith("notches_") and isdir(join(load_dir, d))
+        )
+
+    # if we were not given channels, use the files of the first config
+    if channels is None and configs:
+        channels = sorted(
+            splitext(f)[0]
+            for f in os.listdir(join(load_dir, f"notches_{configs[0]}"))
+            if f.endswith(".imp")
+        )
+
+    # check that we found something to pack
+    if not channels or not configs:
+        raise ValueError(f"Unable to find any {response} responses for ANITA-{flight}.")
+
+    # load a reference response to get the length and time samples
+    time, waveform = panama.responses.read_response(
+        response, channels[0], configs[0], flight
+    )
+
+    # allocate the memory for the response tensor
+    data = np.zeros((len(channels), len(configs), waveform.size))
+
+    # loop through all the channels
+    for ich, ch in enumerate(channels):
+
+        # and loop over the configs
+        for iconfig, config in enumerate(configs):
+
+            # load the text response and store it in the tensor
+            data[ich, iconfig, :] = panama.responses.read_response(
+                response, ch, config, flight
+            )[1]
+
+    # get the output filenames
+    data_file, index_file = store_filenames(response, flight)
+
+    # save the tensor and the index without touching any mapped files
+    _replace(data_file, lambda f: np.save(f, data))
+    _replace(
+        index_file,
+        lambda f: np.savez(
+            f, time=time, channels=np.asarray(channels), configs=np.asarray(configs)
+        ),
+    )
+
+    # forget any store that we have already loaded
+    with _stores_lock:
+        _stores.pop((response, flight), None)
+
+    # and any responses that were loaded from it
+    panama.cache.clear("panama.responses.", "panama.transfer.", "panama.chain.")
+
+    # and return the filename of the tensor
+    return data_file
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Build the packed response stores from the command line.
+    """
+
+    # the payloads that we know the channel and config order for
+    from panama.anita4 import ANITA4
+
+    payloads = {4: ANITA4}
+
+    # create the argument parser
+    parser = argparse.ArgumentParser(
+        description="Pack the PANAMA text impulse responses into a binary store."
+    )
+    parser.add_argument("--flight", type=int, default=4, help="The ANITA flight.")
+    parser.add_argument(
+        "responses",
+        nargs="*",
+        default=["digitizer", "trigger"],
+        help="The response types to pack.",
+    )
+
+    # parse the arguments
+    args = parser.parse_args(argv)
+
+    # if we know this payload, use its channel and config order
+    if args.flight in payloads:
+        payload = payloads[args.flight]()
+        channels, configs = payload.channels, payload.configs
+    else:
+        channels, configs = None, None
+
+    # and build each store
+    for response in args.responses:
+        filename = build_store(response, args.flight, channels, configs)
+        print(f"Wrote {filename}")
+
+
+if __name__ == "__main__":
+    main()
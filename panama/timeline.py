@@ -0,0 +1,176 @@
+"""
+Index piecewise-constant, time-dependent payload state.
+"""
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from panama.profiling import instrumented
+
+__all__ = ["Timeline", "label_codes"]
+
+
+class Timeline:
+    """
+    A payload state (i.e. the TUFF configuration) that changes at discrete times.
+
+    The state that is active at a time `t` is the state of the last
+    change that occurred strictly before `t`. The last change marks
+    the end of the timeline.
+
+    States are stored as integer codes into `labels` so that arrays
+    of times can be looked up with a single `np.searchsorted`.
+
+    Parameters
+    ----------
+    times: np.ndarray
+        The (sorted) times at which the state changes.
+    states: Sequence
+        The state that becomes active at each time.
+    labels: Optional[Sequence]
+        The labels (in order) that the codes index into. Any states
+        that are not in `labels` are appended in the order that they
+        first appear.
+
+    Raises
+    ------
+    ValueError:
+        If `times` is not sorted.
+    """
+
+    def __init__(
+        self,
+        times: np.ndarray,
+        states: Union[Sequence, np.ndarray],
+        labels: Optional[Sequence] = None,
+    ):
+        self.times = np.asarray(times)
+
+        # check that the times are sorted
+        if np.any(np.diff(self.times) < 0):
+            raise ValueError("The times of a Timeline must be sorted.")
+
+        # append any new states to the labels in the order that they appear
+        labels = list(labels) if labels is not None else []
+        labels += [state for state in dict.fromkeys(states) if state not in labels]
+
+        # the labels that our codes index
+        self.labels = np.asarray(labels)
+
+        # build the reverse lookup table for the labels
+        lookup = {label: i for i, label in enumerate(labels)}
+
+        # and convert the states into codes
+        self.codes = np.asarray([lookup[state] for state in states], dtype=int)
+
+    @property
+    def start(self) -> float:
+        """
+        The start of the timeline.
+        """
+        return self.times[0]
+
+    @property
+    def end(self) -> float:
+        """
+        The end of the timeline.
+        """
+        return self.times[-1]
+
+    def index(self, times: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Get the index of the change that is active at each time.
+
+        Parameters
+        ----------
+        times: Union[float, np.ndarray]
+            The time or times to look up.
+
+        Returns
+        -------
+        index: np.ndarray
+            The index into `self.times` of the change active at each time.
+
+        Raises
+        ------
+        ValueError:
+            If any time is outside of the timeline.
+        """
+        # make sure we have an array
+        times = np.asarray(times)
+
+        # check that every time is in the timeline
+        if np.any(times < self.start):
+            raise ValueError(f"{np.min(times)} is before the start of the timeline.")
+        if np.any(times > self.end):
+            raise ValueError(f"{np.max(times)} is after the end of the timeline.")
+
+        # find the last change strictly before each time
+        index = np.searchsorted(self.times, times, side="left") - 1
+
+        # and a time at the very start uses the first state
+        return np.maximum(index, 0)
+
+    @instrumented
+    def lookup(self, times: Union[float, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the state that is active at each time.
+
+        Parameters
+        ----------
+        times: Union[float, np.ndarray]
+            The time or times to look up.
+
+        Returns
+        -------
+        codes, states: Tuple[np.ndarray, np.ndarray]
+            The code (index into `labels`) and label of the active state.
+
+        Raises
+        ------
+        ValueError:
+            If any time is outside of the timeline.
+        """
+        # get the code of the active state
+        codes = self.codes[self.index(times)]
+
+        # and return the codes and their labels
+        return codes, self.labels[codes]
+
+
+def label_codes(values: Union[int, str, Sequence], labels: Sequence[str]) -> np.ndarray:
+    """
+    Convert labels (or codes) into codes that index `labels`.
+
+    Parameters
+    ----------
+    values: Union[int, str, Sequence]
+        A code or label or a sequence of codes or labels.
+    labels: Sequence[str]
+        The labels (in order) that the codes index.
+
+    Returns
+    -------
+    codes: np.ndarray
+        The code of each entry of `values`.
+
+    Raises
+    ------
+    ValueError:
+        If a label is not in `labels`.
+    """
+    # make sure that we have an array
+    array = np.atleast_1d(values)
+
+    # codes are returned as is
+    if array.dtype.kind not in "US":
+        return array.astype(int)
+
+    # check that we have valid labels
+    invalid = set(array.tolist()) - set(labels)
+    if invalid:
+        raise ValueError(f"{invalid} are not valid labels.")
+
+    # and find the code of each label
+    lookup = {label: i for i, label in enumerate(labels)}
+    return np.asarray([lookup[label] for label in array.tolist()])
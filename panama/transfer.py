@@ -0,0 +1,304 @@
+"""
+Frequency-domain transfer functions of the PANAMA impulse responses.
+
+The transfer function of a response is the real FFT of its impulse
+response zero-padded to `nfft` samples, i.e. `np.fft.rfft(h, nfft)`,
+so that multiplying the `nfft`-point real FFT of a waveform by the
+transfer function and inverting is equivalent to `np.convolve`
+(provided that `nfft` is at least the length of the full convolution).
+
+Transfer functions are computed once per FFT length and sample rate
+and their read-only arrays are cached in `panama.cache`; every call
+returns a new DataArray around the cached arrays.
+"""
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import xarray as xr
+
+import panama.cache
+import panama.responses
+from panama.cache import cached
+from panama.profiling import instrumented
+
+__all__ = [
+    "Transfer",
+    "get_transfer_function",
+    "get_transfer_functions",
+    "prime_transfer_functions",
+]
+
+
+def _freqs(time: np.ndarray, nfft: int) -> np.ndarray:
+    """
+    Get the frequencies (in MHz) of an `nfft`-point real FFT.
+
+    Parameters
+    ----------
+    time: np.ndarray
+        The time samples (in ns) of the impulse response.
+    nfft: int
+        The length of the FFT.
+
+    Returns
+    -------
+    freqs: np.ndarray
+        The frequency of each bin in MHz.
+    """
+    return 1e3 * np.fft.rfftfreq(nfft, d=time[1] - time[0])
+
+
+class Transfer(NamedTuple):
+    """
+    The raw (read-only) arrays of one or more transfer functions.
+    """
+
+    freqs: np.ndarray  # the frequency of each bin in MHz
+    values: np.ndarray  # the (..., freqs) complex transfer functions
+
+
+def _transfer(time: np.ndarray, values: np.ndarray, nfft: Optional[int]) -> Transfer:
+    """
+    Compute the read-only transfer functions of impulse responses.
+
+    Parameters
+    ----------
+    time: np.ndarray
+        The time samples (in ns) of the impulse responses.
+    values: np.ndarray
+        The (..., time) impulse responses.
+    nfft: Optional[int]
+        The length of the FFT (defaults to the length of the responses).
+
+    Returns
+    -------
+    transfer: Transfer
+        The frequencies and (..., freqs) transfer functions.
+
+    Raises
+    ------
+    ValueError:
+        If `nfft` is shorter than the impulse responses.
+    """
+    # use the length of the responses if we weren't given an FFT length
+    nresponse = values.shape[-1]
+    nfft = nfft or nresponse
+
+    # a shorter FFT would silently truncate the responses
+    if nfft < nresponse:
+        raise ValueError(f"nfft ({nfft}) must be at least {nresponse} samples.")
+
+    # compute every transfer function in one pass
+    transfer = np.fft.rfft(values, n=nfft, axis=-1)
+    freqs = _freqs(time, nfft)
+
+    # make sure that nobody modifies the cached arrays
+    for array in (freqs, transfer):
+        array.flags.writeable = False
+
+    # and we are done
+    return Transfer(freqs, transfer)
+
+
+def _wrap(transfer: Transfer, dims: List[str], **coords: List[str]) -> xr.DataArray:
+    """
+    Wrap the cached arrays of transfer functions into a new DataArray.
+
+    Parameters
+    ----------
+    transfer: Transfer
+        The frequencies and transfer functions.
+    dims: List[str]
+        The dimensions of the transfer functions (ending with 'freqs').
+    coords: List[str]
+        The coordinates of every other dimension.
+
+    Returns
+    -------
+    transfer: xr.DataArray
+        The transfer functions indexed by `dims` with 'freqs' in MHz.
+    """
+    # create the data array
+    xray = xr.DataArray(
+        transfer.values, dims=dims, coords={**coords, "freqs": transfer.freqs}
+    )
+
+    # label the independent variables
+    xray.freqs.attrs["units"] = "MHz"
+    xray.freqs.attrs["long_name"] = "Frequency"
+
+    # and we are done
+    return xray
+
+
+@instrumented
+def get_transfer_function(
+    response: str,
+    channel: str,
+    config: str,
+    flight: int,
+    nfft: Optional[int] = None,
+    fs: Optional[float] = None,
+) -> xr.DataArray:
+    """
+    Get the complex transfer function of a single impulse response.
+
+    A new DataArray is returned on every call but it shares the cached,
+    read-only arrays so the transfer function is only computed once.
+
+    Parameters
+    ----------
+    response: str
+       The directory name of the type of response to load.
+    channel: str
+       The channel identifier for the channel to load.
+    config: str
+       The TUFF configuration to load the response for.
+    flight: int
+       The ANITA flight to load the responses for.
+    nfft: Optional[int]
+       The length of the FFT (defaults to the length of the response).
+    fs: Optional[float]
+       The sample rate in GSa/s. Defaults to the stored rate (10 GSa/s).
+
+    Returns
+    -------
+    transfer: xr.DataArray
+        The read-only complex transfer function indexed by 'freqs' in MHz.
+
+    Raises
+    ------
+    ValueError:
+        If `nfft` is shorter than the impulse response.
+    """
+    return _wrap(
+        _get_transfer_function(response, channel, config, flight, nfft, fs),
+        ["freqs"],
+    )
+
+
+@cached
+def _get_transfer_function(
+    response: str,
+    channel: str,
+    config: str,
+    flight: int,
+    nfft: Optional[int] = None,
+    fs: Optional[float] = None,
+) -> Transfer:
+    """
+    The cached implementation of `get_transfer_function`.
+    """
+    impulse = panama.responses.get_response_arrays(
+        response, channel, config, flight, fs=fs
+    )
+    return _transfer(impulse.time, impulse.values, nfft)
+
+
+@instrumented
+def get_transfer_functions(
+    response: str,
+    channels: List[str],
+    configs: List[str],
+    flight: int,
+    nfft: Optional[int] = None,
+    fs: Optional[float] = None,
+) -> xr.DataArray:
+    """
+    Get the complex transfer functions of a full set of impulse responses.
+
+    The transfer functions are stored in a contiguous
+    (channels, configs, freqs) complex array. A new DataArray is
+    returned on every call but it shares the cached, read-only arrays.
+
+    Parameters
+    ----------
+    response: str
+       The directory name of the type of response to load.
+    channels: List[str]
+       The channel identifiers to load.
+    configs: List[str]
+       The TUFF configurations to load.
+    flight: int
+       The ANITA flight to load the responses for.
+    nfft: Optional[int]
+       The length of the FFT (defaults to the length of the responses).
+    fs: Optional[float]
+       The sample rate in GSa/s. Defaults to the stored rate (10 GSa/s).
+
+    Returns
+    -------
+    transfer: xr.DataArray
+        The read-only complex transfer functions indexed by
+        'channels', 'configs', and 'freqs' in MHz.
+
+    Raises
+    ------
+    ValueError:
+        If `nfft` is shorter than the impulse responses.
+    """
+    return _wrap(
+        _get_transfer_functions(
+            response, tuple(channels), tuple(configs), flight, nfft, fs
+        ),
+        ["channels", "configs", "freqs"],
+        channels=list(channels),
+        configs=list(configs),
+    )
+
+
+@cached
+def _get_transfer_functions(
+    response: str,
+    channels: Tuple[str, ...],
+    configs: Tuple[str, ...],
+    flight: int,
+    nfft: Optional[int] = None,
+    fs: Optional[float] = None,
+) -> Transfer:
+    """
+    The cached implementation of `get_transfer_functions`.
+    """
+    impulses = panama.responses.get_all_response_arrays(
+        response, list(channels), list(configs), flight, mmap=True, fs=fs
+    )
+    return _transfer(impulses.time, impulses.values, nfft)
+
+
+def prime_transfer_functions(
+    transfer: xr.DataArray,
+    response: str,
+    flight: int,
+    nfft: Optional[int] = None,
+    fs: Optional[float] = None,
+) -> None:
+    """
+    Use existing (i.e. shared) transfer functions in place of computing them.
+
+    Subsequent calls to `get_transfer_functions` with the same arguments
+    (and the channels and configs of `transfer`) return these values
+    until they are evicted or cleared from `panama.cache`.
+
+    Parameters
+    ----------
+    transfer: xr.DataArray
+        The read-only (channels, configs, freqs) transfer functions.
+    response: str
+       The directory name of the type of response.
+    flight: int
+       The ANITA flight of the responses.
+    nfft: Optional[int]
+       The length of the FFT of the transfer functions.
+    fs: Optional[float]
+       The sample rate of the transfer functions in GSa/s.
+    """
+    panama.cache.prime(
+        _get_transfer_functions,
+        Transfer(transfer.freqs.values, transfer.values),
+        response,
+        tuple(transfer.channels.values.tolist()),
+        tuple(transfer.configs.values.tolist()),
+        flight,
+        nfft,
+        fs,
+    )
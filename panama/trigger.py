@@ -0,0 +1,258 @@
+"""
+A vectorized model of the ANITA phi-sector trigger.
+
+The trigger operates on batches of (events, channels, samples)
+waveforms that have already been filtered by the trigger path of
+each channel (i.e. `ANITA.chain("trigger", ...)` plus noise).
+
+Each batch is triggered in four stages:
+
+- a square-law (tunnel-diode) detector that integrates the power
+  of every channel over a short window,
+- L1: a channel fires when its integrated power exceeds its threshold,
+- L2: a phi-sector fires when at least `l2_rings` of its rings fire
+  (in the same polarization) within `l2_window` ns, and
+- L3: the payload triggers when at least `l3_sectors` neighbouring
+  phi-sectors fire (in the same polarization) within `l3_window` ns.
+
+Every stage is evaluated for every event at once with array
+operations so there is no per-event Python logic.
+"""
+from typing import NamedTuple, Union
+
+import numpy as np
+
+from panama.anita import ANITA
+from panama.profiling import instrumented
+
+__all__ = ["Trigger", "TriggerResult", "sector_layout"]
+
+
+class TriggerResult(NamedTuple):
+    """
+    The trigger decisions for a batch of events.
+    """
+
+    l1: np.ndarray  # whether each (events, channels) fired
+    l2: np.ndarray  # whether each (events, sectors, pols) fired
+    l3: np.ndarray  # whether each (events, sectors, pols) formed an L3
+    triggered: np.ndarray  # whether each (events,) triggered the payload
+
+
+def sector_layout(payload: ANITA) -> np.ndarray:
+    """
+    Get the index of every channel in the phi-sector topology.
+
+    Channels are identified by their phi sector (the first two
+    characters), ring, and polarization (the last character).
+
+    Parameters
+    ----------
+    payload: ANITA
+        The payload to get the layout of.
+
+    Returns
+    -------
+    layout: np.ndarray
+        The (sectors, pols, rings) index of each channel in `payload.channels`.
+
+    Raises
+    ------
+    ValueError:
+        If the channels do not form a complete (sectors, pols, rings) grid.
+    """
+    # the index of each channel
+    index = {channel: i for i, channel in enumerate(payload.channels)}
+
+    # and find every channel in each sector
+    try:
+        layout = np.asarray(
+            [
+                [
+                    [index[f"{sector:02}{ring}{pol}"] for ring in payload.rings]
+                    for pol in payload.pols
+                ]
+                for sector in payload.sectors
+            ]
+        )
+    except KeyError as err:
+        raise ValueError(f"Channel {err} is missing from the payload.")
+
+    # and we are done
+    return layout
+
+
+def _stretch(fired: np.ndarray, width: int) -> np.ndarray:
+    """
+    Stretch boolean pulses along the last axis.
+
+    A sample is True if any of the previous `width` samples
+    (including itself) were True.
+
+    Parameters
+    ----------
+    fired: np.ndarray
+        The (..., samples) boolean pulses.
+    width: int
+        The width of the stretched pulses in samples.
+
+    Returns
+    -------
+    stretched: np.ndarray
+        The (..., samples) stretched pulses.
+    """
+    # a single sample doesn't need to be stretched
+    if width <= 1:
+        return fired
+
+    # count the number of pulses up to (and including) each sample
+    counts = np.cumsum(fired, axis=-1, dtype=np.int32)
+
+    # and check if the count changed in the last `width` samples
+    stretched = counts.astype(bool)
+    stretched[..., width:] = counts[..., width:] > counts[..., :-width]
+
+    # and we are done
+    return stretched
+
+
+class Trigger:
+    """
+    Trigger batches of (events, channels, samples) trigger-path waveforms.
+
+    Parameters
+    ----------
+    payload: ANITA
+        The payload (and flight) to trigger.
+    fs: float
+        The sample rate of the waveforms in GSa/s.
+    thresholds: Union[float, np.ndarray]
+        The L1 threshold of every channel (or all channels)
+        in units of the noise power of that channel.
+    vrms: Union[float, np.ndarray]
+        The RMS noise voltage of every channel (or all channels) in V.
+    integration: float
+        The integration time of the power detector in ns.
+    l2_window: float
+        The L1 coincidence window within a phi-sector in ns.
+    l2_rings: int
+        The number of rings in a phi-sector required for an L2.
+    l3_window: float
+        The L2 coincidence window between neighbouring phi-sectors in ns.
+    l3_sectors: int
+        The number of neighbouring phi-sectors required for an L3 (1 or 2).
+    """
+
+    def __init__(
+        self,
+        payload: ANITA,
+        fs: float,
+        thresholds: Union[float, np.ndarray] = 5.0,
+        vrms: Union[float, np.ndarray] = 1.0,
+        integration: float = 5.0,
+        l2_window: float = 4.0,
+        l2_rings: int = 2,
+        l3_window: float = 10.0,
+        l3_sectors: int = 2,
+    ):
+        self.payload = payload
+        self.fs = fs
+        self.l2_rings = l2_rings
+        self.l3_sectors = l3_sectors
+
+        # check that we have a valid topology
+        self.layout = sector_layout(payload)
+        if not 1 <= l2_rings <= self.layout.shape[-1]:
+            raise ValueError(f"l2_rings must be in [1, {self.layout.shape[-1]}].")
+        if l3_sectors not in (1, 2):
+            raise ValueError("l3_sectors must be 1 or 2.")
+
+        # the integration time and coincidence windows in samples
+        self.integration = max(int(round(integration * fs)), 1)
+        self.l2_window = max(int(round(l2_window * fs)), 1)
+        self.l3_window = max(int(round(l3_window * fs)), 1)
+
+        # the absolute (channels, 1) threshold on the integrated power in V^2
+        thresholds = np.broadcast_to(thresholds, (len(payload.channels),))
+        vrms = np.broadcast_to(vrms, (len(payload.channels),))
+        self.thresholds = (thresholds * vrms ** 2)[:, None]
+        self.thresholds.flags.writeable = False
+
+    def power(self, waveforms: np.ndarray) -> np.ndarray:
+        """
+        Integrate the power of a batch of waveforms.
+
+        Parameters
+        ----------
+        waveforms: np.ndarray
+            The (events, channels, samples) trigger-path waveforms in V.
+
+        Returns
+        -------
+        power: np.ndarray
+            The (events, channels, samples) float64 power averaged
+            over the integration window in V^2.
+        """
+        # the instantaneous power of each sample in double precision
+        square = np.square(waveforms, dtype=np.float64)
+
+        # and sum it over the preceding integration window - this sums
+        # the shifted powers directly (rather than differencing a running
+        # sum) so that quiet sections of long records keep their precision
+        width = self.integration
+        power = square.copy()
+        for lag in range(1, width):
+            power[..., lag:] += square[..., :-lag]
+
+        # and we are done
+        return power / width
+
+    @instrumented
+    def __call__(self, waveforms: np.ndarray) -> TriggerResult:
+        """
+        Trigger a batch of waveforms.
+
+        Parameters
+        ----------
+        waveforms: np.ndarray
+            The (events, channels, samples) trigger-path waveforms in V.
+
+        Returns
+        -------
+        result: TriggerResult
+            The L1, L2, and L3 decisions for every event.
+
+        Raises
+        ------
+        ValueError:
+            If the waveforms do not have one trace per channel.
+        """
+        # check that we have the right number of channels
+        if waveforms.ndim != 3 or waveforms.shape[1] != len(self.payload.channels):
+            raise ValueError(
+                f"Expected (events, {len(self.payload.channels)}, samples) "
+                f"waveforms but got {waveforms.shape}."
+            )
+
+        # L1: when each channel is over threshold
+        fired = self.power(waveforms) > self.thresholds
+
+        # L2: stretch each L1 and count the rings that overlap
+        rings = _stretch(fired, self.l2_window)[:, self.layout, :]
+        l2 = np.count_nonzero(rings, axis=-2) >= self.l2_rings
+
+        # L3: stretch each L2 and check the neighbouring sectors
+        sectors = _stretch(l2, self.l3_window)
+        if self.l3_sectors == 2:
+            neighbours = np.roll(sectors, 1, axis=1) | np.roll(sectors, -1, axis=1)
+            l3 = l2 & neighbours
+        else:
+            l3 = l2
+
+        # reduce each stage over time
+        l1 = fired.any(axis=-1)
+        l2 = l2.any(axis=-1)
+        l3 = l3.any(axis=-1)
+
+        # and we are done
+        return TriggerResult(l1, l2, l3, l3.any(axis=(1, 2)))
@@ -29,7 +29,6 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Intended Audience :: Science/Research",
         "Topic :: Scientific/Engineering :: Physics",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
     ],
@@ -43,18 +42,21 @@ setup(
         " geomagnetic",
     ],
     packages=["panama"],
-    python_requires=">=3.6*, <4",
+    python_requires=">=3.7, <4",
     install_requires=[
         "numpy",
         "cachetools",
         "xarray",
-        "cached_property",
+        "cached_property; python_version < '3.8'",
+        "scipy",
         "align @ git+git://github.com/rprechelt/align",
     ],
     extras_require={
         "test": ["pytest", "black", "mypy", "coverage", "pytest-cov", "flake8"],
+        "bench": ["pytest", "pytest-benchmark"],
     },
     scripts=[],
+    entry_points={"console_scripts": ["panama-store=panama.store:main"]},
     project_urls={},
     include_package_data=True,
 )
@@ -2,6 +2,7 @@
 Test that we can load and plot AMPA responses.
 """
 import matplotlib.pyplot as plt
+import numpy as np
 
 import panama.calibration.ampa as ampa
 
@@ -33,3 +34,18 @@ def test_average_ampa():
     ax.set_title("Average ANITA-4 AMPA Response")
 
     plt.savefig(f"{figdir}/anita4_average_ampa.png")
+
+
+def test_average_ampa_arrays() -> None:
+    """
+    Check that the raw AMPA arrays match the Dataset.
+    """
+
+    # get the raw and xarray responses
+    raw = ampa.get_average_response_arrays()
+    average = ampa.get_average_response()
+
+    # and check that they agree
+    np.testing.assert_array_equal(raw.freqs, average.freqs.values)
+    np.testing.assert_array_equal(raw.S21, average.S21.values)
+    np.testing.assert_array_equal(raw.NF, average.NF.values)
@@ -1,11 +1,13 @@
 """
 Test that we can load and plot ANITA antenna gains
 """
+
 import matplotlib.pyplot as plt
 import numpy as np
 
 import panama.antenna as antenna
 import panama.calibration.antenna as calantenna
+from panama.anita4 import ANITA4
 
 from . import figdir
 
@@ -122,3 +124,125 @@ def test_anita3_antenna() -> None:
 
     plt.show()
     plt.savefig(f"{figdir}/anita3_antenna_gain.png")
+
+
+def test_anita4_beam_pattern() -> None:
+    """
+    Check that we can evaluate the gain of every ANITA-4 channel at once.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # get the beam pattern
+    pattern = anita.beam_pattern
+
+    # the directions and frequencies that we evaluate
+    elevation = np.asarray([-10.0, -10.0, -30.0])
+    azimuth = np.asarray([0.0, 22.5, 0.0])
+    freqs = np.asarray([300.0, 600.0, 900.0])
+
+    # evaluate the gain for every direction
+    gain = pattern.gain(elevation, azimuth, freqs)
+
+    # check the shape
+    assert gain.shape == (3, len(anita.channels), 3)
+
+    # the boresight gain of 01TH and 02TV
+    gains = calantenna.get_response(4)
+    ch01, ch02 = anita.channels.index("01TH"), anita.channels.index("02TV")
+    np.testing.assert_allclose(
+        gain[0, ch01], np.interp(freqs, gains.freqs, gains["H"]), atol=1e-6
+    )
+    np.testing.assert_allclose(
+        gain[1, ch02], np.interp(freqs, gains.freqs, gains["V"]), atol=1e-6
+    )
+
+    # check that the gain is lower off-boresight
+    assert np.all(gain[2, ch01] < gain[0, ch01])
+    assert np.all(gain[1, ch01] < gain[0, ch01])
+
+    # and that we are 3 dB down at the HWHM in azimuth
+    beamwidths = antenna.get_beamwidth(4)
+    hwhm = np.interp(600.0, beamwidths.freqs, beamwidths.H)
+    offset = pattern.gain(np.asarray([-10.0]), np.asarray([hwhm]), np.asarray([600.0]))
+    np.testing.assert_allclose(
+        offset[0, ch01, 0], gain[0, ch01, 1] - 10 * np.log10(2), atol=1e-6
+    )
+
+    # the azimuth HWHM of a VPol channel is the vertical-plane beamwidth
+    chv = anita.channels.index("01TV")
+    hwhm = np.interp(600.0, beamwidths.freqs, beamwidths.V)
+    offset = pattern.gain(np.asarray([-10.0]), np.asarray([hwhm]), np.asarray([600.0]))
+    np.testing.assert_allclose(
+        offset[0, chv, 0], gain[0, chv, 1] - 10 * np.log10(2), atol=1e-6
+    )
+
+    # and the elevation HWHM of a VPol channel is the horizontal-plane beamwidth
+    hwhm = np.interp(600.0, beamwidths.freqs, beamwidths.H)
+    offset = pattern.gain(
+        np.asarray([-10.0 + hwhm]), np.asarray([0.0]), np.asarray([600.0])
+    )
+    np.testing.assert_allclose(
+        offset[0, chv, 0], gain[0, chv, 1] - 10 * np.log10(2), atol=1e-6
+    )
+
+    # and check the linear gain
+    np.testing.assert_allclose(
+        pattern.gain(elevation, azimuth, freqs, linear=True), 10 ** (gain / 10.0)
+    )
+
+
+def test_antenna_arrays() -> None:
+    """
+    Check that the raw beamwidths and gains match the Datasets.
+    """
+    for flight in [3, 4]:
+
+        # the raw and xarray beamwidths
+        raw = antenna.get_beamwidth_arrays(flight)
+        beamwidths = antenna.get_beamwidth(flight)
+
+        # and check that they agree
+        np.testing.assert_array_equal(raw.freqs, beamwidths.freqs.values)
+        np.testing.assert_array_equal(raw.H, beamwidths.H.values)
+        np.testing.assert_array_equal(raw.V, beamwidths.V.values)
+
+    for flight in [1, 3]:
+
+        # the raw and xarray gains
+        gain = calantenna.get_response_arrays(flight)
+        response = calantenna.get_response(flight)
+
+        # and check that they agree
+        np.testing.assert_array_equal(gain.freqs, response.freqs.values)
+        np.testing.assert_array_equal(gain.H, response.H.values)
+        np.testing.assert_array_equal(gain.V, response.V.values)
+
+
+def test_beam_pattern_nan(monkeypatch) -> None:
+    """
+    Check that missing gains don't propagate into the beam pattern.
+    """
+
+    # gains on a union frequency grid with missing samples
+    freqs = np.asarray([200.0, 500.0, 800.0, 1200.0])
+    gains = calantenna.AntennaGain(
+        freqs,
+        np.asarray([5.0, 8.0, np.nan, 10.0]),
+        np.asarray([np.nan, 7.0, 9.0, 11.0]),
+    )
+    monkeypatch.setattr(calantenna, "get_response_arrays", lambda flight: gains)
+
+    # create a pattern with one channel of each polarization
+    pattern = antenna.BeamPattern(4, np.zeros(2), np.zeros(2), ["H", "V"], freqs)
+
+    # check that the gain table is finite
+    assert np.all(np.isfinite(pattern.pol_gain))
+    assert np.all(np.isfinite(pattern.gain(np.zeros(1), np.zeros(1))))
+
+    # and that the missing samples are interpolated over
+    np.testing.assert_allclose(
+        pattern.gain(np.zeros(1), np.zeros(1), np.asarray([800.0]))[0, :, 0],
+        [8.0 + 2.0 * 3.0 / 7.0, 9.0],
+    )
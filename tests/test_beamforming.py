@@ -0,0 +1,104 @@
+"""
+Test the fractional-delay shifting and beamforming.
+"""
+import numpy as np
+import pytest
+
+import panama.beamforming as beamforming
+from panama.anita4 import ANITA4
+
+
+def pulse(time: np.ndarray, arrival: np.ndarray) -> np.ndarray:
+    """
+    A band-limited Gaussian pulse arriving at `arrival` ns.
+    """
+    return np.exp(-0.5 * ((time - arrival[..., None]) / 0.8) ** 2)
+
+
+def test_shift() -> None:
+    """
+    Check that we can delay waveforms by fractional delays.
+    """
+
+    # the time of each sample at 2.6 GSa/s
+    time = np.arange(256) / 2.6
+
+    # a set of pulses at 40 ns
+    waveforms = pulse(time, np.full((2, 3), 40.0))
+
+    # and delay them by a set of fractional delays
+    delays = np.asarray([0.0, 1.37, -12.91])
+    shifted = beamforming.shift(waveforms, delays, 2.6)
+
+    # and check against the analytic pulses
+    assert shifted.shape == waveforms.shape
+    expected = pulse(time, 40.0 + np.broadcast_to(delays, (2, 3)))
+    np.testing.assert_allclose(shifted, expected, atol=1e-6)
+
+
+def test_beamformer() -> None:
+    """
+    Check that we coherently sum pulses from a plane wave.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # the sample rate and the time of each sample
+    fs, nsamples = 2.6, 256
+    time = np.arange(nsamples) / fs
+
+    # a pulse from a single direction arriving at the origin at 40 ns
+    elevation, azimuth = -12.5, 63.0
+    delays = anita.delays(elevation, azimuth)
+    waveforms = pulse(time, 40.0 + np.stack([delays, delays]))
+
+    # create a beamformer
+    beamformer = beamforming.Beamformer(anita, fs, nsamples, "V")
+
+    # check that the ramps are cached per direction
+    ramps = beamformer.ramps(elevation, azimuth)
+    assert beamformer.ramps(elevation, azimuth) is ramps
+    assert not ramps.flags.writeable
+
+    # the aligned waveforms are all the same pulse
+    aligned = beamformer.align(waveforms, elevation, azimuth)
+    np.testing.assert_allclose(aligned, pulse(time, np.full((2, 96), 40.0)), atol=1e-6)
+
+    # and so is the coherent sum within the sectors that see it
+    summed = beamformer(waveforms, elevation, azimuth, sectors=[3, 4, 5])
+    assert summed.shape == (2, nsamples)
+    np.testing.assert_allclose(summed, pulse(time, np.full(2, 40.0)), atol=1e-6)
+
+    # the same with a direction for every event
+    events = beamformer(waveforms, np.full(2, elevation), np.full(2, azimuth))
+    np.testing.assert_allclose(events, summed, atol=1e-6)
+
+    # and with per-event elevations and a single azimuth
+    mixed = beamformer(waveforms, np.full(2, elevation), azimuth)
+    np.testing.assert_allclose(mixed, events, atol=1e-6)
+
+    # and check that we reject the wrong number of channels
+    with pytest.raises(ValueError):
+        beamformer(waveforms[:, :10, :], elevation, azimuth)
+
+    # or the wrong number of samples
+    longer = np.zeros((2, len(anita.channels), 4 * nsamples))
+    with pytest.raises(ValueError):
+        beamformer(longer, elevation, azimuth)
+    with pytest.raises(ValueError):
+        beamformer.align(longer, elevation, azimuth)
+
+    # or sectors without any channels
+    with pytest.raises(ValueError):
+        beamformer(waveforms, elevation, azimuth, sectors=[99])
+
+    # or a direction for a different number of events
+    with pytest.raises(ValueError):
+        beamformer(waveforms, np.zeros(3), azimuth)
+    with pytest.raises(ValueError):
+        beamformer.align(waveforms, np.zeros(3), np.zeros(3))
+
+    # or an unknown polarization
+    with pytest.raises(ValueError):
+        beamforming.Beamformer(anita, fs, nsamples, "X")
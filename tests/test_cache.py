@@ -0,0 +1,170 @@
+"""
+Test the bounded loader cache.
+"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import panama.cache as cache
+import panama.calibration.tuff as tuffcalib
+
+
+def test_cached_keys() -> None:
+    """
+    Check that positional, keyword, and default arguments share a value.
+    """
+
+    # count the number of times we load
+    calls = []
+
+    @cache.cached
+    def loader(a: int, b: int = 2) -> np.ndarray:
+        calls.append((a, b))
+        return np.full(10, a + b)
+
+    # these are all the same call
+    first = loader(1)
+    assert loader(1, 2) is first
+    assert loader(a=1, b=2) is first
+    assert loader(1, b=2) is first
+    assert len(calls) == 1
+
+    # but this is different
+    assert loader(1, 3) is not first
+    assert len(calls) == 2
+
+    # and check the loader statistics
+    name = f"{loader.__module__}.{loader.__qualname__}"
+    assert cache.stats().loaders[name] == (3, 2)
+
+
+def test_cache_eviction() -> None:
+    """
+    Check that the cache is bounded by the size of its values.
+    """
+
+    @cache.cached
+    def loader(i: int) -> np.ndarray:
+        return np.zeros(100)  # 800 bytes
+
+    try:
+        # make the cache big enough for two arrays
+        cache.configure(2000)
+
+        # load three arrays
+        first = loader(0)
+        loader(1)
+        loader(2)
+
+        # check that we only keep the last two
+        stats = cache.stats()
+        assert stats.entries == 2
+        assert stats.currsize == 1600
+        assert stats.evictions >= 1
+
+        # and that the first array has to be loaded again
+        assert loader(0) is not first
+
+    finally:
+        cache.configure(cache.DEFAULT_MAXSIZE)
+
+
+def test_single_flight() -> None:
+    """
+    Check that concurrent calls only load a value once.
+    """
+
+    # count the number of times we load
+    calls = []
+
+    @cache.cached
+    def loader(i: int) -> np.ndarray:
+        calls.append(i)
+        time.sleep(0.1)
+        return np.zeros(10)
+
+    # the values returned to each thread
+    results = []
+
+    # start a bunch of threads that all load the same value
+    threads = [
+        threading.Thread(target=lambda: results.append(loader(0))) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # check that we only loaded it once and everyone got the same value
+    assert calls == [0]
+    assert all(result is results[0] for result in results)
+
+
+def test_cached_calibration() -> None:
+    """
+    Check that the calibration loaders share cached, read-only arrays.
+    """
+
+    # load the same response twice
+    first = tuffcalib.get_response("260_0_0")
+    second = tuffcalib.get_response("260_0_0")
+
+    # they share the same (read-only) values
+    assert np.shares_memory(first.values, second.values)
+    assert not first.values.flags.writeable
+
+    # but modifying the attributes of one doesn't modify the other
+    assert first is not second
+    first.freqs.attrs["units"] = "GHz"
+    assert second.freqs.attrs["units"] == "MHz"
+
+
+def test_clear_loaders() -> None:
+    """
+    Check that we can clear the values of a subset of the loaders.
+    """
+
+    # two loaders with different names
+    @cache.cached
+    def first(x: int) -> np.ndarray:
+        return np.full(10, x)
+
+    @cache.cached
+    def second(x: int) -> np.ndarray:
+        return np.full(10, x)
+
+    # load a value from each
+    a, b = first(1), second(1)
+
+    # and clear only the first loader
+    cache.clear(f"{first.__module__}.{first.__qualname__}")
+    assert first(1) is not a
+    assert second(1) is b
+
+
+def test_prime() -> None:
+    """
+    Check that we can install the value of a loader call.
+    """
+
+    # count the number of times we load
+    calls = []
+
+    @cache.cached
+    def loader(a: int, b: int = 2) -> np.ndarray:
+        calls.append((a, b))
+        return np.full(10, a + b)
+
+    # prime a value for a call
+    value = np.zeros(10)
+    cache.prime(loader, value, 1, b=2)
+
+    # and it is returned without loading
+    assert loader(1) is value
+    assert calls == []
+
+    # and check that we can only prime cached loaders
+    with pytest.raises(ValueError):
+        cache.prime(np.zeros, value, 10)
@@ -0,0 +1,97 @@
+"""
+Test the precomposed signal-chain transfer functions.
+"""
+import numpy as np
+import pytest
+
+import panama.calibration.grid as grid
+import panama.chain as chain
+from panama.anita4 import ANITA4
+
+
+def test_calibration_chain() -> None:
+    """
+    Check that the calibration chain composes every calibration.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # the grid that we compose on
+    fs, N = 3.0, 512
+
+    # get the composed chain
+    calibration = anita.chain("calibration", fs, N)
+
+    # check the shape and that it is read-only and cached
+    assert calibration.shape == (len(anita.channels), len(anita.configs), N // 2 + 1)
+    assert not calibration.values.flags.writeable
+    again = anita.chain("calibration", fs, N)
+    assert np.shares_memory(again.values, calibration.values)
+
+    # but every call gets its own DataArray
+    calibration.attrs["units"] = "V"
+    assert again.attrs["units"] == "m"
+
+    # and compare one channel against the individual calibrations
+    channel, config = "05MV", anita.configs[2]
+    receiver = 10 ** (
+        (grid.get_ampa_response(fs, N).S21 + grid.get_tuff_response(config, fs, N))
+        / 20.0
+    )
+    np.testing.assert_allclose(
+        anita.chain("receiver", fs, N).sel(channels=channel, configs=config),
+        receiver.values,
+    )
+
+    # the antenna is its effective height for a matched 50 Ohm load
+    freqs = grid.rfft_freqs(fs, N)
+    gain = 10 ** (grid.get_antenna_response(4, fs, N).V.values / 10.0)
+    height = np.zeros_like(freqs)
+    height[1:] = (299.792458 / freqs[1:]) * np.sqrt(gain[1:] * 50.0 / (np.pi * 376.73))
+    np.testing.assert_allclose(
+        calibration.sel(channels=channel, configs=config),
+        height * receiver.values,
+        rtol=1e-5,
+    )
+
+    # and check the units of the chains
+    assert anita.chain("calibration", fs, N).attrs["units"] == "m"
+    assert anita.chain("receiver", fs, N).attrs["units"] == "V/V"
+
+
+def test_effective_height() -> None:
+    """
+    Check the effective height of an isotropic antenna.
+    """
+
+    # a 0 dBi antenna at 300 MHz (with a ~1 m wavelength)
+    height = chain.effective_height(np.asarray([0.0, 0.0]), np.asarray([0.0, 300.0]))
+
+    # is ~0.2 m for a 50 Ohm load and is zero at DC
+    expected = (299.792458 / 300.0) * np.sqrt(50.0 / (np.pi * 376.73))
+    np.testing.assert_allclose(height, [0.0, expected], rtol=1e-5)
+
+
+def test_measured_chain() -> None:
+    """
+    Check that we can use the measured responses as the chain.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # the measured chain is the transfer function of the responses
+    np.testing.assert_allclose(
+        anita.chain("digitizer", 10.0, 2048), anita.transfer_functions("digitizer", 2048)
+    )
+
+    # and at any other rate it uses the resampled responses
+    np.testing.assert_allclose(
+        anita.chain("digitizer", 3.0, 2048),
+        anita.transfer_functions("digitizer", 2048, 3.0),
+    )
+
+    # and check that we reject unknown sources
+    with pytest.raises(ValueError):
+        anita.chain("unknown", 10.0, 2048)
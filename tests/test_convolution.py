@@ -0,0 +1,124 @@
+"""
+Test that we can apply the payload responses to batches of waveforms.
+"""
+import numpy as np
+import pytest
+
+from panama.anita4 import ANITA4
+from panama.convolution import ResponseConvolver, StreamingFilter, next_fast_len
+
+
+def test_next_fast_len() -> None:
+    """
+    Check that we find 5-smooth FFT lengths.
+    """
+    assert next_fast_len(1) == 1
+    assert next_fast_len(1000) == 1000
+    assert next_fast_len(1001) == 1024
+    assert next_fast_len(1999) == 2000
+    assert next_fast_len(2049) == 2160
+
+
+def test_convolver() -> None:
+    """
+    Check that the batched convolution matches np.convolve.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # use a subset of channels
+    channels = anita.channels[:5]
+
+    # create the convolver
+    convolver = ResponseConvolver(anita, 512, "digitizer", channels)
+
+    # create some random waveforms
+    waveforms = np.random.normal(size=(4, len(channels), 512))
+
+    # and a config for each event
+    configs = np.asarray([0, 3, 3, 5])
+
+    # convolve every event
+    out = np.empty_like(waveforms)
+    convolved = convolver(waveforms, configs, out=out)
+
+    # check that we used the output buffer
+    assert convolved is out
+
+    # and compare against np.convolve
+    responses = anita.digitizer_responses
+    for ievent, iconfig in enumerate(configs):
+        for ich, channel in enumerate(channels):
+            response = responses.sel(channels=channel).values[iconfig]
+            np.testing.assert_allclose(
+                convolved[ievent, ich],
+                np.convolve(waveforms[ievent, ich], response)[:512],
+                atol=1e-12,
+            )
+
+    # check that config names give the same answer
+    names = [anita.configs[i] for i in configs]
+    np.testing.assert_allclose(convolver(waveforms, names), convolved)
+
+    # and check that a single config is used for every event
+    np.testing.assert_allclose(convolver(waveforms, 3)[1:3], convolved[1:3])
+
+    # check that we can run in single precision
+    single = ResponseConvolver(anita, 512, "digitizer", channels, dtype=np.float32)
+    assert single(waveforms, configs).dtype == np.float32
+    np.testing.assert_allclose(single(waveforms, configs), convolved, atol=1e-4)
+
+    # check that chunks of events (that split the configs) give the same answer
+    chunked = ResponseConvolver(anita, 512, "digitizer", channels, chunk=3)
+    np.testing.assert_allclose(chunked(waveforms, configs), convolved, atol=1e-12)
+
+    # and check that we validate the shape of the waveforms
+    with pytest.raises(ValueError):
+        convolver(waveforms[:, :, :100], configs)
+
+
+def test_streaming_filter() -> None:
+    """
+    Check that streaming overlap-save matches a full-record convolution.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # the responses of the first three channels
+    kernels = anita.trigger_responses.values[:3, 0, :]
+
+    # create a filter for the three channels
+    stream = StreamingFilter(kernels, 256)
+
+    # and a long record for each channel
+    record = np.random.normal(size=(3, 256 * 10 + 100))
+
+    # filter the record in chunks (with a short final chunk)
+    filtered = np.concatenate(
+        [stream(record[:, i : i + 256]) for i in range(0, record.shape[-1], 256)],
+        axis=-1,
+    )
+
+    # and compare to the full-record convolution
+    for i in range(3):
+        np.testing.assert_allclose(
+            filtered[i],
+            np.convolve(record[i], kernels[i])[: record.shape[-1]],
+            atol=1e-12,
+        )
+
+    # check that we can reset the stream
+    stream.reset()
+    np.testing.assert_allclose(stream(record[:, :256]), filtered[:, :256])
+
+    # check that we can create a filter directly from a response
+    single = StreamingFilter.from_response(
+        "trigger", anita.channels[0], anita.configs[0], anita.flight, 256
+    )
+    np.testing.assert_allclose(single(record[0, :256]), filtered[0, :256])
+
+    # and that we can't use chunks larger than the block size
+    with pytest.raises(ValueError):
+        stream(record[:, :512])
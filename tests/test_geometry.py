@@ -0,0 +1,88 @@
+"""
+Test the payload geometry and plane-wave delays.
+"""
+import numpy as np
+import pytest
+
+import panama.geometry as geometry
+from panama.anita4 import ANITA4
+
+
+def test_geometry() -> None:
+    """
+    Check the nominal geometry of ANITA-4.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # get the geometry of the payload
+    geom = anita.geometry
+
+    # check the shapes and that the arrays are read-only
+    assert geom.channels == tuple(anita.channels)
+    assert geom.positions.shape == (len(anita.channels), 3)
+    assert not geom.positions.flags.writeable
+
+    # check that the H and V channels of an antenna share a position
+    index = {channel: i for i, channel in enumerate(anita.channels)}
+    np.testing.assert_allclose(
+        geom.positions[index["05MH"]], geom.positions[index["05MV"]]
+    )
+
+    # and check that every antenna points along its position
+    np.testing.assert_allclose(
+        np.degrees(np.arctan2(geom.positions[:, 1], geom.positions[:, 0])) % 360.0,
+        geom.azimuth,
+        atol=1e-9,
+    )
+
+    # check the nominal boresights of a few sectors
+    elevation, azimuth = geometry.boresights(["01TH", "05MV", "16BH"])
+    np.testing.assert_allclose(elevation, -10.0)
+    np.testing.assert_allclose(azimuth, [0.0, 90.0, 337.5])
+
+    # and that we reject unknown flights
+    with pytest.raises(ValueError):
+        geometry.get_geometry(2)
+
+
+def test_delays() -> None:
+    """
+    Check the plane-wave delays.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+    geom = anita.geometry
+    index = {channel: i for i, channel in enumerate(anita.channels)}
+
+    # a horizontal wave along the boresight of sector 1
+    delays = anita.delays(0.0, 0.0)
+    assert delays.shape == (len(anita.channels),)
+
+    # sector 1 sees it before sector 9 (opposite side of the payload)
+    expected = -2 * geom.positions[index["01BH"], 0] / geometry.SPEED_OF_LIGHT
+    np.testing.assert_allclose(delays[index["01BH"]] - delays[index["09BH"]], expected)
+
+    # a wave from directly above reaches the top ring first
+    above = anita.delays(90.0, 0.0)
+    assert above[index["01TH"]] < above[index["01MH"]] < above[index["01BH"]]
+
+    # check that we can compute a grid of directions at once
+    elevation, azimuth = np.meshgrid([-10.0, 0.0], [0.0, 45.0, 90.0], indexing="ij")
+    grid = anita.delays(elevation, azimuth)
+    assert grid.shape == (2, 3, len(anita.channels))
+    np.testing.assert_allclose(grid[1, 0], delays)
+
+    # and check the cached table against the direct calculation
+    table = geometry.get_delay_table(4, (-60.0, 60.0, 121), 360)
+    assert table.shape == (121, 360, len(anita.channels))
+    assert not table.values.flags.writeable
+    np.testing.assert_allclose(table.sel(elevation=-10.0, azimuth=90.0), grid[0, 2])
+
+    # every call shares the cached arrays but not the DataArray
+    again = geometry.get_delay_table(4, (-60.0, 60.0, 121), 360)
+    assert np.shares_memory(again.values, table.values)
+    table.attrs["units"] = "s"
+    assert again.attrs["units"] == "ns"
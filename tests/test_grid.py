@@ -0,0 +1,70 @@
+"""
+Test that we can resample the calibration curves onto FFT grids.
+"""
+import numpy as np
+import xarray as xr
+
+import panama.calibration.ampa as ampa
+import panama.calibration.grid as grid
+import panama.calibration.tuff as tuffcalib
+
+
+def test_calibration_grids() -> None:
+    """
+    Check that the resampled curves are on the FFT grid and cached.
+    """
+
+    # the grid that we resample onto
+    fs, N = 3.0, 1024
+
+    # get the AMPA response on this grid
+    response = grid.get_ampa_response(fs, N)
+
+    # check the frequencies
+    np.testing.assert_allclose(response.freqs, 1e3 * np.fft.rfftfreq(N, 1.0 / fs))
+
+    # and that the values match an interpolation of the original in the band
+    average = ampa.get_average_response()
+    band = (response.freqs >= average.freqs[0]) & (response.freqs <= average.freqs[-1])
+    np.testing.assert_allclose(
+        response.S21[band], np.interp(response.freqs[band], average.freqs, average.S21)
+    )
+
+    # and that there is no gain or noise outside of the band
+    assert np.all(response.S21.values[~band] == -np.inf)
+    assert np.all(response.NF.values[~band] == 0.0)
+    assert response.S21.attrs["units"] == "dB"
+
+    # check that we can't modify the resampled values
+    assert not response.S21.values.flags.writeable
+
+    # and that they are cached per grid
+    assert grid.get_ampa_response(fs, N) is response
+    assert grid.get_ampa_response(fs, 2 * N) is not response
+
+    # check the TUFF and antenna responses
+    for config in tuffcalib.configs:
+        assert grid.get_tuff_response(config, fs, N).size == N // 2 + 1
+    assert grid.get_antenna_response(4, fs, N).H.size == N // 2 + 1
+
+
+def test_resample_fill() -> None:
+    """
+    Check that we ignore missing samples and fill outside of the band.
+    """
+
+    # a curve with a missing sample
+    curve = xr.DataArray(
+        [1.0, np.nan, 3.0, 4.0], coords={"freqs": [100.0, 200.0, 300.0, 400.0]}
+    )
+
+    # resample it onto a 1 GSa/s grid with 10 samples
+    resampled = grid.resample(curve, 1.0, 10, fill=-np.inf)
+
+    # check the values inside and outside of the band
+    np.testing.assert_allclose(resampled.values[2:5], [2.0, 3.0, 4.0])
+    assert np.all(resampled.values[[0, 5]] == -np.inf)
+
+    # and that we can hold the edge values
+    held = grid.resample(curve, 1.0, 10)
+    np.testing.assert_allclose(held.values[[0, 5]], [1.0, 4.0])
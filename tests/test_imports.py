@@ -0,0 +1,54 @@
+"""
+Test that importing panama is fast and does no work.
+"""
+import json
+import subprocess
+import sys
+
+# the maximum time (in seconds) to import the payloads
+IMPORT_BUDGET = 0.25
+
+# the modules that must only be imported on first use
+HEAVY_MODULES = ["numpy", "xarray", "pandas", "cachetools", "cached_property"]
+
+
+def test_import_budget() -> None:
+    """
+    Check that importing the payloads is within our budget.
+    """
+
+    # import the payloads in a fresh interpreter
+    script = (
+        "import json, sys, time;"
+        "start = time.perf_counter();"
+        "import panama.anita4, panama.anita4.tuff;"
+        "elapsed = time.perf_counter() - start;"
+        f"heavy = [m for m in {HEAVY_MODULES} if m in sys.modules];"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    result = json.loads(output)
+
+    # we must not have imported any heavy dependencies
+    assert result["heavy"] == []
+
+    # and the import must be within our budget
+    assert result["elapsed"] < IMPORT_BUDGET
+
+
+def test_lazy_attributes() -> None:
+    """
+    Check that the lazily loaded attributes are available.
+    """
+    import panama
+    from panama.anita4 import tuff
+
+    # the submodules are imported on first access
+    assert panama.timeline.Timeline is not None
+    assert "responses" in dir(panama)
+
+    # the TUFF timeline is loaded on first access
+    assert tuff.timeline is tuff.get_timeline()
+    assert tuff.config_by_time["time"][0] == tuff.timeline.start
@@ -0,0 +1,85 @@
+"""
+Test the interferometric pointing reconstruction.
+"""
+import numpy as np
+import pytest
+
+import panama.interferometry as interferometry
+from panama.anita4 import ANITA4
+
+
+def test_pairs() -> None:
+    """
+    Check the antenna pairs and their delay table.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # get the pairs within two phi-sectors
+    pairs = interferometry.get_pairs(anita.flight, "V", 2)
+
+    # 3 in each sector and 9 between every pair of sectors
+    assert pairs.shape == (16 * 3 + 2 * 16 * 9, 2)
+    assert all(anita.channels[i][-1] == "V" for i in pairs.ravel())
+    assert not pairs.flags.writeable
+
+    # check that the table shares the cached arrays and matches the direct calculation
+    table = interferometry.get_pair_delay_table(anita.flight, "V", 2)
+    assert table.shape == (61, 180, len(pairs))
+    again = interferometry.get_pair_delay_table(anita.flight, "V", 2)
+    assert np.shares_memory(again.values, table.values)
+    table.attrs["units"] = "s"
+    assert again.attrs["units"] == "ns"
+    delays = anita.delays(-10.0, 40.0)
+    np.testing.assert_allclose(
+        table.sel(elevation=-10.0, azimuth=40.0),
+        delays[pairs[:, 0]] - delays[pairs[:, 1]],
+    )
+
+    # and check that we reject unknown polarizations
+    with pytest.raises(ValueError):
+        interferometry.get_pairs(anita.flight, "X", 2)
+    with pytest.raises(ValueError):
+        interferometry.Interferometer(anita, 3.0, pol="hpol")
+
+
+def test_pointing() -> None:
+    """
+    Check that we reconstruct the direction of impulsive plane waves.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # the sample rate and the time of each sample
+    fs = 2.6
+    time = np.arange(256) / fs
+
+    # the true direction of each event
+    elevation = np.asarray([-15.3, -32.1, 5.4])
+    azimuth = np.asarray([47.8, 301.2, 180.9])
+
+    # the delay at every channel of each event
+    delays = anita.delays(elevation[:, None], azimuth[:, None])[:, 0, :]
+
+    # a Gaussian pulse arriving at 40 ns plus some noise
+    rng = np.random.default_rng(7)
+    arrival = 40.0 + delays[..., None]
+    waveforms = np.exp(-0.5 * ((time - arrival) / 0.5) ** 2)
+    waveforms += 0.01 * rng.standard_normal(waveforms.shape)
+
+    # and reconstruct every event
+    pointing = interferometry.Interferometer(anita, fs, "H")(waveforms)
+
+    # check the shape of the coarse maps
+    assert pointing.coarse.shape == (3, 61, 180)
+
+    # and check that we found the right direction
+    np.testing.assert_allclose(pointing.elevation, elevation, atol=0.5)
+    np.testing.assert_allclose(pointing.azimuth, azimuth, atol=0.5)
+    assert np.all(pointing.peak > 0.9)
+
+    # and check that we reject the wrong number of channels
+    with pytest.raises(ValueError):
+        interferometry.Interferometer(anita, fs)(waveforms[:, :10, :])
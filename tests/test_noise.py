@@ -0,0 +1,112 @@
+"""
+Test that we can generate thermal noise through the signal chain.
+"""
+import numpy as np
+import pytest
+
+from panama.anita4 import ANITA4
+from panama.noise import NoiseGenerator, get_system_temperature, spawn_generators
+
+
+def test_system_temperature() -> None:
+    """
+    Check the Friis system temperature and RMS voltage of every config.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # get the system temperature on a 3 GSa/s grid
+    system = get_system_temperature(anita.configs, 4, 3.0, 256, temperature=200.0)
+
+    # check the shape of the results
+    assert system.temperature.shape == (len(anita.configs), 129)
+    assert system.vrms.shape == (len(anita.configs),)
+
+    # the system is always hotter than the antenna
+    assert np.all(system.temperature.values >= 200.0)
+
+    # a hotter antenna must increase the noise
+    hotter = get_system_temperature(anita.configs, 4, 3.0, 256, temperature=400.0)
+    assert np.all(hotter.vrms.values > system.vrms.values)
+
+    # the results are cached and read-only
+    assert get_system_temperature(anita.configs, 4, 3.0, 256, 200.0) is system
+    assert not system.temperature.values.flags.writeable
+
+    # and the generated noise should agree with the system RMS voltage
+    generator = NoiseGenerator(anita, 3.0, 256, 200.0, channels=anita.channels[:2])
+    for vrms in generator.vrms:
+        np.testing.assert_allclose(vrms, system.vrms.values)
+
+    # we only have the calibrations for ANITA-4
+    with pytest.raises(ValueError):
+        get_system_temperature(anita.configs, 3, 3.0, 256)
+
+
+def test_noise_generator() -> None:
+    """
+    Check the shape and the RMS of the generated noise.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # use a subset of channels
+    channels = anita.channels[:3]
+
+    # create the generator
+    generator = NoiseGenerator(anita, 3.0, 256, channels=channels)
+
+    # the expected RMS voltage of every channel and config
+    assert generator.vrms.shape == (len(channels), len(anita.configs))
+    assert np.all(generator.vrms > 0)
+
+    # generate a large batch of noise in the same config
+    noise = generator(2000, "260_375_0", np.random.default_rng(0))
+
+    # check the shape and type of the noise
+    assert noise.shape == (2000, len(channels), 256)
+    assert noise.dtype == np.float64
+
+    # and check that the RMS agrees with the expectation
+    expected = generator.vrms[:, anita.configs.index("260_375_0")]
+    np.testing.assert_allclose(noise.std(axis=(0, 2)), expected, rtol=0.02)
+
+    # a mismatched number of configs should raise an exception
+    with pytest.raises(ValueError):
+        generator(4, [0, 1, 2])
+
+
+def test_noise_float32() -> None:
+    """
+    Check that we can generate single-precision noise with per-event configs.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # create the generator
+    generator = NoiseGenerator(anita, 3.0, 128, dtype=np.float32)
+
+    # generate noise with a different config for each event
+    noise = generator(3, [0, 2, 5], np.random.default_rng(0))
+
+    # and check the shape and type
+    assert noise.shape == (3, len(anita.channels), 128)
+    assert noise.dtype == np.float32
+
+
+def test_spawn_generators() -> None:
+    """
+    Check that spawned generators are independent and reproducible.
+    """
+
+    # spawn two sets of generators from the same seed
+    first, second = spawn_generators(1, 2), spawn_generators(1, 2)
+
+    # the same worker should produce the same stream
+    assert first[0].random() == second[0].random()
+
+    # but different workers should produce different streams
+    assert first[1].random() != first[0].random()
@@ -0,0 +1,60 @@
+"""
+Test the instrumentation of the PANAMA loaders.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+
+import panama.cache
+import panama.calibration.tuff as tuffcalib
+import panama.profiling as profiling
+from panama.anita4 import tuff
+
+
+def test_profile(tmp_path: Path) -> None:
+    """
+    Check that we record calls, reads, and cache statistics.
+    """
+
+    # start with an empty cache so that we have to read the files
+    panama.cache.clear()
+
+    # the file to write the report into
+    filename = str(tmp_path / "profile.json")
+
+    # profile some loaders
+    with profiling.profile(filename):
+
+        # load a calibration curve twice (one miss and one hit)
+        tuffcalib.get_response("260_0_0")
+        tuffcalib.get_response("260_0_0")
+
+        # and look up some TUFF configs
+        tuff.config_indices(np.asarray([1480713196, 1480900000]))
+
+    # get the report
+    report = profiling.report()
+
+    # check the number of calls
+    name = "panama.calibration.tuff.get_response"
+    assert report["calls"][name]["count"] == 2
+    assert report["calls"][name]["time"] > 0
+    assert report["calls"]["panama.anita4.tuff.config_indices"]["count"] == 1
+
+    # check that we recorded the file that we read
+    assert report["reads"]["files"] >= 1
+    assert report["reads"]["bytes"] > 0
+
+    # and the cache statistics of the (cached) raw arrays
+    arrays = "panama.calibration.tuff.get_response_arrays"
+    assert report["cache"]["loaders"][arrays] == {"hits": 1, "misses": 1}
+    assert 0 < report["cache"]["hit_rate"] < 1
+
+    # check that the report was written
+    with open(filename) as f:
+        assert json.load(f)["calls"][name]["count"] == 2
+
+    # once profiling is disabled, nothing else is recorded
+    tuffcalib.get_response("260_0_0")
+    assert profiling.report()["calls"][name]["count"] == 2
@@ -0,0 +1,97 @@
+"""
+Test the polyphase resampling of the impulse responses.
+"""
+import numpy as np
+import pytest
+
+import panama.resample as resample
+import panama.responses as responses
+from panama.anita4 import ANITA4
+
+
+def test_resample_ratio() -> None:
+    """
+    Check that we approximate the ratio of two rates.
+    """
+
+    # check some common rates
+    assert resample.resample_ratio(10.0, 2.6) == pytest.approx(13 / 50)
+    assert resample.resample_ratio(10.0, 3.0).denominator == 10
+
+    # and check that we reject invalid rates
+    with pytest.raises(ValueError):
+        resample.resample_ratio(10.0, 0.0)
+
+
+def test_resample() -> None:
+    """
+    Check that we can resample a sinusoid.
+    """
+
+    # a 200 MHz sinusoid sampled at 10 GSa/s
+    time = np.arange(1000) / 10.0
+    values = np.sin(2 * np.pi * 0.2 * time)
+
+    # resample it to 2.6 GSa/s
+    resampled, times = resample.resample(np.stack([values, values]), time, 2.6)
+
+    # check the shape and the sampling interval
+    assert resampled.shape == (2, 260)
+    np.testing.assert_allclose(np.diff(times), 1 / 2.6)
+
+    # and check the (rescaled) values away from the edges
+    start, stop = 20, -20
+    expected = (10.0 / 2.6) * np.sin(2 * np.pi * 0.2 * times[start:stop])
+    np.testing.assert_allclose(resampled[0, start:stop], expected, atol=4e-2)
+
+
+def test_resample_gain() -> None:
+    """
+    Check that the gain of a resampled response does not depend on the rate.
+    """
+
+    # a band-limited (300 MHz) impulse response sampled at 10 GSa/s
+    time = np.arange(1000) / 10.0
+    values = np.exp(-0.5 * ((time - 30.0) / 3.0) ** 2) * np.cos(2 * np.pi * 0.3 * time)
+
+    # the magnitude of the transfer function at 300 MHz for each rate
+    gains = []
+    for fs in [10.0, 3.0, 2.6]:
+        resampled, times = resample.resample(values, time, fs)
+        freqs = np.fft.rfftfreq(8192, d=times[1] - times[0])
+        gains.append(np.interp(0.3, freqs, np.abs(np.fft.rfft(resampled, 8192))))
+
+    # and check that they all match
+    np.testing.assert_allclose(gains, gains[0], rtol=1e-3)
+
+
+def test_resampled_responses() -> None:
+    """
+    Check that the resampled responses are cached and read-only.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # get the responses at 3 GSa/s
+    resampled = anita.resampled_responses("digitizer", 3.0)
+
+    # check that they are sampled at the requested rate
+    native = anita.digitizer_responses
+    assert resampled.shape[:2] == native.shape[:2]
+    assert resampled.shape[-1] == native.shape[-1] * 3 // 10
+    np.testing.assert_allclose(np.diff(resampled.time), 1 / 3.0)
+
+    # check that they are cached and can't be modified
+    again = anita.resampled_responses("digitizer", 3.0)
+    assert np.shares_memory(again.values, resampled.values)
+    assert not resampled.values.flags.writeable
+
+    # check that the stored rate returns the native responses
+    np.testing.assert_allclose(anita.resampled_responses("digitizer", 10.0), native)
+
+    # and check a single response against the full set
+    channel, config = anita.channels[5], anita.configs[2]
+    single = responses.get_response_arrays("digitizer", channel, config, 4, fs=3.0)
+    np.testing.assert_allclose(single.values, resampled.loc[channel, config])
+    assert not single.values.flags.writeable
@@ -51,3 +51,132 @@ def test_get_responses_anita4() -> None:
     # and check that all the channels are present
     assert np.all(digitizer.channels == anita.channels)
     assert np.all(digitizer.configs == anita.configs)
+
+
+def test_cached_payload_responses() -> None:
+    """
+    Check that the payload response tensors are cached and read-only.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # nothing is cached until we access the responses
+    assert anita.memory_usage() == {}
+
+    # load the digitizer responses twice
+    digitizer = anita.digitizer_responses
+
+    # check that we get the same tensor back
+    assert anita.digitizer_responses is digitizer
+
+    # and that it can't be modified
+    assert not digitizer.values.flags.writeable
+
+    # check that we report the memory usage of the tensor
+    assert anita.memory_usage() == {"digitizer_responses": digitizer.nbytes}
+
+    # and check that we reload the tensor after clearing the cache
+    anita.clear_cache()
+    assert anita.memory_usage() == {}
+    assert anita.digitizer_responses is not digitizer
+
+
+def test_load_responses() -> None:
+    """
+    Check that we can bulk load responses in parallel.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # use a subset of the channels to keep this fast
+    channels = anita.channels[:12]
+
+    # try both threads and processes
+    for processes in [False, True]:
+
+        # record the progress
+        progress = []
+
+        # load both response sets
+        loaded = responses.load_responses(
+            ["digitizer", "trigger"],
+            channels,
+            anita.configs,
+            anita.flight,
+            workers=4,
+            processes=processes,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+
+        # check that we reported the progress
+        total = 2 * len(channels) * len(anita.configs)
+        assert progress[-1] == (total, total)
+
+        # and that the responses match the serial loader
+        for response in ["digitizer", "trigger"]:
+            np.testing.assert_array_equal(
+                loaded[response],
+                responses.get_all_responses(
+                    response, channels, anita.configs, anita.flight
+                ),
+            )
+
+
+def test_response_arrays() -> None:
+    """
+    Check that the raw arrays match the xarray responses.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # load a single response as raw arrays
+    time, values = responses.get_response_arrays("digitizer", "01TH", "260_0_0", 4)
+
+    # check that they match the DataArray
+    response = responses.get_response("digitizer", "01TH", "260_0_0", 4)
+    np.testing.assert_array_equal(values, response.values)
+    np.testing.assert_array_equal(time, response.time.values)
+
+    # and that they can't be modified
+    assert not values.flags.writeable
+
+    # every call returns a new DataArray around the same cached arrays
+    again = responses.get_response("digitizer", "01TH", "260_0_0", 4)
+    assert again is not response
+    assert np.shares_memory(again.values, values)
+    response.time.attrs["units"] = "s"
+    assert "units" not in again.time.attrs
+
+    # load a full set of raw responses
+    raw = responses.get_all_response_arrays(
+        "digitizer", anita.channels[:4], anita.configs, anita.flight
+    )
+
+    # and check that they match the DataArray
+    xray = responses.get_all_responses(
+        "digitizer", anita.channels[:4], anita.configs, anita.flight
+    )
+    np.testing.assert_array_equal(raw.values, xray.values)
+    assert raw.channels == tuple(xray.channels.values)
+    assert raw.configs == tuple(anita.configs)
+
+
+def test_get_trigger_response() -> None:
+    """
+    Check that the trigger response is loaded from the trigger responses.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # load a trigger response
+    channel, config = anita.channels[11], anita.configs[4]
+    trigger = responses.get_trigger_response(channel, config, anita.flight)
+
+    # and check it against the text trigger response
+    time, values = responses.read_response("trigger", channel, config, anita.flight)
+    np.testing.assert_array_equal(trigger.values, values)
+    np.testing.assert_array_equal(trigger.time, time)
@@ -0,0 +1,47 @@
+"""
+Test that we can group events into config-homogeneous batches.
+"""
+import numpy as np
+import pytest
+
+import panama.anita4.tuff as tuff
+from panama.scheduler import BatchScheduler, schedule
+
+
+def test_schedule_by_config() -> None:
+    """
+    Check that every event is scheduled once in a batch with its config.
+    """
+
+    # choose random times in the flight
+    times = np.random.uniform(1480713196, 1482987943, size=10000)
+
+    # get the true config of each event
+    indices, _ = tuff.config_indices(times)
+
+    # schedule the events in chunks
+    chunks = np.array_split(times, 7)
+    batches = list(schedule(chunks, tuff.timeline, 300))
+
+    # check that every batch is bounded and has a single config
+    for batch in batches:
+        assert 0 < batch.events.size <= 300
+        assert np.all(indices[batch.events] == batch.code)
+        assert tuff.timeline.labels[batch.code] == batch.label
+
+    # check that only the last batch of each config is partial
+    partial = [batch.code for batch in batches if batch.events.size < 300]
+    assert len(partial) == len(set(partial))
+
+    # and that every event is scheduled exactly once
+    events = np.sort(np.concatenate([batch.events for batch in batches]))
+    np.testing.assert_array_equal(events, np.arange(times.size))
+
+
+def test_scheduler_batch_size() -> None:
+    """
+    Check that we reject batch sizes that can never be filled.
+    """
+    for batch_size in [0, -1]:
+        with pytest.raises(ValueError):
+            BatchScheduler(tuff.timeline, batch_size)
@@ -0,0 +1,104 @@
+"""
+Test that we can share tensors between processes.
+"""
+import multiprocessing
+
+import numpy as np
+import pytest
+
+import panama.cache
+from panama import shared
+from panama.anita4 import ANITA4
+
+
+def _sum(name: str) -> float:
+    """
+    Attach to a shared tensor and sum it (in a worker).
+    """
+    return float(shared.attach(name).sum())
+
+
+def test_shared_tensor() -> None:
+    """
+    Check that we can publish and attach to a tensor.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # get the complex transfer functions
+    transfer = anita.transfer_functions()
+
+    # publish them into shared memory
+    name = shared.publish(transfer)
+
+    # attach to the tensor
+    view = shared.attach(name)
+
+    # check that the tensor is identical
+    assert view.identical(transfer)
+    assert view.freqs.attrs["units"] == "MHz"
+
+    # and that it can't be modified
+    assert not view.values.flags.writeable
+    with pytest.raises(ValueError):
+        view.values[0, 0, 0] = 0.0
+
+    # and release the tensor
+    del view
+    shared.release(name)
+
+    # and we can no longer attach to it
+    with pytest.raises(FileNotFoundError):
+        shared.attach(name)
+
+
+def test_shared_workers() -> None:
+    """
+    Check that workers can attach to a shared payload.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # publish the responses and transfer functions of the payload
+    names = anita.share(nfft=2048)
+    assert set(names) == set(anita.cached_tensors) | {
+        "digitizer_transfer",
+        "trigger_transfer",
+    }
+
+    # and sum the digitizer responses in a pool of workers
+    with multiprocessing.Pool(2) as pool:
+        sums = pool.map(_sum, [names["digitizer_responses"]] * 2)
+
+    # check that the workers saw the same tensor
+    np.testing.assert_allclose(sums, float(anita.digitizer_responses.sum()))
+
+    # attach another payload to the shared tensors
+    panama.cache.clear("panama.transfer.")
+    worker = ANITA4()
+    worker.attach(names)
+    assert worker.trigger_responses.identical(anita.trigger_responses)
+
+    # the shared transfer functions are used without computing them
+    loader = "panama.transfer._get_transfer_functions"
+    before = panama.cache.stats().loaders.get(loader, (0, 0))
+    transfer = worker.transfer_functions("digitizer", 2048)
+    after = panama.cache.stats().loaders[loader]
+    assert after == (before[0] + 1, before[1])
+    assert not transfer.values.flags.writeable
+    np.testing.assert_allclose(
+        transfer, np.fft.rfft(anita.digitizer_responses.values, 2048, axis=-1)
+    )
+
+    # we can only attach shared tensors
+    with pytest.raises(ValueError):
+        worker.attach({"noise": names["digitizer_responses"]})
+
+    # and release the tensors
+    del transfer
+    worker.clear_cache()
+    panama.cache.clear("panama.transfer.")
+    for name in names.values():
+        shared.release(name)
@@ -0,0 +1,104 @@
+"""
+Test that we can pack the impulse responses into a binary store.
+"""
+import shutil
+from os.path import join
+
+import numpy as np
+
+import panama.responses as responses
+import panama.store as store
+from panama.anita4 import ANITA4
+
+
+def test_build_store(tmp_path, monkeypatch) -> None:
+    """
+    Check that a packed store reproduces the text responses.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # the channels and configs that we pack
+    channels, configs = anita.channels[:4], anita.configs[:2]
+
+    # copy a subset of the digitizer responses into a temporary directory
+    for config in configs:
+        for channel in channels:
+            dest = tmp_path / "anita4" / "digitizer" / f"notches_{config}"
+            dest.mkdir(parents=True, exist_ok=True)
+            shutil.copy(
+                join(
+                    responses.RESPONSE_DIR,
+                    *("anita4", "digitizer", f"notches_{config}", f"{channel}.imp"),
+                ),
+                dest,
+            )
+
+    # and point PANAMA at the temporary directory
+    monkeypatch.setattr(responses, "RESPONSE_DIR", str(tmp_path))
+    monkeypatch.setattr(store, "_stores", {})
+
+    # we don't have a store until we build it
+    assert store.load_store("digitizer", 4) is None
+
+    # build the store in the payload order
+    store.build_store("digitizer", 4, channels, configs)
+
+    # and load it back
+    packed = store.load_store("digitizer", 4)
+    assert packed is not None
+    assert packed.channels == channels
+    assert packed.configs == configs
+    assert packed.index(channels[0], "260_385_0") is None
+
+    # check that every packed response matches the text response
+    for channel in channels:
+        for config in configs:
+            time, waveform = responses.read_response("digitizer", channel, config, 4)
+            index = packed.index(channel, config)
+            np.testing.assert_array_equal(packed.data[index], waveform)
+            np.testing.assert_array_equal(packed.time, time)
+
+    # and check that get_all_responses uses the store in any order
+    xray = responses.get_all_responses("digitizer", channels[::-1], configs, 4)
+    np.testing.assert_array_equal(
+        xray.sel(channels=channels[1], configs=configs[1]),
+        responses.read_response("digitizer", channels[1], configs[1], 4)[1],
+    )
+
+    # and check that we get read-only views into the store
+    for order in [channels, channels[::-1], channels[::2]]:
+        xray = responses.get_all_responses("digitizer", order, configs, 4, mmap=True)
+        assert np.shares_memory(xray.values, packed.data)
+        assert not xray.values.flags.writeable
+        np.testing.assert_array_equal(
+            xray.sel(channels=order[0], configs=configs[0]),
+            packed.data[packed.index(order[0], configs[0])],
+        )
+
+    # an irregular order can't be a view but is still read-only
+    irregular = [channels[0], channels[1], channels[3]]
+    xray = responses.get_all_responses("digitizer", irregular, configs, 4, mmap=True)
+    assert not np.shares_memory(xray.values, packed.data)
+    assert not xray.values.flags.writeable
+
+    # load a single (cached) response from the store
+    args = ("digitizer", channels[0], configs[0], 4)
+    before = responses.get_response_arrays(*args)
+    assert responses.get_response_arrays(*args) is before
+
+    # rebuilding the store doesn't modify the old (mapped) tensor
+    expected = np.array(packed.data)
+    store.build_store("digitizer", 4, channels[::-1], configs)
+    np.testing.assert_array_equal(packed.data, expected)
+
+    # but we load the new store
+    rebuilt = store.load_store("digitizer", 4)
+    assert rebuilt is not None and rebuilt is not packed
+    assert rebuilt.channels == channels[::-1]
+
+    # and the cached responses are reloaded
+    after = responses.get_response_arrays(*args)
+    assert after is not before
+    np.testing.assert_array_equal(after.values, before.values)
@@ -0,0 +1,56 @@
+"""
+Test the timeline index of time-dependent payload state.
+"""
+import numpy as np
+import pytest
+
+from panama.timeline import Timeline, label_codes
+
+
+def test_timeline() -> None:
+    """
+    Check that we find the state active at arrays of times.
+    """
+
+    # create a simple timeline
+    timeline = Timeline(np.asarray([0, 10, 20, 30]), ["A", "B", "A", "end"], ["B"])
+
+    # check that the given labels come first
+    assert list(timeline.labels) == ["B", "A", "end"]
+
+    # look up a bunch of times
+    codes, states = timeline.lookup(np.asarray([0, 5, 10, 10.5, 25, 30]))
+
+    # changes take effect strictly after their time
+    assert list(states) == ["A", "A", "A", "B", "A", "A"]
+    assert list(codes) == [1, 1, 1, 0, 1, 1]
+
+    # and check that scalars work
+    assert timeline.lookup(15)[1] == "B"
+
+    # check that we raise outside the timeline
+    with pytest.raises(ValueError):
+        timeline.index(-1)
+    with pytest.raises(ValueError):
+        timeline.index(np.asarray([5, 31]))
+
+    # and that the times must be sorted
+    with pytest.raises(ValueError):
+        Timeline(np.asarray([0, 10, 5]), ["A", "B", "C"])
+
+
+def test_label_codes() -> None:
+    """
+    Check that we convert labels and codes into codes.
+    """
+
+    # labels are converted into their index
+    assert list(label_codes(["C", "A", "C"], ["A", "B", "C"])) == [2, 0, 2]
+    assert list(label_codes("B", ["A", "B", "C"])) == [1]
+
+    # and codes are returned as is
+    assert list(label_codes([2, 1], ["A", "B", "C"])) == [2, 1]
+
+    # and check that we reject unknown labels
+    with pytest.raises(ValueError):
+        label_codes(["A", "D"], ["A", "B", "C"])
@@ -0,0 +1,61 @@
+"""
+Test the cached transfer functions of the impulse responses.
+"""
+import numpy as np
+import pytest
+
+import panama.responses as responses
+import panama.transfer as transfer
+from panama.anita4 import ANITA4
+
+
+def test_transfer_functions() -> None:
+    """
+    Check that the transfer functions match the impulse responses.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # the FFT length that we use
+    nfft = 2048
+
+    # get the transfer functions for the full payload
+    tfs = anita.transfer_functions("digitizer", nfft)
+
+    # check the shape and that we can't modify them
+    assert tfs.shape == (len(anita.channels), len(anita.configs), nfft // 2 + 1)
+    assert tfs.values.flags.c_contiguous
+    assert not tfs.values.flags.writeable
+
+    # check that the frequencies are in MHz at 10 GSa/s
+    np.testing.assert_allclose(tfs.freqs[-1], 5e3)
+
+    # and check that they share the cached arrays (but not the DataArray)
+    again = anita.transfer_functions("digitizer", nfft)
+    assert again is not tfs
+    assert np.shares_memory(again.values, tfs.values)
+    tfs.freqs.attrs["units"] = "GHz"
+    assert again.freqs.attrs["units"] == "MHz"
+
+    # check a single transfer function against the impulse response
+    channel, config = anita.channels[7], anita.configs[3]
+    impulse = responses.get_digitizer_response(channel, config, anita.flight)
+    single = transfer.get_transfer_function("digitizer", channel, config, 4, nfft)
+    np.testing.assert_allclose(single, np.fft.rfft(impulse.values, nfft))
+    np.testing.assert_allclose(tfs.sel(channels=channel, configs=config), single)
+
+    # and check that they are equivalent to a convolution
+    signal = np.random.normal(size=nfft - impulse.size + 1)
+    np.testing.assert_allclose(
+        np.fft.irfft(np.fft.rfft(signal, nfft) * single.values, nfft),
+        np.convolve(signal, impulse.values),
+        atol=1e-12,
+    )
+
+    # and check that we don't silently truncate the responses
+    short = impulse.size - 1
+    with pytest.raises(ValueError):
+        transfer.get_transfer_function("digitizer", channel, config, 4, short)
+    with pytest.raises(ValueError):
+        anita.transfer_functions("digitizer", short)
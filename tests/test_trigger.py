@@ -0,0 +1,122 @@
+"""
+Test the vectorized phi-sector trigger.
+"""
+import numpy as np
+import pytest
+
+from panama.anita4 import ANITA4
+from panama.trigger import Trigger, sector_layout
+
+
+def test_sector_layout() -> None:
+    """
+    Check that we find every channel in the phi-sector topology.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # get the layout of the payload
+    layout = sector_layout(anita)
+
+    # check the shape and that every channel appears once
+    assert layout.shape == (16, 2, 3)
+    assert np.array_equal(np.sort(layout.ravel()), np.arange(len(anita.channels)))
+
+    # and check a single channel
+    assert anita.channels[layout[4, 1, 2]] == "05BV"
+
+
+def test_trigger() -> None:
+    """
+    Check the L1, L2, and L3 decisions for some simple events.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # create a trigger at 3 GSa/s with a unit threshold
+    trigger = Trigger(anita, 3.0, thresholds=1.0)
+
+    # three quiet events
+    waveforms = np.zeros((3, len(anita.channels), 256))
+
+    # the index of each channel
+    index = {channel: i for i, channel in enumerate(anita.channels)}
+
+    # event 0: two rings in one sector - an L2 but no L3
+    waveforms[0, index["03TH"], 100] = 10.0
+    waveforms[0, index["03MH"], 102] = 10.0
+
+    # event 1: two rings in two neighbouring sectors - an L3
+    waveforms[1, index["16TV"], 100] = 10.0
+    waveforms[1, index["16BV"], 101] = 10.0
+    waveforms[1, index["01MV"], 110] = 10.0
+    waveforms[1, index["01BV"], 110] = 10.0
+
+    # event 2: the same but with the second sector too late
+    waveforms[2, index["16TV"], 100] = 10.0
+    waveforms[2, index["16BV"], 101] = 10.0
+    waveforms[2, index["01MV"], 200] = 10.0
+    waveforms[2, index["01BV"], 200] = 10.0
+
+    # and trigger them
+    result = trigger(waveforms)
+
+    # check the number of L1's in each event
+    np.testing.assert_array_equal(result.l1.sum(axis=-1), [2, 4, 4])
+
+    # check the number of L2's in each event
+    np.testing.assert_array_equal(result.l2.sum(axis=(1, 2)), [1, 2, 2])
+
+    # and check the L3 of each event
+    np.testing.assert_array_equal(result.triggered, [False, True, False])
+
+    # a single sector is enough if we ask for it
+    single = Trigger(anita, 3.0, thresholds=1.0, l3_sectors=1)
+    np.testing.assert_array_equal(single(waveforms).triggered, [True, True, True])
+
+    # and check that we reject the wrong number of channels
+    with pytest.raises(ValueError):
+        trigger(waveforms[:, :10, :])
+
+
+def test_trigger_noise() -> None:
+    """
+    Check that the power detector is normalized to the noise power.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # some unit-variance noise
+    rng = np.random.default_rng(42)
+    noise = 2.0 * rng.standard_normal((4, len(anita.channels), 1024))
+
+    # the mean integrated power is the noise power
+    trigger = Trigger(anita, 3.0, vrms=2.0)
+    np.testing.assert_allclose(trigger.power(noise)[..., 64:].mean(), 4.0, rtol=0.02)
+
+    # and a high threshold never triggers on noise
+    assert not Trigger(anita, 3.0, thresholds=20.0, vrms=2.0)(noise).l1.any()
+
+
+def test_trigger_precision() -> None:
+    """
+    Check that the power of long float32 records doesn't lose precision.
+    """
+
+    # create a reference to ANITA4
+    anita = ANITA4()
+
+    # a long, loud float32 record that ends with a quiet section
+    rng = np.random.default_rng(3)
+    waveforms = 1e3 * rng.standard_normal((1, len(anita.channels), 50_000))
+    waveforms[..., -100:] = 1e-3
+    waveforms = waveforms.astype(np.float32)
+
+    # the integrated power of the quiet section is exact
+    power = Trigger(anita, 3.0).power(waveforms)
+    assert power.dtype == np.float64
+    assert np.all(power >= 0.0)
+    np.testing.assert_allclose(power[..., -50:], 1e-6, rtol=1e-3)
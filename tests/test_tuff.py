@@ -33,6 +33,30 @@ def test_load_configs() -> None:
         assert config in anita.configs
 
 
+def test_config_indices() -> None:
+    """
+    Check that array lookups match the scalar lookup.
+    """
+
+    # construct the payload
+    anita = ANITA4()
+
+    # choose random times in the flight
+    times = np.random.uniform(1480713196, 1482987943, size=1000)
+
+    # get the configs at these times
+    indices, configs = tuff.config_indices(times)
+
+    # check that they match the scalar lookup
+    for time, index, config in zip(times[:30], indices, configs):
+        assert tuff.config(time) == config
+        assert anita.configs[index] == config
+
+    # and check that we raise for times outside the flight
+    with pytest.raises(ValueError):
+        tuff.config_indices(np.asarray([1480713196, 1600000000]))
+
+
 def test_invalid_configs() -> None:
     """
     Check that ValueError is thrown for times before
@@ -76,3 +100,18 @@ def test_tuff_response() -> None:
 
     # and save the figure
     plt.savefig(f"{figdir}/anita4_tuff_responses.png")
+
+
+def test_tuff_response_arrays() -> None:
+    """
+    Check that the raw TUFF arrays match the DataArray.
+    """
+    for config in tuffcalib.configs:
+
+        # get the raw and xarray responses
+        freqs, S21 = tuffcalib.get_response_arrays(config)
+        response = tuffcalib.get_response(config)
+
+        # and check that they agree
+        np.testing.assert_array_equal(freqs, response.freqs.values)
+        np.testing.assert_array_equal(S21, response.values)